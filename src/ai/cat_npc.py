@@ -3,16 +3,25 @@ import random
 import math
 from ..settings import *
 from ..rendering.ascii_sprites import ASCIINPC
-from ..utils.emoji_colorizer import EmojiColorizer  # 导入emoji着色工具
+from ..rendering.ascii_renderer import get_ascii_renderer
+from ..utils.emoji_colorizer import get_colored_emoji_atlas  # 导入共享的着色emoji图集
 from ..systems.cat_event_system import CatEventSystem  # 导入事件系统
 from ..data.cat_data import get_cat_data_manager, CatInfo  # 导入统一猫咪数据
 from ..systems.bait_workbench import get_bait_workbench
+from ..core.collision_grid import nearby_sprites
+from ..utils.spatial_grid import ProximityIndex
+from .navigation import Navigator
 
 class CatNPC(ASCIINPC):
     """猫咪NPC类 - 继承自ASCIINPC并添加移动功能"""
     
+    recomposition_count = 0  # 所有猫咪累计重新合成图像的次数（调试统计用）
+    WORLD_BOUNDS = (64, 64, 1472, 1472)  # 猫咪活动和寻路的范围（留出边界缓冲）
+    
     def __init__(self, pos, npc_id, npc_manager, groups, cat_name, cat_personality, collision_sprites=None, cat_info=None):
         super().__init__(pos, npc_id, npc_manager, groups)
+        self.own_image()  # 会重绘自己的图像，不能改动共享的瓦片图像
+        self.composed_key = None  # 当前图像对应的显示状态，变化时才重新合成
         
         # 猫咪特有属性
         self.cat_name = cat_name
@@ -31,13 +40,15 @@ class CatNPC(ASCIINPC):
         self.move_speed = random.uniform(20, 40)  # 随机移动速度
         self.direction = pygame.math.Vector2(0, 0)
         self.target_pos = None
+        self.path = None  # 前往target_pos的路点列表，None表示直线前进
         self.movement_timer = 0
         self.movement_interval = random.uniform(2, 5)  # 2-5秒更换一次移动目标
         self.idle_time = 0
         self.max_idle_time = random.uniform(3, 8)  # 3-8秒闲置时间
+        self.stuck_time = 0.0  # 连续没有朝路点前进的时间（秒）
         
         # 移动边界（游戏世界边界）- 更保守的边界
-        self.world_bounds = pygame.Rect(64, 64, 1472, 1472)  # 留出边界缓冲
+        self.world_bounds = pygame.Rect(self.WORLD_BOUNDS)  # 留出边界缓冲
         
         # 移动状态
         self.movement_state = "idle"  # idle, moving, sitting, moving_to_workbench
@@ -57,6 +68,7 @@ class CatNPC(ASCIINPC):
         
         # 猫猫对话历史（用于存储猫猫之间的对话）
         self.cat_conversations = {}  # {other_cat_id: [conversation_entries...]}
+        self.info_version = 0  # 照护状态或对话历史每变化一次加一，供信息面板判断缓存是否失效
         
         # 使用统一猫咪数据的ASCII字符和颜色，如果没有则使用默认值
         if cat_info:
@@ -89,7 +101,8 @@ class CatNPC(ASCIINPC):
         self.sprite_emoji_font = None
         
         # 着色后的emoji表面缓存
-        self.colored_emoji_cache = {}  # 缓存不同状态的着色emoji表面
+        self.colored_emoji_cache = {}  # 缓存不同状态的着色emoji表面（来自共享图集）
+        self.colored_emoji_keys = []  # 从图集取得的 (emoji, 颜色, 字号)，离开时释放
         self._initialize_colored_emojis()  # 初始化着色emoji
         
         # 头顶emoji字体缓存
@@ -150,18 +163,13 @@ class CatNPC(ASCIINPC):
             'default': self.ascii_char
         }
         
-        # 为每个状态的emoji着色并缓存
+        # 从共享图集获取每个状态的着色emoji（同色猫咪共用同一张表面）
+        atlas = get_colored_emoji_atlas()
+        emoji_size = TILE_SIZE // 4
         for state, emoji in emoji_states.items():
             try:
-                # 创建emoji字体
-                self.sprite_emoji_font = font_manager.load_emoji_font(TILE_SIZE // 4, f"cat_body_{self.cat_name}_{state}")
-                
-                # 使用EmojiColorizer为猫咪着色
-                colored_surface = EmojiColorizer.colorize_emoji(
-                    self.sprite_emoji_font, 
-                    emoji, 
-                    self.skin_color
-                )
+                colored_surface = atlas.acquire(emoji, self.skin_color, emoji_size)
+                self.colored_emoji_keys.append((emoji, self.skin_color, emoji_size))
                 
                 # 缓存着色后的表面
                 self.colored_emoji_cache[state] = colored_surface
@@ -197,8 +205,8 @@ class CatNPC(ASCIINPC):
             self._deliver_insect_to_workbench()
             return
         
-        # 计算朝向工作台的方向
-        direction = (self.target_pos - current_pos)
+        # 计算朝向工作台的方向（沿共享流场绕开障碍物）
+        direction = (self._flow_waypoint(self.target_pos) - current_pos)
         if direction.magnitude() > 0:
             self.direction = direction.normalize()
         
@@ -226,8 +234,8 @@ class CatNPC(ASCIINPC):
             self._arrive_at_bed()
             return
         
-        # 计算朝向猫窝的方向
-        direction = (self.target_pos - current_pos)
+        # 计算朝向猫窝的方向（沿共享流场绕开障碍物）
+        direction = (self._flow_waypoint(self.target_pos) - current_pos)
         if direction.magnitude() > 0:
             self.direction = direction.normalize()
         
@@ -269,6 +277,29 @@ class CatNPC(ASCIINPC):
             self.movement_state = "idle"
             self.state_timer = random.uniform(2, 5)  # 休息一会儿
     
+    def _get_navigator(self):
+        """获取猫咪管理器的寻路服务"""
+        cat_manager = getattr(self, 'cat_manager', None)
+        return cat_manager.navigator if cat_manager else None
+    
+    def _flow_waypoint(self, goal):
+        """沿前往goal的共享流场取下一个路点，没有寻路服务或走不到时直接走向goal"""
+        navigator = self._get_navigator()
+        if navigator:
+            waypoint = navigator.next_waypoint(self.rect.center, goal)
+            if waypoint is not None:
+                return waypoint
+        return goal
+    
+    def _next_path_point(self):
+        """取出当前要走向的路点，丢弃已经到达的路点；没有路线时直接走向目标"""
+        if not self.path:
+            return self.target_pos
+        current_pos = pygame.math.Vector2(self.rect.center)
+        while len(self.path) > 1 and current_pos.distance_to(self.path[0]) < 8:
+            self.path.pop(0)
+        return self.path[0]
+    
     def _set_random_target(self):
         """设置随机移动目标"""
         # 在附近选择一个随机位置
@@ -291,10 +322,21 @@ class CatNPC(ASCIINPC):
             
             # 检查目标位置是否有障碍物
             if self._is_position_valid(target_x, target_y):
-                self.target_pos = pygame.math.Vector2(target_x, target_y)
+                target = pygame.math.Vector2(target_x, target_y)
+                
+                # 有寻路服务时只接受走得到的目标，并沿规划好的路线前进
+                path = None
+                navigator = self._get_navigator()
+                if navigator:
+                    path = navigator.find_path(self.rect.center, target)
+                    if path is None:
+                        continue
+                
+                self.target_pos = target
+                self.path = path
                 
                 # 计算方向向量
-                target_vector = self.target_pos - pygame.math.Vector2(self.rect.center)
+                target_vector = self._next_path_point() - pygame.math.Vector2(self.rect.center)
                 if target_vector.length() > 0:
                     self.direction = target_vector.normalize()
                 else:
@@ -315,7 +357,7 @@ class CatNPC(ASCIINPC):
         temp_hitbox = pygame.Rect(0, 0, self.hitbox.width, self.hitbox.height)
         temp_hitbox.center = (x, y)
         
-        for sprite in self.collision_sprites.sprites():
+        for sprite in nearby_sprites(self.collision_sprites, temp_hitbox):
             if hasattr(sprite, 'hitbox'):
                 if sprite.hitbox.colliderect(temp_hitbox):
                     return False
@@ -349,6 +391,7 @@ class CatNPC(ASCIINPC):
         target_y = max(self.world_bounds.top + 32, min(self.world_bounds.bottom - 32, target_y))
         
         self.target_pos = pygame.math.Vector2(target_x, target_y)
+        self.path = None
         self.direction = pygame.math.Vector2(dx, dy).normalize()
         
         print(f"[CatNPC] {self.cat_name} 使用回退目标: {self.target_pos}")
@@ -413,6 +456,11 @@ class CatNPC(ASCIINPC):
                     self.hitbox.center = new_pos
         # sitting状态不移动
         
+        # 移动结束后更新邻近索引
+        cat_manager = getattr(self, 'cat_manager', None)
+        if cat_manager:
+            cat_manager.cat_moved(self)
+        
         # 更新社交互动
         self._update_social_interactions(dt)
         
@@ -438,10 +486,22 @@ class CatNPC(ASCIINPC):
             self._set_random_target()
             return
         
+        # 有路线时朝当前路点前进，卡住检测也以路点为准
+        if self.path:
+            waypoint = self._next_path_point()
+            distance_to_target = current_pos.distance_to(waypoint)
+            if distance_to_target > 0:
+                self.direction = waypoint - current_pos
+        else:
+            waypoint = self.target_pos
+        
         # 规范化方向向量
         if self.direction.magnitude() > 0:
             self.direction = self.direction.normalize()
         
+        # 用精确位置衡量进展，低速时每帧移动不到1像素也能看出是否在接近路点
+        start_distance = self.pos.distance_to(waypoint)
+        
         # 水平移动（参考玩家移动逻辑）
         self.pos.x += self.direction.x * self.move_speed * dt
         self.hitbox.centerx = round(self.pos.x)
@@ -454,22 +514,23 @@ class CatNPC(ASCIINPC):
         self.rect.centery = self.hitbox.centery
         self.collision('vertical')
         
-        # 检查是否卡住了（如果碰撞导致无法接近目标）
-        new_distance = pygame.math.Vector2(self.rect.center).distance_to(self.target_pos)
-        if new_distance >= distance_to_target - 1:  # 如果距离没有减少
-            self.stuck_counter = getattr(self, 'stuck_counter', 0) + 1
-            if self.stuck_counter > 60:  # 1秒后重新选择目标（假设60FPS）
+        # 检查是否卡住了（碰撞导致这一帧接近路点的距离不到应走距离的一半）
+        progress = start_distance - self.pos.distance_to(waypoint)
+        if progress < self.move_speed * dt * 0.5:
+            self.stuck_time += dt
+            if self.stuck_time > 1.0:  # 卡住1秒后重新选择目标
                 self._set_random_target()
-                self.stuck_counter = 0
+                self.stuck_time = 0.0
         else:
-            self.stuck_counter = 0
+            self.stuck_time = 0.0
     
     def collision(self, direction):
         """碰撞检测方法（参考玩家系统）"""
         if not self.collision_sprites:
             return
             
-        for sprite in self.collision_sprites.sprites():
+        # 只检查附近格子里的碰撞体，向外多查一格以覆盖被推开后的位置
+        for sprite in nearby_sprites(self.collision_sprites, self.hitbox, TILE_SIZE):
             if hasattr(sprite, 'hitbox'):
                 if sprite.hitbox.colliderect(self.hitbox):
                     if direction == 'horizontal':
@@ -580,21 +641,27 @@ class CatNPC(ASCIINPC):
         emoji_state = "idle"
         display_char = self.ascii_char
         
-        # 更新ASCII渲染 - 使用缓存的着色结果
-        self.image.fill((0, 0, 0, 0))  # 清除
-        
         # 尝试使用缓存的着色表面
         cached_surface = self.colored_emoji_cache.get(emoji_state)
         
+        # 显示状态、皮肤颜色和头顶emoji都没变时，图像无需重新合成
+        composed_key = (emoji_state, display_char, cached_surface, tuple(self.skin_color),
+                        self.head_emoji_system['current_emoji'])
+        if composed_key == self.composed_key:
+            return
+        self.composed_key = composed_key
+        CatNPC.recomposition_count += 1
+        
+        # 更新ASCII渲染 - 使用缓存的着色结果
+        self.image.fill((0, 0, 0, 0))  # 清除
+        
         if cached_surface is not None:
             # 使用缓存的着色表面
             cat_rect = cached_surface.get_rect(center=(TILE_SIZE//2, TILE_SIZE//2))
             self.image.blit(cached_surface, cat_rect)
         else:
             # 如果没有缓存，使用回退方法
-            from ..rendering.ascii_renderer import ASCIIRenderer
-            renderer = ASCIIRenderer()
-            renderer.render_ascii(
+            get_ascii_renderer().render_ascii(
                 self.image,      # 目标表面
                 display_char,    # 字符
                 self.skin_color, # 颜色
@@ -612,9 +679,7 @@ class CatNPC(ASCIINPC):
             
             # 使用缓存的字体渲染emoji
             if self.head_emoji_font:
-                from ..rendering.ascii_renderer import ASCIIRenderer
-                renderer = ASCIIRenderer()
-                renderer.render_ascii(
+                get_ascii_renderer().render_ascii(
                     self.image,         # 目标表面
                     emoji,              # emoji字符
                     (255, 255, 255),    # 白色
@@ -669,20 +734,12 @@ class CatNPC(ASCIINPC):
     
     def _find_nearby_cats(self):
         """查找附近的猫咪"""
-        nearby_cats = []
-        current_pos = pygame.math.Vector2(self.rect.center)
-        
-        # 通过CatManager找到所有其他猫咪
+        # 通过CatManager的邻近索引找到其他猫咪，只检查附近格子
         if hasattr(self, 'cat_manager') and self.cat_manager:
-            for cat in self.cat_manager.cats:
-                if cat != self:  # 不包括自己
-                    cat_pos = pygame.math.Vector2(cat.rect.center)
-                    distance = current_pos.distance_to(cat_pos)
-                    
-                    if distance <= self.social_interaction_distance:
-                        nearby_cats.append(cat)
+            return self.cat_manager.cat_index.within(
+                self.rect.center, self.social_interaction_distance, exclude=self)
         
-        return nearby_cats
+        return []
     
     def _initiate_conversation_with_cat(self, other_cat):
         """与另一只猫开始对话"""
@@ -875,6 +932,8 @@ class CatNPC(ASCIINPC):
         if len(self.cat_conversations[other_cat_id]) > 10:
             self.cat_conversations[other_cat_id] = self.cat_conversations[other_cat_id][-10:]
         
+        self._touch_info()
+        
         print(f"[CatNPC] {self.cat_name} 保存了与 {other_cat.cat_name} 的对话")
     
     def get_cat_conversation_history(self, other_cat_id=None):
@@ -938,6 +997,7 @@ class CatNPC(ASCIINPC):
         
         # 应用心情变化
         self.mood_value = max(0, min(100, self.mood_value + mood_change))
+        self._touch_info()
         
         # 更新心情状态
         self._update_mood_state()
@@ -968,6 +1028,8 @@ class CatNPC(ASCIINPC):
             
             self.energy_value = max(0, self.energy_value - energy_loss)
         
+        self._touch_info()
+        
         # 更新精力状态效果
         self._update_energy_effects()
     
@@ -1013,6 +1075,7 @@ class CatNPC(ASCIINPC):
         """进入睡眠状态"""
         self.sleep_state = "sleeping"
         self.movement_state = "sleeping"
+        self._touch_info()
         self.direction = pygame.math.Vector2(0, 0)
         
         # 寻找睡眠地点
@@ -1037,6 +1100,7 @@ class CatNPC(ASCIINPC):
         
         # 睡眠奖励
         self.mood_value = min(100, self.mood_value + 5)
+        self._touch_info()
         
         # 清除睡眠表情
         self.clear_head_emoji()
@@ -1106,9 +1170,21 @@ class CatNPC(ASCIINPC):
         # 从猫咪管理器中移除
         if hasattr(self, 'cat_manager') and self in self.cat_manager.cats:
             self.cat_manager.cats.remove(self)
+            self.cat_manager.cat_index.remove(self)
         
         # 从精灵组中移除
         self.kill()
+        
+        # 释放共享的着色emoji
+        self._release_colored_emojis()
+    
+    def _release_colored_emojis(self):
+        """释放从图集取得的着色emoji表面"""
+        atlas = get_colored_emoji_atlas()
+        for emoji, color, size in self.colored_emoji_keys:
+            atlas.release(emoji, color, size)
+        self.colored_emoji_keys = []
+        self.colored_emoji_cache = {}
     
     def add_mood(self, amount, reason=""):
         """增加心情值"""
@@ -1116,12 +1192,18 @@ class CatNPC(ASCIINPC):
         self.mood_value = min(100, self.mood_value + amount)
         print(f"🐱 {self.cat_name} 心情+{amount} ({reason}): {old_mood} → {self.mood_value}")
         self._update_mood_state()
+        self._touch_info()
     
     def consume_energy(self, amount, reason=""):
         """消耗精力值"""
         old_energy = self.energy_value
         self.energy_value = max(0, self.energy_value - amount)
         print(f"🐱 {self.cat_name} 精力-{amount} ({reason}): {old_energy} → {self.energy_value}")
+        self._touch_info()
+    
+    def _touch_info(self):
+        """照护状态或对话历史发生变化"""
+        self.info_version += 1
     
     def update_interaction_time(self):
         """更新最后互动时间"""
@@ -1146,6 +1228,9 @@ class CatManager:
     
     def __init__(self):
         self.cats = []
+        self.cat_index = ProximityIndex()  # 按位置索引猫咪，用于邻近查询
+        self.navigator = None  # 寻路服务，在create_cats中创建
+        self.npc_sprites = None
         
         # 使用统一的猫咪数据管理器
         self.cat_data_manager = get_cat_data_manager()
@@ -1160,6 +1245,11 @@ class CatManager:
         self.insect_catch_timer = 0
         self.insect_catch_interval = 5.0  # 每5秒检查一次昆虫捕捉
         self.last_insect_catch_time = 0
+        
+        # 调试统计：每秒猫咪图像重新合成次数
+        self.recomposition_timer = 0
+        self.last_recomposition_count = CatNPC.recomposition_count
+        self.recompositions_per_second = 0
     
     def create_cats(self, all_sprites, collision_sprites, npc_sprites, npc_manager, player_pos=None, initial_cats=0):
         """创建猫咪NPC
@@ -1171,6 +1261,7 @@ class CatManager:
         self.all_sprites = all_sprites
         self.collision_sprites = collision_sprites
         self.npc_sprites = npc_sprites
+        self.navigator = Navigator(collision_sprites, pygame.Rect(CatNPC.WORLD_BOUNDS))
         self.npc_manager = npc_manager
         
         # 如果没有提供玩家位置，使用默认中心位置
@@ -1223,6 +1314,7 @@ class CatManager:
         cat.cat_manager = self
         
         self.cats.append(cat)
+        self.cat_index.update(cat)
         print(f"[CatManager] 创建猫咪: {cat_name} ({cat_id}) 位置: {spawn_pos}")
         
         return cat
@@ -1248,12 +1340,23 @@ class CatManager:
             print(f"[CatManager] ERROR: Failed to create new cat")
             return None
     
+    def cat_moved(self, cat):
+        """猫咪移动后更新邻近索引"""
+        if cat in self.cat_index:
+            self.cat_index.update(cat)
+        if self.npc_sprites is not None and hasattr(self.npc_sprites, 'refresh_sprite'):
+            self.npc_sprites.refresh_sprite(cat)
+    
     def get_cat_count(self):
         """获取当前猫咪数量"""
         return len(self.cats)
     
     def _find_valid_spawn_position(self, player_pos, collision_sprites, attempt_id=0):
         """寻找有效的spawn位置"""
+        # 有寻路服务时直接在可站立瓦片中挑选，保证猫咪生成在玩家走得到的地方
+        if self.navigator:
+            return self._find_walkable_spawn_position(player_pos)
+        
         player_x, player_y = player_pos
         
         # 定义搜索参数
@@ -1320,6 +1423,41 @@ class CatManager:
         print("[CatManager] 警告: 无法找到理想位置,使用默认位置")
         return (player_x - 100, player_y - 100)
     
+    def _find_walkable_spawn_position(self, player_pos):
+        """
+        在玩家周围的圆环里挑选可站立、与玩家连通、附近猫咪不太密集的瓦片
+        圆环由近到远逐步扩大（与_is_spawn_position_valid的距离限制一致），找不到时返回None
+        """
+        navigator = self.navigator
+        components = navigator.components_at(player_pos)
+        if not components:
+            # 玩家周围没有可站立的瓦片（例如站在地图边缘），不限制连通区域
+            components = None
+        
+        search_rings = [
+            (100, 150),
+            (150, 250),
+            (250, 400),
+            (400, 800)
+        ]
+        half_jitter = (navigator.tile_size - navigator.agent_size) // 2
+        for min_r, max_r in search_rings:
+            tiles = navigator.tiles_in_ring(player_pos, min_r, max_r, components)
+            random.shuffle(tiles)
+            for tile in tiles:
+                center = navigator.center_of(tile)
+                # 瓦片中心附近加一点随机偏移，避免猫咪位置过于规则；偏移后碰到障碍物就用瓦片中心
+                for candidate_x, candidate_y in (
+                    (center.x + random.randint(-half_jitter, half_jitter),
+                     center.y + random.randint(-half_jitter, half_jitter)),
+                    (center.x, center.y)
+                ):
+                    if self._is_spawn_position_valid(candidate_x, candidate_y, player_pos, self.collision_sprites):
+                        return (candidate_x, candidate_y)
+        
+        print("[CatManager] 警告: 玩家附近没有可以生成猫咪的空地")
+        return None
+    
     def _is_spawn_position_valid(self, x, y, player_pos, collision_sprites):
         """检查spawn位置是否有效"""
         
@@ -1342,7 +1480,7 @@ class CatManager:
             # 创建临时hitbox检查碰撞
             temp_hitbox = pygame.Rect(x - 16, y - 16, 32, 32)  # 猫咪的hitbox大小
             
-            for sprite in collision_sprites.sprites():
+            for sprite in nearby_sprites(collision_sprites, temp_hitbox):
                 if hasattr(sprite, 'hitbox'):
                     if sprite.hitbox.colliderect(temp_hitbox):
                         return False
@@ -1350,9 +1488,9 @@ class CatManager:
                     if sprite.rect.colliderect(temp_hitbox):
                         return False
         
-        # 4. 与已存在的猫咪距离检查（避免太密集）
+        # 4. 与已存在的猫咪距离检查（避免太密集），只查邻近索引里附近格子的猫咪
         min_cat_distance = 80
-        for existing_cat in self.cats:
+        for existing_cat in self.cat_index.within((x, y), min_cat_distance):
             cat_x, cat_y = existing_cat.rect.center
             distance = math.sqrt((x - cat_x)**2 + (y - cat_y)**2)
             if distance < min_cat_distance:
@@ -1368,7 +1506,8 @@ class CatManager:
         stats = {
             "total_cats": len(self.cats),
             "states": {},
-            "average_position": [0, 0]
+            "average_position": [0, 0],
+            "recompositions_per_second": self.recompositions_per_second
         }
         
         total_x, total_y = 0, 0
@@ -1391,23 +1530,22 @@ class CatManager:
     
     def find_nearest_cat(self, position, max_distance=100):
         """找到最近的猫咪"""
-        nearest_cat = None
-        min_distance = float('inf')
+        nearest_cat, distance = self.cat_index.nearest(position, max_distance)
         
-        for cat in self.cats:
-            distance = math.sqrt(
-                (position[0] - cat.rect.centerx) ** 2 +
-                (position[1] - cat.rect.centery) ** 2
-            )
-            
-            if distance < max_distance and distance < min_distance:
-                min_distance = distance
-                nearest_cat = cat
-        
-        return nearest_cat, min_distance if nearest_cat else None
+        if nearest_cat is None or distance >= max_distance:
+            return None, None
+        return nearest_cat, distance
     
     def update(self, dt):
         """更新猫咪管理器，包括事件系统检查和昆虫捕捉"""
+        # 统计每秒图像重新合成次数
+        self.recomposition_timer += dt
+        if self.recomposition_timer >= 1.0:
+            count = CatNPC.recomposition_count
+            self.recompositions_per_second = (count - self.last_recomposition_count) / self.recomposition_timer
+            self.last_recomposition_count = count
+            self.recomposition_timer = 0
+        
         # 更新事件检查计时器
         self.event_check_timer += dt
         
@@ -1453,27 +1591,23 @@ class CatManager:
         """找到附近的猫咪群组"""
         groups = []
         processed_cats = set()
+        cat_order = {cat: i for i, cat in enumerate(self.cats)}
         
         for cat in self.cats:
             if cat in processed_cats:
                 continue
             
-            # 找到这只猫附近的所有猫咪
+            # 找到这只猫附近的所有猫咪（通过邻近索引，按猫咪列表的顺序）
             group = [cat]
             processed_cats.add(cat)
             
-            for other_cat in self.cats:
+            nearby = self.cat_index.within(cat.rect.center, self.event_system.proximity_threshold, exclude=cat)
+            for other_cat in sorted(nearby, key=lambda other: cat_order.get(other, len(cat_order))):
                 if other_cat in processed_cats:
                     continue
                 
-                distance = math.sqrt(
-                    (cat.rect.centerx - other_cat.rect.centerx) ** 2 +
-                    (cat.rect.centery - other_cat.rect.centery) ** 2
-                )
-                
-                if distance <= self.event_system.proximity_threshold:
-                    group.append(other_cat)
-                    processed_cats.add(other_cat)
+                group.append(other_cat)
+                processed_cats.add(other_cat)
             
             if len(group) >= 2:
                 groups.append(group)
@@ -62,6 +62,7 @@ class ChatAI:
         
         # 对话历史管理
         self.conversation_history = {}  # 按NPC ID存储对话历史
+        self.history_versions = {}  # 按NPC ID记录对话历史的变化次数，供UI判断缓存是否失效
         chat_settings = self.config_manager.get_chat_settings()
         self.max_history_length = chat_settings.get("conversation_history_length", 10)   # 最大保存的对话轮数
         
@@ -514,7 +515,7 @@ class ChatAI:
         
         Args:
             player_pos: 玩家位置 (x, y)
-            npc_sprites: NPC精灵组
+            npc_sprites: NPC精灵组（带邻近索引时返回最近的NPC）
             
         Returns:
             附近NPC的ID，如果没有则返回None
@@ -523,16 +524,18 @@ class ChatAI:
         
         print(f"[ChatAI] 检查附近NPC，玩家位置: {player_pos}")
         
-        for npc in npc_sprites:
-            npc_pos = npc.rect.center
-            distance = ((player_pos[0] - npc_pos[0]) ** 2 + 
-                       (player_pos[1] - npc_pos[1]) ** 2) ** 0.5
-            
-            print(f"[ChatAI] NPC {npc.npc_id} 位置: {npc_pos}, 距离: {distance:.1f}")
-            
-            if distance <= interaction_distance:
-                print(f"[ChatAI] 找到附近的NPC: {npc.npc_id}")
+        if hasattr(npc_sprites, 'nearest'):
+            npc, distance = npc_sprites.nearest(player_pos, interaction_distance)
+            if npc is not None:
+                print(f"[ChatAI] 找到附近的NPC: {npc.npc_id}, 距离: {distance:.1f}")
                 return npc.npc_id
+        else:
+            limit_sq = interaction_distance * interaction_distance
+            for npc in npc_sprites:
+                npc_pos = npc.rect.center
+                if (player_pos[0] - npc_pos[0]) ** 2 + (player_pos[1] - npc_pos[1]) ** 2 <= limit_sq:
+                    print(f"[ChatAI] 找到附近的NPC: {npc.npc_id}")
+                    return npc.npc_id
         
         print("[ChatAI] 没有找到附近的NPC")
         return None
@@ -579,9 +582,14 @@ class ChatAI:
         # 限制历史长度
         if len(self.conversation_history[npc_id]) > self.max_history_length * 2:  # *2因为包含玩家和NPC的消息
             self.conversation_history[npc_id] = self.conversation_history[npc_id][-self.max_history_length * 2:]
+        self.history_versions[npc_id] = self.history_versions.get(npc_id, 0) + 1
         
         print(f"[ChatAI] 添加对话历史 {npc_id}: {speaker}: {message}")
     
+    def get_history_version(self, npc_id: str) -> int:
+        """获取对话历史的版本号（每次添加或清除都会变化）"""
+        return self.history_versions.get(npc_id, 0)
+    
     def _get_recent_conversation_context(self, npc_id: str, num_turns: int = 3) -> List[Dict]:
         """获取最近的对话上下文"""
         if npc_id not in self.conversation_history:
@@ -609,9 +617,12 @@ class ChatAI:
         if npc_id:
             if npc_id in self.conversation_history:
                 del self.conversation_history[npc_id]
+                self.history_versions[npc_id] = self.history_versions.get(npc_id, 0) + 1
                 print(f"[ChatAI] 清除{npc_id}的对话历史")
         else:
             self.conversation_history.clear()
+            for npc_id in self.history_versions:
+                self.history_versions[npc_id] += 1
             print("[ChatAI] 清除所有对话历史")
     
     def get_conversation_summary(self, npc_id: str) -> Dict:
@@ -0,0 +1,344 @@
+"""
+寻路服务 - 在碰撞网格上为猫咪规划路线
+单次移动用A*（结果缓存），工作台、猫窝等常去的目的地用所有猫咪共享的流场，
+可站立的瓦片按连通区域编号，用于把猫咪生成在玩家走得到的地方
+碰撞体变化（砍树、种植、收获）后所有缓存自动失效
+"""
+
+import heapq
+import math
+from collections import OrderedDict
+import pygame
+from ..settings import TILE_SIZE
+from ..core.collision_grid import nearby_sprites
+
+# 8个方向及代价，斜向移动代价为√2
+NEIGHBORS = [
+    (1, 0, 1.0), (-1, 0, 1.0), (0, 1, 1.0), (0, -1, 1.0),
+    (1, 1, math.sqrt(2)), (-1, 1, math.sqrt(2)), (1, -1, math.sqrt(2)), (-1, -1, math.sqrt(2)),
+]
+
+
+class FlowField:
+    """流场 - 每个可达瓦片指向通往目的地的下一个瓦片"""
+
+    def __init__(self, goal, next_tiles, costs):
+        self.goal = goal  # 目的地瓦片
+        self.next_tiles = next_tiles  # {tile: 下一个瓦片}，目的地瓦片本身没有下一步
+        self.costs = costs  # {tile: 到目的地的路程（瓦片）}
+
+    def next_tile(self, tile):
+        """获取下一个瓦片，不可达时返回None"""
+        return self.next_tiles.get(tile)
+
+    def reachable(self, tile):
+        return tile in self.costs
+
+
+class Navigator:
+    """
+    瓦片寻路器
+    瓦片中心放得下一个agent_size大小的碰撞盒时可以站立；
+    相邻两个瓦片之间，两端碰撞盒的外接矩形不碰到任何障碍物时可以通行（斜向移动因此不会穿墙角）
+    """
+
+    def __init__(self, collision_sprites, bounds, agent_size=TILE_SIZE // 2, tile_size=TILE_SIZE,
+                 max_paths=128, max_flow_fields=32):
+        self.collision_sprites = collision_sprites
+        self.tile_size = tile_size
+        self.agent_size = agent_size
+        # 中心点落在bounds内的瓦片参与寻路
+        self.col0 = math.ceil((bounds.left - tile_size / 2) / tile_size)
+        self.row0 = math.ceil((bounds.top - tile_size / 2) / tile_size)
+        self.col1 = math.floor((bounds.right - tile_size / 2) / tile_size)
+        self.row1 = math.floor((bounds.bottom - tile_size / 2) / tile_size)
+        self.max_paths = max_paths
+        self.max_flow_fields = max_flow_fields
+
+        self.version = None  # 缓存对应的碰撞体版本
+        self.standable = {}  # tile -> bool
+        self.passable = {}  # (tile, tile) -> bool
+        self.paths = OrderedDict()  # (起点瓦片, 终点瓦片) -> 瓦片路线或None
+        self.flow_fields = OrderedDict()  # 目的地瓦片 -> FlowField
+        self.components = {}  # 可站立瓦片 -> 连通区域编号，按需逐个区域填充
+        self.component_count = 0
+
+        # 调试统计
+        self.path_searches = 0
+        self.flow_field_builds = 0
+
+    # ---- 瓦片和坐标 ----
+
+    def tile_of(self, pos):
+        return (int(pos[0] // self.tile_size), int(pos[1] // self.tile_size))
+
+    def center_of(self, tile):
+        return pygame.math.Vector2((tile[0] + 0.5) * self.tile_size, (tile[1] + 0.5) * self.tile_size)
+
+    def in_bounds(self, tile):
+        return self.col0 <= tile[0] <= self.col1 and self.row0 <= tile[1] <= self.row1
+
+    # ---- 可通行性 ----
+
+    def _sync(self):
+        """碰撞体变化后清空所有缓存"""
+        grid = getattr(self.collision_sprites, 'grid', None)
+        if grid is not None:
+            grid.flush()
+            version = grid.version
+        else:
+            version = len(self.collision_sprites)
+        if version != self.version:
+            self.version = version
+            self.standable.clear()
+            self.passable.clear()
+            self.paths.clear()
+            self.flow_fields.clear()
+            self.components.clear()
+            self.component_count = 0
+
+    def invalidate(self):
+        """手动清空缓存（障碍物不在碰撞组里变化时使用）"""
+        self.version = None
+
+    def _agent_box(self, tile):
+        box = pygame.Rect(0, 0, self.agent_size, self.agent_size)
+        box.center = self.center_of(tile)
+        return box
+
+    def _blocked(self, rect):
+        """矩形是否碰到障碍物（与猫咪碰撞检测使用相同的碰撞盒）"""
+        for sprite in nearby_sprites(self.collision_sprites, rect):
+            box = sprite.hitbox if hasattr(sprite, 'hitbox') else sprite.rect
+            if box.colliderect(rect):
+                return True
+        return False
+
+    def is_standable(self, tile):
+        """瓦片中心能否站立"""
+        result = self.standable.get(tile)
+        if result is None:
+            result = self.in_bounds(tile) and not self._blocked(self._agent_box(tile))
+            self.standable[tile] = result
+        return result
+
+    def _can_pass(self, tile, other):
+        key = (tile, other) if tile <= other else (other, tile)
+        result = self.passable.get(key)
+        if result is None:
+            result = (self.is_standable(other) and
+                      not self._blocked(self._agent_box(tile).union(self._agent_box(other))))
+            self.passable[key] = result
+        return result
+
+    def _neighbors(self, tile):
+        col, row = tile
+        for dx, dy, cost in NEIGHBORS:
+            other = (col + dx, row + dy)
+            if self._can_pass(tile, other):
+                yield other, cost
+
+    def _exits(self, tile):
+        """
+        离开瓦片的方向
+        猫咪贴着障碍物时所在瓦片的中心可能站不下，这时允许直接走到相邻的可站立瓦片
+        """
+        if self.is_standable(tile):
+            return self._neighbors(tile)
+        col, row = tile
+        return [((col + dx, row + dy), cost) for dx, dy, cost in NEIGHBORS
+                if self.is_standable((col + dx, row + dy))]
+
+    def is_walkable(self, pos):
+        """坐标所在瓦片能否站立"""
+        self._sync()
+        return self.is_standable(self.tile_of(pos))
+
+    def _nearest_standable(self, tile):
+        """瓦片本身不能站立时（例如目的地在障碍物旁边），取周围一圈中可以站立的瓦片"""
+        if self.is_standable(tile):
+            return [tile]
+        col, row = tile
+        return [(col + dx, row + dy) for dx, dy, _ in NEIGHBORS if self.is_standable((col + dx, row + dy))]
+
+    # ---- A* ----
+
+    def find_path(self, start_pos, goal_pos):
+        """
+        规划从start_pos到goal_pos的路线，返回途经的瓦片中心列表（不含起点瓦片，最后一个点为goal_pos）
+        不可达时返回None
+        """
+        self._sync()
+        start = self.tile_of(start_pos)
+        goal = self.tile_of(goal_pos)
+        key = (start, goal)
+        if key in self.paths:
+            self.paths.move_to_end(key)
+            tiles = self.paths[key]
+        else:
+            tiles = self._search(start, goal)
+            self.paths[key] = tiles
+            if len(self.paths) > self.max_paths:
+                self.paths.popitem(last=False)
+        if tiles is None:
+            return None
+        waypoints = [self.center_of(tile) for tile in tiles[:-1]]
+        waypoints.append(pygame.math.Vector2(goal_pos))
+        return waypoints
+
+    def _search(self, start, goal):
+        """A*搜索，8方向，八方向距离作为启发函数"""
+        self.path_searches += 1
+        if start == goal:
+            return [goal]
+        goals = set(self._nearest_standable(goal))
+        if not goals:
+            return None
+
+        def heuristic(tile):
+            dx = abs(tile[0] - goal[0])
+            dy = abs(tile[1] - goal[1])
+            return max(dx, dy) + (math.sqrt(2) - 1) * min(dx, dy)
+
+        # 起点可能因为猫咪贴着障碍物而不能站立，此时仍从起点出发
+        came_from = {start: None}
+        cost_so_far = {start: 0.0}
+        frontier = [(heuristic(start), 0, start)]
+        counter = 1
+        while frontier:
+            _, _, tile = heapq.heappop(frontier)
+            if tile in goals:
+                path = []
+                while tile != start:
+                    path.append(tile)
+                    tile = came_from[tile]
+                path.reverse()
+                if not path or path[-1] != goal:
+                    path.append(goal)
+                return path
+            base = cost_so_far[tile]
+            for other, cost in self._exits(tile):
+                new_cost = base + cost
+                if new_cost < cost_so_far.get(other, float('inf')):
+                    cost_so_far[other] = new_cost
+                    came_from[other] = tile
+                    heapq.heappush(frontier, (new_cost + heuristic(other), counter, other))
+                    counter += 1
+        return None
+
+    # ---- 流场 ----
+
+    def flow_field(self, goal_pos):
+        """获取通往goal_pos的流场（按目的地瓦片缓存，所有猫咪共享）"""
+        self._sync()
+        goal = self.tile_of(goal_pos)
+        field = self.flow_fields.get(goal)
+        if field is None:
+            field = self._build_flow_field(goal)
+            self.flow_fields[goal] = field
+            if len(self.flow_fields) > self.max_flow_fields:
+                self.flow_fields.popitem(last=False)
+        else:
+            self.flow_fields.move_to_end(goal)
+        return field
+
+    def _build_flow_field(self, goal):
+        """从目的地反向做Dijkstra，记录每个瓦片到目的地的路程和下一步"""
+        self.flow_field_builds += 1
+        costs = {}
+        next_tiles = {}
+        frontier = []
+        for tile in self._nearest_standable(goal):
+            costs[tile] = 0.0 if tile == goal else 1.0
+            if tile != goal:
+                next_tiles[tile] = goal
+            heapq.heappush(frontier, (costs[tile], tile))
+        while frontier:
+            cost, tile = heapq.heappop(frontier)
+            if cost > costs[tile]:
+                continue
+            for other, step in self._neighbors(tile):
+                new_cost = cost + step
+                if new_cost < costs.get(other, float('inf')):
+                    costs[other] = new_cost
+                    next_tiles[other] = tile
+                    heapq.heappush(frontier, (new_cost, other))
+        return FlowField(goal, next_tiles, costs)
+
+    def next_waypoint(self, pos, goal_pos):
+        """
+        沿流场前往goal_pos时下一个要走向的位置
+        已经在目的地瓦片时返回goal_pos本身，不可达时返回None
+        """
+        field = self.flow_field(goal_pos)
+        tile = self.tile_of(pos)
+        if tile == field.goal:
+            return pygame.math.Vector2(goal_pos)
+        if field.reachable(tile):
+            next_tile = field.next_tile(tile)
+        else:
+            # 所在瓦片不在流场里（贴着障碍物），先走到相邻的、离目的地最近的瓦片
+            exits = [other for other, _ in self._exits(tile) if field.reachable(other)]
+            if not exits:
+                return None
+            next_tile = min(exits, key=lambda other: field.costs[other])
+        if next_tile == field.goal:
+            return pygame.math.Vector2(goal_pos)
+        return self.center_of(next_tile)
+
+    # ---- 连通区域 ----
+
+    def component_of(self, tile):
+        """
+        瓦片所在连通区域的编号，不能站立时返回None
+        区域第一次被查询时做一次洪水填充，整个区域的瓦片一起编号
+        """
+        self._sync()
+        label = self.components.get(tile)
+        if label is None and self.is_standable(tile):
+            label = self.component_count
+            self.component_count += 1
+            self.components[tile] = label
+            stack = [tile]
+            while stack:
+                current = stack.pop()
+                for other, _ in self._neighbors(current):
+                    if other not in self.components:
+                        self.components[other] = label
+                        stack.append(other)
+        return label
+
+    def components_at(self, pos):
+        """坐标所在的连通区域集合（站在障碍物旁边时取周围可站立瓦片的区域）"""
+        self._sync()
+        return {self.component_of(tile) for tile in self._nearest_standable(self.tile_of(pos))}
+
+    def tiles_in_ring(self, center, min_radius, max_radius, components=None):
+        """
+        瓦片中心到center的距离在[min_radius, max_radius]内的可站立瓦片
+        components不为None时只返回属于这些连通区域的瓦片
+        只遍历圆环外接正方形里的瓦片，开销与候选数量成正比
+        """
+        self._sync()
+        size = self.tile_size
+        cx, cy = center
+        col0 = max(self.col0, math.floor((cx - max_radius) / size))
+        col1 = min(self.col1, math.floor((cx + max_radius) / size))
+        row0 = max(self.row0, math.floor((cy - max_radius) / size))
+        row1 = min(self.row1, math.floor((cy + max_radius) / size))
+        min_sq = min_radius * min_radius
+        max_sq = max_radius * max_radius
+        tiles = []
+        for row in range(row0, row1 + 1):
+            dy = (row + 0.5) * size - cy
+            for col in range(col0, col1 + 1):
+                dx = (col + 0.5) * size - cx
+                if not min_sq <= dx * dx + dy * dy <= max_sq:
+                    continue
+                tile = (col, row)
+                if not self.is_standable(tile):
+                    continue
+                if components is not None and self.component_of(tile) not in components:
+                    continue
+                tiles.append(tile)
+        return tiles
@@ -0,0 +1,174 @@
+import itertools
+import math
+import pygame
+from src.settings import TILE_SIZE
+
+class CollisionGrid:
+	"""
+	碰撞占用网格 - 以瓦片为单位记录每个格子里有哪些碰撞体
+	每个碰撞体登记在它的rect和hitbox覆盖的所有格子里，
+	查询时只访问与查询矩形重叠的格子，再由调用方对这几个候选做精确的矩形判断，
+	碰撞开销与接触的格子数成正比，与地图上障碍物的总数无关
+	"""
+	def __init__(self, cell_size=TILE_SIZE):
+		self.cell_size = cell_size
+		self.cells = {}  # (col, row) -> {sprite: None}
+		self.sprite_cells = {}  # sprite -> 占用的格子列表
+		self.shapes = {}  # sprite -> 登记时的(rect, hitbox)，refresh据此判断碰撞体是否真的变了
+		self.order = {}  # sprite -> 序号，候选按加入顺序返回，与遍历整个组的结果一致
+		self._pending = {}  # sprite -> 序号，等待登记的新碰撞体
+		self._order = itertools.count()
+		self.version = 0  # 碰撞体每变化一次加一，寻路等缓存据此判断是否失效
+
+	def __len__(self):
+		return len(self.order) + len(self._pending)
+
+	def __contains__(self, sprite):
+		return sprite in self.order or sprite in self._pending
+
+	def add(self, sprite):
+		"""
+		加入碰撞体
+		精灵通常在设置rect和hitbox之前就加入了组，所以先挂起，到flush时再登记
+		"""
+		if sprite not in self:
+			self._pending[sprite] = next(self._order)
+
+	def remove(self, sprite):
+		"""
+		移除碰撞体（例如树被砍倒、作物被收获）
+		"""
+		if self._pending.pop(sprite, None) is None and sprite in self.order:
+			self._detach(sprite)
+			del self.order[sprite]
+			self.version += 1
+
+	def flush(self):
+		"""
+		登记挂起的新碰撞体
+		"""
+		if self._pending:
+			pending, self._pending = self._pending, {}
+			for sprite, sequence in pending.items():
+				self.order[sprite] = sequence
+				self._attach(sprite)
+			self.version += 1
+
+	def refresh(self, sprite):
+		"""
+		碰撞体的rect或hitbox变化后调用，重新登记占用的格子
+		只换了图像（例如收获果实）而rect和hitbox不变时什么也不做，寻路缓存保持有效
+		"""
+		if sprite in self.order and self.shape(sprite) != self.shapes.get(sprite):
+			self._detach(sprite)
+			self._attach(sprite)
+			self.version += 1
+
+	@staticmethod
+	def shape(sprite):
+		"""
+		碰撞体的形状：rect和hitbox的位置尺寸
+		"""
+		hitbox = getattr(sprite, 'hitbox', None)
+		return (tuple(sprite.rect), tuple(hitbox) if hitbox else None)
+
+	@staticmethod
+	def bounds(sprite):
+		"""
+		碰撞体占用的范围：rect和hitbox的并集（放置检查用rect，移动碰撞用hitbox）
+		"""
+		rect = sprite.rect
+		hitbox = getattr(sprite, 'hitbox', None)
+		if hitbox:
+			return rect.union(hitbox)
+		return rect
+
+	def cell_range(self, rect):
+		"""
+		返回与矩形重叠的格子范围 (col0, row0, col1, row1)，包含两端
+		"""
+		size = self.cell_size
+		return (
+			math.floor(rect.left / size),
+			math.floor(rect.top / size),
+			math.floor((rect.right - 1) / size),
+			math.floor((rect.bottom - 1) / size))
+
+	def _attach(self, sprite):
+		col0, row0, col1, row1 = self.cell_range(self.bounds(sprite))
+		cells = []
+		for row in range(row0, row1 + 1):
+			for col in range(col0, col1 + 1):
+				self.cells.setdefault((col, row), {})[sprite] = None
+				cells.append((col, row))
+		self.sprite_cells[sprite] = cells
+		self.shapes[sprite] = self.shape(sprite)
+
+	def _detach(self, sprite):
+		self.shapes.pop(sprite, None)
+		for cell in self.sprite_cells.pop(sprite, ()):
+			bucket = self.cells[cell]
+			del bucket[sprite]
+			if not bucket:
+				del self.cells[cell]
+
+	def query(self, rect, margin=0):
+		"""
+		返回占用格子与矩形（四周外扩margin）重叠的碰撞体，按加入顺序排列
+		结果是候选集，需要精确判断时由调用方自行检测
+		"""
+		self.flush()
+		rect = pygame.Rect(rect)
+		if margin:
+			rect.inflate_ip(margin * 2, margin * 2)
+		col0, row0, col1, row1 = self.cell_range(rect)
+		cells = self.cells
+		found = {}
+		for row in range(row0, row1 + 1):
+			for col in range(col0, col1 + 1):
+				bucket = cells.get((col, row))
+				if bucket:
+					found.update(bucket)
+		if len(found) > 1:
+			order = self.order
+			return sorted(found, key=order.__getitem__)
+		return list(found)
+
+class CollisionGroup(pygame.sprite.Group):
+	"""
+	碰撞精灵组 - 在普通精灵组的基础上维护碰撞占用网格
+	精灵加入、移除（砍树、种植、收获）时自动更新网格
+	"""
+	def __init__(self, *sprites):
+		self.grid = CollisionGrid()
+		super().__init__(*sprites)
+
+	def add_internal(self, sprite, layer=None):
+		super().add_internal(sprite, layer)
+		self.grid.add(sprite)
+
+	def remove_internal(self, sprite):
+		super().remove_internal(sprite)
+		self.grid.remove(sprite)
+
+	def query(self, rect, margin=0):
+		"""
+		返回可能与矩形碰撞的精灵（见CollisionGrid.query）
+		"""
+		return self.grid.query(rect, margin)
+
+	def refresh_sprite(self, sprite):
+		"""
+		碰撞体移动或改变大小后重新登记
+		"""
+		self.grid.refresh(sprite)
+
+def nearby_sprites(group, rect, margin=0):
+	"""
+	获取可能与矩形碰撞的精灵
+	普通精灵组没有占用网格，退回遍历整个组
+	"""
+	query = getattr(group, 'query', None)
+	if query is None:
+		return group.sprites()
+	return query(rect, margin)
@@ -3,6 +3,14 @@ import math
 from src.settings import *
 from .player import Player
 from src.ui.overlay import Overlay
+from src.rendering.draw_list import LayeredDrawList
+from src.rendering.chunk_baker import ChunkBaker
+from src.rendering.animation import get_animation_clock
+from src.rendering.dirty_rects import get_dirty_rects
+from src.rendering.hud import get_hud_cache
+from src.core.collision_grid import CollisionGroup
+from src.utils.spatial_grid import ProximityGroup
+from src.utils.water_field import WaterField, NUMPY_AVAILABLE
 from src.rendering.ascii_sprites import ASCIIGeneric, ASCIIWater, ASCIIWildFlower, ASCIITree, ASCIIInteraction, ASCIIParticle, ASCIINPC, ASCIIHouse
 from .map_loader import load_pygame, MapObjectLayer
 from src.core.support import *
@@ -36,11 +44,11 @@ class Level:
 
 		# 精灵组管理
 		self.all_sprites = CameraGroup()
-		self.collision_sprites = pygame.sprite.Group()
+		self.collision_sprites = CollisionGroup()  # 带碰撞占用网格，移动和放置检查只看附近的格子
 		self.tree_sprites = pygame.sprite.Group()
 		self.interaction_sprites = pygame.sprite.Group()
 		self.water_sprites = pygame.sprite.Group()  # 水精灵组，用于钓鱼功能
-		self.npc_sprites = pygame.sprite.Group()  # NPC精灵组
+		self.npc_sprites = ProximityGroup()  # NPC精灵组（包括猫咪），带邻近索引
 
 		# 土壤层系统 - 使用ASCII版本
 		self.soil_layer = ASCIISoilLayer(self.all_sprites, self.collision_sprites)
@@ -94,6 +102,7 @@ class Level:
 		self.rain = Rain(self.all_sprites)
 		self.raining = False  # 不下雨
 		self.soil_layer.raining = self.raining
+		self.rain.raining = self.raining
 		self.sky = Sky()  # 天空效果
 		
 		# 设置覆盖层的天空系统引用
@@ -143,11 +152,16 @@ class Level:
 			ASCIIGeneric((x * TILE_SIZE,y * TILE_SIZE), 'fence', [self.all_sprites])
 
 		# 水效果 (水有碰撞)
+		water_tiles = []
 		for x, y, surf in tmx_data.get_layer_by_name('Water').tiles():
+			water_tiles.append((x, y))
 			ASCIIWater((x * TILE_SIZE,y * TILE_SIZE), [self.all_sprites, self.water_sprites])
 			# 给水添加碰撞
 			ASCIIGeneric((x * TILE_SIZE, y * TILE_SIZE), 'water', [self.collision_sprites])
 		
+		# 水域距离场，钓鱼时查表判断是否在水边（需要numpy，否则逐个检查水精灵）
+		self.water_field = WaterField(water_tiles, (tmx_data.width, tmx_data.height)) if NUMPY_AVAILABLE else None
+		
 		# 小径
 		for x, y, surf in tmx_data.get_layer_by_name('Path').tiles():
 			ASCIIGeneric((x * TILE_SIZE, y * TILE_SIZE), 'dirt', [self.all_sprites], z=LAYERS['ground'])
@@ -215,6 +229,7 @@ class Level:
 				
 				# 设置水精灵组，用于钓鱼功能
 				self.player.water_sprites = self.water_sprites
+				self.player.water_field = self.water_field
 				
 				# 设置level引用，用于猫咪管理
 				self.player.level = self
@@ -278,6 +293,9 @@ class Level:
 		# 设置事件通知管理器连接
 		self.cat_manager.set_event_notification_manager(self.event_notification_manager)
 
+		# 地图静态部分已全部创建，预先烘焙区块
+		self.all_sprites.bake_static()
+
 	def create_npcs(self):
 		"""创建NPC精灵"""
 		# 商人NPC（在商店区域附近）
@@ -347,6 +365,7 @@ class Level:
 		self.soil_layer.remove_water()  # 移除所有水分
 		self.raining = randint(0,10) > 7  # 重新随机天气
 		self.soil_layer.raining = self.raining
+		self.rain.raining = self.raining
 		if self.raining:
 			self.soil_layer.water_all()  # 如果下雨，给所有土壤浇水
 
@@ -381,33 +400,17 @@ class Level:
 		# 检查玩家是否靠近NPC（允许一定交互距离）
 		interaction_distance = TILE_SIZE * 1.5  # 交互距离
 		
-		for npc in self.npc_sprites:
-			# 计算玩家与NPC的距离
-			player_center = self.player.rect.center
-			npc_center = npc.rect.center
-			distance = ((player_center[0] - npc_center[0]) ** 2 + 
-					   (player_center[1] - npc_center[1]) ** 2) ** 0.5
-			
-			if distance <= interaction_distance:
-				# print(f"[NPC交互] 玩家靠近NPC: {npc.npc_id}, 距离: {distance:.1f}")
-				return npc
-		return None
+		# 通过邻近索引找到最近的NPC
+		npc, distance = self.npc_sprites.nearest(self.player.rect.center, interaction_distance)
+		return npc
 	
 	def check_cat_interaction(self):
 		"""检查猫咪NPC交互"""
 		interaction_distance = TILE_SIZE * 1.5  # 交互距离
 		
-		for cat in self.cat_manager.cats:
-			# 计算玩家与猫咪的距离
-			player_center = self.player.rect.center
-			cat_center = cat.rect.center
-			distance = ((player_center[0] - cat_center[0]) ** 2 + 
-					   (player_center[1] - cat_center[1]) ** 2) ** 0.5
-			
-			if distance <= interaction_distance:
-				# print(f"[猫咪交互] 玩家靠近猫咪: {cat.cat_name}, 距离: {distance:.1f}")
-				return cat
-		return None
+		# 通过邻近索引找到最近的猫咪
+		cat, distance = self.cat_manager.cat_index.nearest(self.player.rect.center, interaction_distance)
+		return cat
 	
 	def check_workbench_interaction(self):
 		"""检查是否在工作台附近可以交互"""
@@ -606,15 +609,13 @@ class Level:
 			font_manager = FontManager.get_instance()
 			font = font_manager.load_chinese_font(32, "npc_hint_font")
 			hint_text = f"按 T 键查看 {nearby_cat.cat_name} 的详细信息"
-			text_surface = font.render(hint_text, True, (255, 182, 193))  # 粉色
+			hud = get_hud_cache()
+			text_surface = hud.text(font, hint_text, (255, 182, 193))  # 粉色
 			text_rect = text_surface.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 100))
 			
 			# 绘制半透明背景
-			bg_rect = text_rect.inflate(20, 10)
-			bg_surface = pygame.Surface((bg_rect.width, bg_rect.height))
-			bg_surface.set_alpha(128)
-			bg_surface.fill((0, 0, 0))
-			self.display_surface.blit(bg_surface, bg_rect)
+			bg_rect = hud.draw_box(self.display_surface, text_rect.inflate(20, 10), (0, 0, 0, 128))
+			get_dirty_rects().add_ui(bg_rect)
 			
 			# 绘制文本
 			self.display_surface.blit(text_surface, text_rect)
@@ -630,15 +631,13 @@ class Level:
 				font_manager = FontManager.get_instance()
 				font = font_manager.load_chinese_font(32, "npc_hint_font")
 				hint_text = f"按 T 键与 {npc_data.name} 对话"
-				text_surface = font.render(hint_text, True, (255, 255, 100))
+				hud = get_hud_cache()
+				text_surface = hud.text(font, hint_text, (255, 255, 100))
 				text_rect = text_surface.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 100))
 				
 				# 绘制半透明背景
-				bg_rect = text_rect.inflate(20, 10)
-				bg_surface = pygame.Surface((bg_rect.width, bg_rect.height))
-				bg_surface.set_alpha(128)
-				bg_surface.fill((0, 0, 0))
-				self.display_surface.blit(bg_surface, bg_rect)
+				bg_rect = hud.draw_box(self.display_surface, text_rect.inflate(20, 10), (0, 0, 0, 128))
+				get_dirty_rects().add_ui(bg_rect)
 				
 				# 绘制文本
 				self.display_surface.blit(text_surface, text_rect)
@@ -663,8 +662,8 @@ class Level:
 
 		# 天气系统
 		self.overlay.display()  # 显示界面覆盖层
-		if self.raining and not self.shop_active:
-			self.rain.update()  # 更新雨效果
+		if not self.shop_active:
+			self.rain.update(dt)  # 更新雨效果（停雨后剩余的雨滴自然消失）
 		self.sky.display(dt)  # 显示天空效果
 		
 		# 对话系统渲染
@@ -729,6 +728,20 @@ class Level:
 		# 过渡动画
 		if self.player.sleep:
 			self.transition.play()  # 如果玩家睡觉，播放过渡动画
+
+		# 脏矩形模式：大块面板打开时以及关闭后的第一帧整屏提交
+		get_dirty_rects().set_panel_open(self.has_open_panel())
+
+	def has_open_panel(self):
+		"""
+		是否有大块界面正在显示（商店、对话、各类面板、钓鱼、睡觉过渡等）
+		"""
+		return (self.shop_active or self.player.sleep or self.player.is_fishing
+				or self.dialogue_ui.is_active() or self.quest_panel.is_active
+				or self.player.log_panel.is_active or self.chat_panel.is_active
+				or self.cat_info_ui.is_active or self.fishing_minigame.is_active
+				or self.catch_result_panel.is_active or self.bait_box_ui.is_visible
+				or self.player.inventory_ui.is_open or self.player.inventory_ui.placement_mode)
 	
 	def render_fishing_state_ui(self):
 		"""渲染钓鱼状态UI"""
@@ -761,15 +774,12 @@ class Level:
 		# 渲染文本
 		font_manager = FontManager.get_instance()
 		font = font_manager.load_chinese_font(32, "fishing_state_font")
-		text_surface = font.render(text, True, color)
+		hud = get_hud_cache()
+		text_surface = hud.text(font, text, color)
 		text_rect = text_surface.get_rect(center=(SCREEN_WIDTH//2, 100))
 		
 		# 绘制半透明背景
-		bg_rect = text_rect.inflate(20, 10)
-		bg_surface = pygame.Surface((bg_rect.width, bg_rect.height))
-		bg_surface.set_alpha(128)
-		bg_surface.fill((0, 0, 0))
-		self.display_surface.blit(bg_surface, bg_rect)
+		hud.draw_box(self.display_surface, text_rect.inflate(20, 10), (0, 0, 0, 128))
 		
 		# 绘制文本
 		self.display_surface.blit(text_surface, text_rect)
@@ -783,7 +793,7 @@ class Level:
 		
 		if hint_text:
 			hint_font = font_manager.load_chinese_font(24, "fishing_hint_font")
-			hint_surface = hint_font.render(hint_text, True, (200, 200, 200))
+			hint_surface = hud.text(hint_font, hint_text, (200, 200, 200))
 			hint_rect = hint_surface.get_rect(center=(SCREEN_WIDTH//2, 140))
 			self.display_surface.blit(hint_surface, hint_rect)
 	
@@ -885,11 +895,101 @@ class Level:
 class CameraGroup(pygame.sprite.Group):
 	"""
 	相机精灵组 - 实现跟随玩家的相机效果
+	精灵按z层分桶保存在绘制列表中，加入/移除时维护，绘制时无需全量排序
+	绘制时通过空间网格只取出相机可见范围内的精灵
+	地面、地板等静态图层预先烘焙成区块表面，每帧只blit可见区块
 	"""
+	# 参与烘焙的图层：烘焙区块在本层的精灵之前绘制，只烘焙不需要与活动精灵按centery交错排序的图层
+	# main层的装饰（灌木、石头、房屋等）要遮挡走到它们北边的玩家、猫咪和NPC，所以不烘焙
+	BAKED_LAYERS = (LAYERS['water'], LAYERS['ground'], LAYERS['house bottom'])
+
 	def __init__(self):
 		super().__init__()
 		self.display_surface = pygame.display.get_surface()
 		self.offset = pygame.math.Vector2()  # 相机偏移量
+		# 静态图层区块：树木、交互物件默认位于water层，与地面、地板一起烘焙
+		self.chunk_baker = ChunkBaker(self.BAKED_LAYERS)
+		self.draw_list = LayeredDrawList(self.chunk_baker)  # 分层绘制列表
+		self.view_rect = pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)  # 相机在世界中的可见范围
+		self.updating = {}  # 重写了update的精灵（按加入顺序），静态瓦片不参与每帧更新
+		self.last_drawn = {}  # 脏矩形模式：上一帧绘制的精灵 -> (图像, 屏幕rect)
+		self.layer_painters = {}  # z -> [painter(surface, view_rect)]，不是精灵的图层内容（如雨）
+		self.pending_painters = []  # 本帧尚未调用的绘制回调的z
+		self.last_view_topleft = None
+
+	def add_internal(self, sprite, layer=None):
+		super().add_internal(sprite, layer)
+		self.draw_list.add(sprite)
+		if type(sprite).update is not pygame.sprite.Sprite.update:
+			self.updating[sprite] = None
+
+	def remove_internal(self, sprite):
+		super().remove_internal(sprite)
+		self.draw_list.remove(sprite)
+		self.updating.pop(sprite, None)
+
+	def update(self, dt):
+		"""
+		推进全局动画时钟，只更新真正有update逻辑的精灵
+		"""
+		get_animation_clock().update(dt)
+		for sprite in list(self.updating):
+			sprite.update(dt)
+
+	def refresh_sprite(self, sprite):
+		"""
+		精灵的z层、静态位置或烘焙图像变化后重新归桶（见notify_sprite_changed）
+		"""
+		self.draw_list.refresh(sprite)
+
+	def bake_static(self):
+		"""
+		归桶所有已加入的精灵并烘焙静态区块，关卡加载完成后调用
+		"""
+		self.draw_list.flush()
+		self.chunk_baker.bake_dirty()
+
+	def add_layer_painter(self, z, painter):
+		"""
+		注册图层绘制回调，在该层的精灵之后调用
+		"""
+		self.layer_painters.setdefault(z, []).append(painter)
+
+	def paint_layers(self, below):
+		"""
+		调用z小于below的、尚未调用的图层绘制回调
+		"""
+		while self.pending_painters and self.pending_painters[0] < below:
+			for painter in self.layer_painters[self.pending_painters.pop(0)]:
+				painter(self.display_surface, self.view_rect)
+
+	def report_dirty_rects(self, dirty_rects, drawn, rebaked):
+		"""
+		脏矩形模式：对比上一帧的绘制结果，报告变化的屏幕区域
+		相机移动时整屏都变了，直接退回整屏提交
+		"""
+		previous, self.last_drawn = self.last_drawn, drawn
+		view_topleft = self.view_rect.topleft
+		if view_topleft != self.last_view_topleft:
+			self.last_view_topleft = view_topleft
+			dirty_rects.invalidate()
+			return
+
+		for world_rect in rebaked:
+			dirty_rects.add(world_rect.move(-self.view_rect.x, -self.view_rect.y))
+
+		for sprite, (image, rect) in drawn.items():
+			old = previous.pop(sprite, None)
+			# 动态精灵和自带update的精灵可能原地重绘图像，总是报告
+			if (old is None or old[0] is not image or old[1] != rect
+					or sprite in self.updating or self.draw_list.is_dynamic(sprite)):
+				dirty_rects.add(rect)
+				if old is not None and old[1] != rect:
+					dirty_rects.add(old[1])
+
+		# 本帧不再绘制的精灵（被移除或离开视口）
+		for _, rect in previous.values():
+			dirty_rects.add(rect)
 
 	def custom_draw(self, player):
 		"""
@@ -899,19 +999,25 @@ class CameraGroup(pygame.sprite.Group):
 		self.offset.x = player.rect.centerx - SCREEN_WIDTH / 2
 		self.offset.y = player.rect.centery - SCREEN_HEIGHT / 2
 
-		# 按层级绘制精灵
-		for layer in LAYERS.values():
-			for sprite in sorted(self.sprites(), key = lambda sprite: sprite.rect.centery):
-				if sprite.z == layer:
-					offset_rect = sprite.rect.copy()
-					offset_rect.center -= self.offset  # 应用相机偏移
-					self.display_surface.blit(sprite.image, offset_rect)  # 绘制精灵
-
-					# # 调试分析代码（已注释）
-					# if sprite == player:
-					# 	pygame.draw.rect(self.display_surface,'red',offset_rect,5)
-					# 	hitbox_rect = player.hitbox.copy()
-					# 	hitbox_rect.center = offset_rect.center
-					# 	pygame.draw.rect(self.display_surface,'green',hitbox_rect,5)
-					# 	target_pos = offset_rect.center + PLAYER_TOOL_OFFSET[player.status.split('_')[0]]
-					# 	pygame.draw.circle(self.display_surface,'blue',target_pos,5)
\ No newline at end of file
+		# 按层级绘制可见范围内的区块和精灵
+		self.view_rect.topleft = (round(self.offset.x), round(self.offset.y))
+		self.draw_list.flush()
+		rebaked = self.chunk_baker.bake_dirty()
+		dirty_rects = get_dirty_rects()
+		drawn = {} if dirty_rects.enabled else None
+		self.pending_painters = sorted(self.layer_painters)
+		for z, sprites in self.draw_list.visible_layers(self.view_rect):
+			self.paint_layers(z)
+			for chunk_surface, chunk_rect in self.chunk_baker.visible_chunks(z, self.view_rect):
+				self.display_surface.blit(chunk_surface, chunk_rect.move(-self.view_rect.x, -self.view_rect.y))
+
+			for sprite in sprites:
+				offset_rect = sprite.rect.copy()
+				offset_rect.center -= self.offset  # 应用相机偏移
+				self.display_surface.blit(sprite.image, offset_rect)  # 绘制精灵
+				if drawn is not None:
+					drawn[sprite] = (sprite.image, offset_rect)
+		self.paint_layers(float('inf'))
+
+		if drawn is not None:
+			self.report_dirty_rects(dirty_rects, drawn, rebaked)
@@ -2,18 +2,21 @@ import pygame
 from ..settings import *
 from .support import *
 from ..systems.timer import Timer
+from .collision_grid import nearby_sprites
 from ..systems.fish_system import FishSystem
 from ..ui.log_panel import LogPanel
 import datetime
 
 class Player(pygame.sprite.Sprite):
+	dynamic = True  # 会移动，绘制列表每帧对其重新排序
+
 	def __init__(self, pos, group, collision_sprites, tree_sprites, interaction, soil_layer, toggle_shop, quest_panel=None, ascii_mode=False, chat_panel=None):
 		super().__init__(group)
 
 		# ASCII模式设置
 		
-		from ..rendering.ascii_renderer import ASCIIRenderer
-		self.ascii_renderer = ASCIIRenderer()
+		from ..rendering.ascii_renderer import get_ascii_renderer
+		self.ascii_renderer = get_ascii_renderer()
 		# 创建ASCII表面 - 使用TILE_SIZE保持一致
 		self.image = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
 		# ASCII字符映射
@@ -60,6 +63,7 @@ class Player(pygame.sprite.Sprite):
 		# 钓鱼相关属性初始化（需要在render_ascii_player之前）
 		self.is_fishing = False
 		self.water_sprites = None  # 将在level中设置
+		self.water_field = None  # 水域距离场，将在level中设置
 		self.fish_system = FishSystem()  # 鱼类系统
 		
 		# 钓鱼状态机
@@ -212,10 +216,11 @@ class Player(pygame.sprite.Sprite):
 		}
 		
 		self.behavior_history.append(behavior_record)
+		self.log_panel.on_player_log_added(behavior_record)
 		
 		# 如果历史记录过多，删除最老的记录
 		if len(self.behavior_history) > self.max_history_size:
-			self.behavior_history.pop(0)
+			self.log_panel.on_player_log_removed(self.behavior_history.pop(0))
 		
 		# 打印记录（调试用）
 		print(f"[行为记录] {behavior_record['timestamp']} - {behavior_type}: {action}")
@@ -408,6 +413,9 @@ class Player(pygame.sprite.Sprite):
 		detection_radius = TILE_SIZE + 10  # 稍微扩大检测范围
 		player_center = self.rect.center
 		
+		if self.water_field:
+			return self.water_field.near(player_center, detection_radius)
+		
 		for water_sprite in self.water_sprites.sprites():
 			# 计算玩家和水的距离
 			water_center = water_sprite.rect.center
@@ -426,6 +434,9 @@ class Player(pygame.sprite.Sprite):
 			return None
 		
 		player_center = self.rect.center
+		if self.water_field:
+			return self.water_field.nearest(player_center)
+		
 		nearest_water = None
 		min_distance = float('inf')
 		
@@ -1149,7 +1160,8 @@ class Player(pygame.sprite.Sprite):
 			timer.update()
 
 	def collision(self, direction):
-		for sprite in self.collision_sprites.sprites():
+		# 只检查附近格子里的碰撞体；被推出一个障碍物后hitbox最多移动一个瓦片，所以向外多查一格
+		for sprite in nearby_sprites(self.collision_sprites, self.hitbox, TILE_SIZE):
 			if hasattr(sprite, 'hitbox'):
 				if sprite.hitbox.colliderect(self.hitbox):
 					if direction == 'horizontal':
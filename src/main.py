@@ -19,6 +19,7 @@ import pygame
 from src.settings import *
 from src.core.level import Level
 from src.utils.font_manager import FontManager
+from src.rendering.dirty_rects import get_dirty_rects
 
 class Game:
 	"""
@@ -47,6 +48,8 @@ class Game:
 		self.font_manager = FontManager.get_instance()
 		self.font = self.font_manager.load_chinese_font(36, "menu_large")
 		self.small_font = self.font_manager.load_chinese_font(24, "menu_small")
+		# 停留在主菜单时逐帧预加载关卡界面要用的字体
+		self.font_manager.start_warm_up()
 		
 		# 开始游戏按钮
 		self.start_button = pygame.Rect(SCREEN_WIDTH//2 - 100, SCREEN_HEIGHT//2 - 25, 200, 50)
@@ -235,6 +238,7 @@ class Game:
 		主游戏循环
 		"""
 		running = True
+		dirty_rects = get_dirty_rects()
 		
 		while running:
 			dt = self.clock.tick(60) / 1000
@@ -242,12 +246,15 @@ class Game:
 			if self.show_menu:
 				running = self.handle_menu_events()
 				self.draw_menu()
+				self.font_manager.warm_up_step()
+				dirty_rects.invalidate()
 			else:
 				running = self.handle_game_events()
 				if self.level:
 					self.level.run(dt)
 			
-			pygame.display.flip()
+			# 提交画面（未开启脏矩形模式时等同于pygame.display.flip）
+			dirty_rects.present()
 		
 		pygame.quit()
 		sys.exit()
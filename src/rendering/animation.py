@@ -0,0 +1,67 @@
+class AnimationTrack:
+	"""
+	动画轨道 - 一组预先渲染好的共享帧和一个帧计时器
+	同类动画瓦片共用一条轨道，各实例只保存自己的相位偏移
+	"""
+	def __init__(self, frames, frame_duration):
+		self.frames = frames
+		self.frame_duration = frame_duration
+		self.frame_index = 0
+		self.timer = 0
+
+	def advance(self, dt):
+		"""
+		推进计时器，切换到下一帧时返回True
+		"""
+		self.timer += dt
+		if self.timer >= self.frame_duration:
+			self.timer = 0
+			self.frame_index += 1
+			return True
+		return False
+
+	def frame(self, phase=0):
+		"""
+		获取当前帧表面，phase为实例的相位偏移
+		"""
+		return self.frames[(self.frame_index + phase) % len(self.frames)]
+
+class AnimationClock:
+	"""
+	全局动画时钟
+	每帧只推进各条轨道的计时器，动画瓦片在绘制时按轨道的帧序号取共享表面，
+	瓦片数量再多，每帧的动画开销也与实例数无关
+	"""
+	def __init__(self):
+		self.tracks = {}
+
+	def track(self, name, build_frames, frame_duration):
+		"""
+		获取动画轨道，不存在时调用build_frames预渲染全部帧并注册
+		"""
+		track = self.tracks.get(name)
+		if track is None:
+			track = AnimationTrack(build_frames(), frame_duration)
+			self.tracks[name] = track
+		return track
+
+	def update(self, dt):
+		"""
+		推进所有轨道
+		动画瓦片的image直接取轨道当前帧，切换画面后表面对象随之改变，
+		脏矩形模式据此判断哪些瓦片需要重新提交，这里不必另外记录
+		"""
+		for track in self.tracks.values():
+			track.advance(dt)
+
+# 全局动画时钟实例
+_animation_clock = None
+
+def get_animation_clock():
+	"""
+	获取动画时钟单例
+	"""
+	global _animation_clock
+	if _animation_clock is None:
+		_animation_clock = AnimationClock()
+	return _animation_clock
@@ -1,14 +1,111 @@
 import os
+from types import MappingProxyType
 import pygame
 from src.settings import *
 from src.utils.font_manager import FontManager
+from src.utils.codepoint import is_emoji
+from .glyph_cache import get_glyph_cache
 
 class ASCIIRenderer:
 	"""
 	ASCII渲染器 - 将游戏对象渲染为ASCII字符
 	参考矮人要塞的视觉风格
+	字符、颜色、变体表是所有实例共享的只读映射，通过get_ascii_renderer()获取共享实例
 	"""
 	
+	# ASCII字符映射表 - 参考矮人要塞风格
+	ascii_map = MappingProxyType({
+		# 地形
+		'grass': '.',      # 草地
+		'water': '~',      # 水
+		'stone': '#',      # 石头
+		'dirt': ',',       # 泥土
+		'sand': ':',       # 沙子
+		
+		# 植物
+		'tree': 'T',       # 大树
+		'sapling': 't',    # 小树
+		'bush': '🌳',       # 灌木
+		'flower': '*',     # 花
+		'mushroom': 'm',   # 蘑菇
+		'crop': 'c',       # 农作物
+		
+		# 建筑
+		'wall': '#',       # 墙
+		'floor': '.',      # 地板
+		'door': '+',       # 门
+		'window': '=',     # 窗户
+		'fence': '|',      # 栅栏
+		
+		# 角色
+		'player': '@',     # 玩家
+		'npc': '&',        # NPC
+		'animal': 'a',     # 动物
+		
+		# 物品
+		'apple': 'o',      # 苹果
+		'fruit': 'f',      # 水果
+		'seed': 's',       # 种子
+		'tool': 'w',       # 工具
+		
+		# 特殊
+		'bed': '=',        # 床
+		'chest': 'C',      # 箱子
+		'stump': 'S',      # 树桩
+		'rock': 'o',       # 岩石
+	})
+	
+	# 颜色映射表
+	color_map = MappingProxyType({
+		# 地形颜色
+		'grass': (34, 139, 34),      # 绿色
+		'water': (0, 191, 255),      # 蓝色
+		'stone': (105, 105, 105),    # 灰色
+		'dirt': (139, 69, 19),       # 棕色
+		'sand': (238, 203, 173),     # 沙色
+		
+		# 植物颜色
+		'tree': (0, 100, 0),         # 深绿色
+		'sapling': (34, 139, 34),    # 绿色
+		'bush': (85, 107, 47),       # 橄榄绿
+		'flower': (255, 20, 147),    # 粉色
+		'mushroom': (255, 0, 0),     # 红色
+		'crop': (255, 215, 0),       # 金色
+		
+		# 建筑颜色
+		'wall': (139, 69, 19),       # 棕色
+		'floor': (160, 82, 45),      # 棕色
+		'door': (139, 69, 19),       # 棕色
+		'window': (135, 206, 235),   # 天蓝色
+		'fence': (139, 69, 19),      # 棕色
+		
+		# 角色颜色
+		'player': (255, 255, 255),   # 白色
+		'npc': (255, 255, 0),        # 黄色
+		'animal': (255, 140, 0),     # 橙色
+		
+		# 物品颜色
+		'apple': (255, 0, 0),        # 红色
+		'fruit': (255, 165, 0),      # 橙色
+		'seed': (139, 69, 19),       # 棕色
+		'tool': (192, 192, 192),     # 银色
+		
+		# 特殊颜色
+		'bed': (255, 228, 196),      # 米色
+		'chest': (139, 69, 19),      # 棕色
+		'stump': (101, 67, 33),      # 深棕色
+		'rock': (105, 105, 105),     # 灰色
+	})
+	
+	# 变体字符表
+	variant_chars = MappingProxyType({
+		'grass': ('.', ',', '`', "'"),
+		'water': ('~', '≈', '≈', '≈'),
+		'tree': ('T', 't', 'Y', 'y'),
+		'flower': ('*', '✿', '✾', '✽'),
+		'mushroom': ('m', 'M', 'n', 'N'),
+	})
+	
 	def __init__(self):
 		# 使用字体管理器获取字体
 		font_manager = FontManager.get_instance()
@@ -16,111 +113,13 @@ class ASCIIRenderer:
 		self.emoji_font = font_manager.load_emoji_font(16, "ascii_emoji_renderer")
 		self.tile_size = 16  # ASCII字符大小
 		
-		# ASCII字符映射表 - 参考矮人要塞风格
-		self.ascii_map = {
-			# 地形
-			'grass': '.',      # 草地
-			'water': '~',      # 水
-			'stone': '#',      # 石头
-			'dirt': ',',       # 泥土
-			'sand': ':',       # 沙子
-			
-			# 植物
-			'tree': 'T',       # 大树
-			'sapling': 't',    # 小树
-			'bush': '🌳',       # 灌木
-			'flower': '*',     # 花
-			'mushroom': 'm',   # 蘑菇
-			'crop': 'c',       # 农作物
-			
-			# 建筑
-			'wall': '#',       # 墙
-			'floor': '.',      # 地板
-			'door': '+',       # 门
-			'window': '=',     # 窗户
-			'fence': '|',      # 栅栏
-			
-			# 角色
-			'player': '@',     # 玩家
-			'npc': '&',        # NPC
-			'animal': 'a',     # 动物
-			
-			# 物品
-			'apple': 'o',      # 苹果
-			'fruit': 'f',      # 水果
-			'seed': 's',       # 种子
-			'tool': 'w',       # 工具
-			
-			# 特殊
-			'bed': '=',        # 床
-			'chest': 'C',      # 箱子
-			'stump': 'S',      # 树桩
-			'rock': 'o',       # 岩石
-		}
-		
-		# 颜色映射表
-		self.color_map = {
-			# 地形颜色
-			'grass': (34, 139, 34),      # 绿色
-			'water': (0, 191, 255),      # 蓝色
-			'stone': (105, 105, 105),    # 灰色
-			'dirt': (139, 69, 19),       # 棕色
-			'sand': (238, 203, 173),     # 沙色
-			
-			# 植物颜色
-			'tree': (0, 100, 0),         # 深绿色
-			'sapling': (34, 139, 34),    # 绿色
-			'bush': (85, 107, 47),       # 橄榄绿
-			'flower': (255, 20, 147),    # 粉色
-			'mushroom': (255, 0, 0),     # 红色
-			'crop': (255, 215, 0),       # 金色
-			
-			# 建筑颜色
-			'wall': (139, 69, 19),       # 棕色
-			'floor': (160, 82, 45),      # 棕色
-			'door': (139, 69, 19),       # 棕色
-			'window': (135, 206, 235),   # 天蓝色
-			'fence': (139, 69, 19),      # 棕色
-			
-			# 角色颜色
-			'player': (255, 255, 255),   # 白色
-			'npc': (255, 255, 0),        # 黄色
-			'animal': (255, 140, 0),     # 橙色
-			
-			# 物品颜色
-			'apple': (255, 0, 0),        # 红色
-			'fruit': (255, 165, 0),      # 橙色
-			'seed': (139, 69, 19),       # 棕色
-			'tool': (192, 192, 192),     # 银色
-			
-			# 特殊颜色
-			'bed': (255, 228, 196),      # 米色
-			'chest': (139, 69, 19),      # 棕色
-			'stump': (101, 67, 33),      # 深棕色
-			'rock': (105, 105, 105),     # 灰色
-		}
+		# (瓦片类型, 变体) -> 字符/颜色，首次查询时计算
+		self._char_table = {}
+		self._color_table = {}
 	
 	def _is_emoji(self, char):
-		"""检查字符是否为emoji"""
-		# 简单的emoji检测 - 检查Unicode范围
-		if len(char) == 0:
-			return False
-		
-		code_point = ord(char[0]) if len(char) == 1 else ord(char[0])
-		
-		# 常见emoji Unicode范围
-		emoji_ranges = [
-			(0x1F600, 0x1F64F),  # Emoticons
-			(0x1F300, 0x1F5FF),  # Misc Symbols and Pictographs
-			(0x1F680, 0x1F6FF),  # Transport and Map
-			(0x1F1E0, 0x1F1FF),  # Regional indicator symbols
-			(0x2600, 0x26FF),    # Misc symbols
-			(0x2700, 0x27BF),    # Dingbats
-			(0xFE00, 0xFE0F),    # Variation selectors
-			(0x1F900, 0x1F9FF),  # Supplemental Symbols and Pictographs
-		]
-		
-		return any(start <= code_point <= end for start, end in emoji_ranges)
+		"""检查字符是否为emoji（查共享的码点分类表）"""
+		return is_emoji(char)
 	
 	def render_ascii(self, surface, char, color, pos, size=None, font=None):
 		"""
@@ -131,20 +130,22 @@ class ASCIIRenderer:
 			size = self.tile_size
 		
 		# 选择合适的字体
-		if self._is_emoji(char):
+		emoji = is_emoji(char)
+		if emoji:
 			selected_font = font or self.emoji_font
 		else:
 			selected_font = font or self.font
 		
+		glyph_cache = get_glyph_cache()
 		try:
-			# 创建文本表面
-			text_surface = selected_font.render(char, True, color)
+			# 创建文本表面（已渲染过的字形直接从缓存取）
+			text_surface = glyph_cache.render(selected_font, char, color)
 			
 			# 检查渲染结果
 			if text_surface.get_width() == 0:
 				# 如果emoji字体渲染失败，回退到普通字体
-				if self._is_emoji(char):
-					text_surface = self.font.render(char, True, color)
+				if emoji:
+					text_surface = glyph_cache.render(self.font, char, color)
 			
 			# 计算居中位置
 			text_rect = text_surface.get_rect()
@@ -157,8 +158,8 @@ class ASCIIRenderer:
 			print(f"字符渲染失败 '{char}': {e}")
 			# 尝试用备用字符渲染
 			try:
-				fallback_char = "?" if not self._is_emoji(char) else "🐱"
-				text_surface = self.font.render(fallback_char, True, color)
+				fallback_char = "?" if not emoji else "🐱"
+				text_surface = glyph_cache.render(self.font, fallback_char, color)
 				text_rect = text_surface.get_rect()
 				text_rect.center = (pos[0] + size // 2, pos[1] + size // 2)
 				surface.blit(text_surface, text_rect)
@@ -169,41 +170,40 @@ class ASCIIRenderer:
 		"""
 		根据瓦片类型获取ASCII字符
 		"""
-		base_char = self.ascii_map.get(tile_type, '?')
-		
-		# 根据变体调整字符
-		if variant > 0:
-			variants = {
-				'grass': ['.', ',', '`', "'"],
-				'water': ['~', '≈', '≈', '≈'],
-				'tree': ['T', 't', 'Y', 'y'],
-				'flower': ['*', '✿', '✾', '✽'],
-				'mushroom': ['m', 'M', 'n', 'N'],
-			}
+		key = (tile_type, variant)
+		char = self._char_table.get(key)
+		if char is None:
+			char = self.ascii_map.get(tile_type, '?')
 			
-			if tile_type in variants:
-				variant_chars = variants[tile_type]
-				return variant_chars[variant % len(variant_chars)]
-		
-		return base_char
+			# 根据变体调整字符
+			if variant > 0 and tile_type in self.variant_chars:
+				variant_chars = self.variant_chars[tile_type]
+				char = variant_chars[variant % len(variant_chars)]
+			
+			self._char_table[key] = char
+		return char
 	
 	def get_color(self, tile_type, variant=0):
 		"""
 		根据瓦片类型获取颜色
 		"""
-		base_color = self.color_map.get(tile_type, (255, 255, 255))
-		
-		# 根据变体调整颜色亮度
-		if variant > 0:
-			r, g, b = base_color
-			# 稍微调整亮度
-			factor = 0.9 + (variant * 0.1)
-			r = min(255, int(r * factor))
-			g = min(255, int(g * factor))
-			b = min(255, int(b * factor))
-			return (r, g, b)
-		
-		return base_color
+		key = (tile_type, variant)
+		color = self._color_table.get(key)
+		if color is None:
+			color = self.color_map.get(tile_type, (255, 255, 255))
+			
+			# 根据变体调整颜色亮度
+			if variant > 0:
+				r, g, b = color
+				# 稍微调整亮度
+				factor = 0.9 + (variant * 0.1)
+				r = min(255, int(r * factor))
+				g = min(255, int(g * factor))
+				b = min(255, int(b * factor))
+				color = (r, g, b)
+			
+			self._color_table[key] = color
+		return color
 	
 	def render_tile(self, surface, tile_type, pos, variant=0):
 		"""
@@ -287,4 +287,17 @@ class ASCIIRenderer:
 		if part_type in house_parts:
 			char, color_key = house_parts[part_type]
 			color = self.color_map[color_key]
-			self.render_ascii(surface, char, color, pos) 
\ No newline at end of file
+			self.render_ascii(surface, char, color, pos)
+
+# 全局ASCII渲染器实例
+_ascii_renderer = None
+
+def get_ascii_renderer():
+	"""
+	获取ASCII渲染器单例
+	渲染器本身不保存绘制状态，所有精灵共用一个即可
+	"""
+	global _ascii_renderer
+	if _ascii_renderer is None:
+		_ascii_renderer = ASCIIRenderer()
+	return _ascii_renderer
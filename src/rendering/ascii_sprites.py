@@ -1,26 +1,44 @@
 import pygame
 from .sprites import Generic
-from .ascii_renderer import ASCIIRenderer
+from .ascii_renderer import get_ascii_renderer
+from .draw_list import notify_sprite_changed
+from .tile_images import get_tile_images
+from .animation import get_animation_clock
 from ..settings import TILE_SIZE, LAYERS
 
 class ASCIIGeneric(Generic):
 	"""
 	ASCII版本的通用精灵类
+	图像来自共享的瓦片图像注册表，修改图像前必须调用own_image（写时复制）
 	"""
+	bakeable = True  # 静态瓦片可以烘焙进背景区块
 	
 	def __init__(self, pos, tile_type, groups, z=0, variant=0):
-		super().__init__(pos, pygame.Surface((TILE_SIZE, TILE_SIZE)), groups, z)
+		# 使用共享的ASCII表面
+		super().__init__(pos, get_tile_images().get(tile_type, variant), groups, z)
 		self.tile_type = tile_type
 		self.variant = variant
-		self.ascii_renderer = ASCIIRenderer()
-		
-		# 创建ASCII表面
-		self.image = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
-		self.ascii_renderer.render_tile(self.image, tile_type, (0, 0), variant)
+		self.owns_image = False  # 图像是否为本精灵独占
 		
 		# 根据瓦片类型设置合适的碰撞盒
 		self.setup_hitbox()
 	
+	def own_image(self):
+		"""
+		写时复制：第一次修改图像前复制一份独占的表面
+		"""
+		if not self.owns_image:
+			self.image = self.image.copy()
+			self.owns_image = True
+		return self.image
+	
+	def set_shared_image(self, tile_type, variant=0, style='tile'):
+		"""
+		切换到注册表中的另一张共享图像
+		"""
+		self.image = get_tile_images().get(tile_type, variant, style)
+		self.owns_image = False
+	
 	def setup_hitbox(self):
 		"""
 		根据瓦片类型设置合适的碰撞盒
@@ -54,65 +72,68 @@ class ASCIIGeneric(Generic):
 		if new_variant is not None:
 			self.variant = new_variant
 		
-		# 重新渲染
-		self.image.fill((0, 0, 0, 0))
-		self.ascii_renderer.render_tile(self.image, self.tile_type, (0, 0), self.variant)
+		# 换成新外观对应的共享图像
+		self.set_shared_image(self.tile_type, self.variant)
+		notify_sprite_changed(self)
+
+class ASCIIAnimatedTile(ASCIIGeneric):
+	"""
+	由全局动画时钟驱动的瓦片
+	图像直接取自共享动画轨道的当前帧，精灵本身没有计时器，也不需要update
+	子类提供build_frames，返回预渲染好的全部帧
+	"""
+	bakeable = False  # 有动画
+	animation_speed = 0.1  # 每帧持续时间（秒）
+	
+	def __init__(self, pos, tile_type, groups, z=0, variant=0, phase=0):
+		# 父类初始化时就会读取image，先接上动画轨道
+		self.tile_type = tile_type
+		self.variant = variant
+		self.phase = phase  # 相位偏移，让同类瓦片的动画不同步
+		self.track = get_animation_clock().track(self.track_name(), self.build_frames, self.animation_speed)
+		super().__init__(pos, tile_type, groups, z, variant)
+	
+	@property
+	def image(self):
+		return self.track.frame(self.phase)
+	
+	@image.setter
+	def image(self, surface):
+		pass  # 图像由动画轨道决定，忽略初始化时赋的静态图像
+	
+	def track_name(self):
+		return self.tile_type
 
-class ASCIIWater(ASCIIGeneric):
+class ASCIIWater(ASCIIAnimatedTile):
 	"""
 	ASCII版本的水精灵
 	"""
+	animation_speed = 0.1
 	
 	def __init__(self, pos, groups):
 		super().__init__(pos, 'water', groups)
-		self.animation_frame = 0
-		self.animation_speed = 0.1
-		self.animation_timer = 0
 	
-	def update(self, dt):
-		"""
-		更新水动画
-		"""
-		self.animation_timer += dt
-		if self.animation_timer >= self.animation_speed:
-			self.animation_timer = 0
-			self.animation_frame += 1
-			
-			# 重新渲染水动画
-			self.image.fill((0, 0, 0, 0))
-			self.ascii_renderer.render_water_animation(self.image, (0, 0), self.animation_frame)
+	def build_frames(self):
+		return [get_tile_images().get('water', frame, 'water') for frame in range(4)]
 
-class ASCIIWildFlower(ASCIIGeneric):
+class ASCIIWildFlower(ASCIIAnimatedTile):
 	"""
 	ASCII版本的野花精灵
 	"""
+	animation_speed = 0.3  # 比水的动画稍慢一些
 	
 	def __init__(self, pos, groups):
 		# 随机选择花的变体
 		import random
 		variant = random.randint(0, 3)
-		super().__init__(pos, 'flower', groups, variant=variant)
-		
-		# 动画相关属性
-		self.animation_frame = 0
-		self.animation_speed = 0.3  # 比水的动画稍慢一些
-		self.animation_timer = 0
-		
 		# 随机化初始动画帧，让不同花朵的动画不同步
-		self.animation_frame = random.randint(0, 3)
+		super().__init__(pos, 'flower', groups, variant=variant, phase=random.randint(0, 3))
 	
-	def update(self, dt):
-		"""
-		更新花朵动画
-		"""
-		self.animation_timer += dt
-		if self.animation_timer >= self.animation_speed:
-			self.animation_timer = 0
-			self.animation_frame += 1
-			
-			# 重新渲染花朵动画
-			self.image.fill((0, 0, 0, 0))
-			self.ascii_renderer.render_flower_animation(self.image, (0, 0), self.animation_frame, self.variant)
+	def track_name(self):
+		return ('flower', self.variant % 4)
+	
+	def build_frames(self):
+		return [get_tile_images().get('flower', (self.variant % 4, frame), 'flower') for frame in range(4)]
 
 class ASCIITree(ASCIIGeneric):
 	"""
@@ -132,16 +153,10 @@ class ASCIITree(ASCIIGeneric):
 	def render_tree(self):
 		"""
 		渲染树木和果实
+		有果实和没有果实的树各自共享一张图像
 		"""
-		self.image.fill((0, 0, 0, 0))
-		
-		# 渲染树干
-		self.ascii_renderer.render_ascii(self.image, 'T', self.ascii_renderer.color_map['tree'], (0, 0))
-		
-		# 渲染果实
-		if self.has_fruit and self.fruit_count > 0:
-			# 在树干上方渲染果实
-			self.ascii_renderer.render_ascii(self.image, 'o', self.ascii_renderer.color_map['apple'], (0, -8))
+		self.set_shared_image('tree', self.has_fruit and self.fruit_count > 0, 'tree')
+		notify_sprite_changed(self)
 	
 	def create_fruit(self):
 		"""
@@ -196,11 +211,13 @@ class ASCIIParticle(ASCIIGeneric):
 	"""
 	ASCII版本的粒子效果精灵
 	"""
+	bakeable = False  # 透明度逐帧变化
 	
 	def __init__(self, pos, original_type, groups, z=0):
 		super().__init__(pos, original_type, groups, z)
 		self.lifetime = 1.0  # 1秒生命周期
 		self.timer = 0
+		self.own_image()  # 透明度会变化，不能改动共享图像
 	
 	def update(self, dt):
 		"""
@@ -219,10 +236,11 @@ class ASCIIPlayer(pygame.sprite.Sprite):
 	ASCII版本的玩家精灵
 	使用@字符显示玩家，支持不同状态和方向的显示
 	"""
+	dynamic = True
 	
 	def __init__(self, pos, groups):
 		super().__init__(groups)
-		self.ascii_renderer = ASCIIRenderer()
+		self.ascii_renderer = get_ascii_renderer()
 		
 		# 创建ASCII表面
 		self.image = pygame.Surface((64, 64), pygame.SRCALPHA)  # 玩家尺寸较大
@@ -297,6 +315,8 @@ class ASCIIPlayer(pygame.sprite.Sprite):
 
 class ASCIINPC(ASCIIGeneric):
 	"""ASCII NPC精灵类"""
+	dynamic = True  # NPC（包括猫咪）参与每帧的动态排序
+
 	def __init__(self, pos, npc_id, npc_manager, groups, z = LAYERS['main']):
 		# 从NPC管理器获取NPC数据
 		npc = npc_manager.get_npc(npc_id)
@@ -326,22 +346,17 @@ class ASCIIHouse(pygame.sprite.Sprite):
 	"""
 	ASCII版本的房屋精灵类
 	"""
+	bakeable = True
 	
 	def __init__(self, pos, house_type, groups, z=LAYERS['main']):
 		super().__init__(groups)
 		
-		# 基本设置
-		self.image = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
+		# 基本设置 - 同类房屋部件共享一张图像
+		self.image = get_tile_images().get(house_type, 0, 'house')
 		self.rect = self.image.get_rect(topleft=pos)
 		self.z = z
 		self.house_type = house_type
 		
-		# ASCII渲染器
-		self.ascii_renderer = ASCIIRenderer()
-		
-		# 渲染房屋部件
-		self.ascii_renderer.render_house(self.image, (0, 0), house_type)
-		
 		# 根据房屋类型设置碰撞盒
 		self.setup_hitbox()
 	
@@ -0,0 +1,116 @@
+import pygame
+from src.settings import TILE_SIZE
+
+class ChunkBaker:
+	"""
+	静态图层区块烘焙器
+	把不会变化的瓦片（草地、小径、沙滩、地板等）按区块预先绘制到一张表面上，
+	相机每帧只需要blit少量区块，而不是逐个blit上千个瓦片精灵。
+	区块内有精灵加入、移除或图像变化时，只把该区块标记为脏，在下次绘制前重新烘焙
+	区块在本层未烘焙的精灵之前绘制，不再与它们按centery交错，
+	所以只应烘焙活动精灵不会与静态瓦片重叠的图层
+	"""
+	def __init__(self, layers, chunk_tiles=16):
+		self.layers = set(layers)  # 参与烘焙的z层
+		self.chunk_size = chunk_tiles * TILE_SIZE
+		self.chunks = {}  # (z, col, row) -> {sprite: 序号}
+		self.surfaces = {}  # (z, col, row) -> (surface, 世界坐标rect)
+		self.sprite_chunks = {}  # sprite -> (z, col, row)
+		self.dirty = set()  # 需要重新烘焙的区块
+		self.bake_count = 0  # 累计烘焙次数（调试用）
+
+	def accepts(self, sprite):
+		"""
+		精灵是否可以被烘焙：位于烘焙层，且声明了bakeable
+		"""
+		return sprite.z in self.layers and getattr(sprite, 'bakeable', False)
+
+	def chunk_key(self, sprite):
+		"""
+		按精灵中心点确定所属区块
+		"""
+		x, y = sprite.rect.center
+		return (sprite.z, x // self.chunk_size, y // self.chunk_size)
+
+	def add(self, sprite, sequence):
+		"""
+		加入精灵，sequence决定同一centery下的绘制顺序
+		"""
+		key = self.chunk_key(sprite)
+		self.chunks.setdefault(key, {})[sprite] = sequence
+		self.sprite_chunks[sprite] = key
+		self.dirty.add(key)
+
+	def remove(self, sprite):
+		"""
+		移除精灵（例如树被砍倒）
+		"""
+		key = self.sprite_chunks.pop(sprite, None)
+		if key is None:
+			return None
+		sequence = self.chunks[key].pop(sprite)
+		if not self.chunks[key]:
+			del self.chunks[key]
+		self.dirty.add(key)
+		return sequence
+
+	def invalidate(self, sprite):
+		"""
+		精灵的图像或位置变化后调用，重新烘焙它所在的区块
+		"""
+		sequence = self.remove(sprite)
+		if sequence is not None:
+			self.add(sprite, sequence)
+
+	def bake_dirty(self):
+		"""
+		重新烘焙所有脏区块，返回画面发生变化的世界坐标区域（烘焙前后的区块范围）
+		"""
+		changed = []
+		if self.dirty:
+			dirty, self.dirty = self.dirty, set()
+			for key in dirty:
+				old = self.surfaces.get(key)
+				if old:
+					changed.append(old[1])
+				self.bake(key)
+				new = self.surfaces.get(key)
+				if new:
+					changed.append(new[1])
+		return changed
+
+	def bake(self, key):
+		"""
+		烘焙单个区块，表面大小取区块内所有精灵rect的并集
+		"""
+		members = self.chunks.get(key)
+		if not members:
+			self.surfaces.pop(key, None)
+			return
+
+		sprites = sorted(members, key=lambda sprite: (sprite.rect.centery, members[sprite]))
+		bounds = sprites[0].rect.unionall([sprite.rect for sprite in sprites[1:]])
+		surface = pygame.Surface(bounds.size, pygame.SRCALPHA)
+		for sprite in sprites:
+			surface.blit(sprite.image, (sprite.rect.x - bounds.x, sprite.rect.y - bounds.y))
+
+		self.surfaces[key] = (surface, bounds)
+		self.bake_count += 1
+
+	def visible_chunks(self, z, view_rect):
+		"""
+		返回z层中与view_rect（世界坐标）重叠的已烘焙区块
+		区块表面可能略超出区块边界，所以向外多查一圈区块
+		"""
+		size = self.chunk_size
+		col0 = view_rect.left // size - 1
+		row0 = view_rect.top // size - 1
+		col1 = (view_rect.right - 1) // size + 1
+		row1 = (view_rect.bottom - 1) // size + 1
+		result = []
+		for row in range(row0, row1 + 1):
+			for col in range(col0, col1 + 1):
+				baked = self.surfaces.get((z, col, row))
+				if baked and baked[1].colliderect(view_rect):
+					result.append(baked)
+		return result
@@ -0,0 +1,79 @@
+import pygame
+from src.settings import SCREEN_WIDTH, SCREEN_HEIGHT, DIRTY_RECTS
+
+class DirtyRectTracker:
+	"""
+	脏矩形收集器
+	相机组、界面面板和天空在绘制时报告本帧变化的屏幕区域，
+	主循环用pygame.display.update(rects)只提交这些区域；
+	任何一方调用invalidate（相机移动、天空变色）或有大块面板显示时本帧退回整屏flip，
+	面板关闭后的第一帧也整屏提交，把面板留下的像素全部换掉
+	"""
+	def __init__(self, enabled=DIRTY_RECTS, max_rects=64):
+		self.enabled = enabled
+		self.max_rects = max_rects  # 矩形过多时合并成一个
+		self.screen_rect = pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
+		self.rects = []
+		self.ui_rects = []  # 本帧界面绘制的区域
+		self._last_ui_rects = []  # 上一帧界面绘制的区域，界面收起或移动后需要擦除
+		self.full = True  # 第一帧总是整屏提交
+		self.panel_open = False  # 上一帧是否有大块面板显示
+
+	def add(self, rect):
+		"""
+		报告一块变化的屏幕区域
+		"""
+		if self.enabled and not self.full:
+			self.rects.append(pygame.Rect(rect))
+
+	def add_ui(self, rect):
+		"""
+		报告界面本帧绘制的区域，会连同上一帧的界面区域一起提交
+		"""
+		if self.enabled:
+			self.ui_rects.append(pygame.Rect(rect))
+
+	def invalidate(self):
+		"""
+		本帧整屏提交
+		"""
+		self.full = True
+
+	def set_panel_open(self, is_open):
+		"""
+		报告本帧是否有大块面板显示；面板显示期间和关闭后的第一帧整屏提交
+		"""
+		if is_open or self.panel_open:
+			self.invalidate()
+		self.panel_open = is_open
+
+	def present(self):
+		"""
+		把本帧画面提交到屏幕并开始新的一帧
+		"""
+		if not self.enabled or self.full:
+			pygame.display.flip()
+		else:
+			rects = [rect.clip(self.screen_rect) for rect in self.rects + self.ui_rects + self._last_ui_rects]
+			rects = [rect for rect in rects if rect.width and rect.height]
+			if len(rects) > self.max_rects:
+				rects = [rects[0].unionall(rects[1:])]
+			if rects:
+				pygame.display.update(rects)
+
+		self._last_ui_rects = self.ui_rects
+		self.ui_rects = []
+		self.rects = []
+		self.full = False
+
+# 全局脏矩形收集器实例
+_dirty_rects = None
+
+def get_dirty_rects():
+	"""
+	获取脏矩形收集器单例
+	"""
+	global _dirty_rects
+	if _dirty_rects is None:
+		_dirty_rects = DirtyRectTracker()
+	return _dirty_rects
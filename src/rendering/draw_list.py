@@ -0,0 +1,212 @@
+from bisect import bisect_left, insort
+from heapq import merge
+from itertools import count
+from src.settings import TILE_SIZE
+from src.utils.spatial_grid import SpatialGrid
+
+class LayeredDrawList:
+	"""
+	分层绘制列表 - 按z层把精灵分桶保存，替代每帧的全量排序
+	静态精灵在加入时按rect.centery插入有序位置，之后不再排序；
+	动态精灵（玩家、猫咪、NPC）单独成桶，每帧只对这一小桶重新排序
+	每层另有一个以TILE_SIZE为格子的空间网格，用于视口裁剪
+	可烘焙的静态精灵交给ChunkBaker，不再逐个绘制
+	"""
+	def __init__(self, baker=None):
+		self.baker = baker  # ChunkBaker，可选
+		self._order = count()  # 插入序号，centery相同时保持加入顺序
+		self._static_keys = {}  # z -> [(centery, 序号), ...] 有序
+		self._static_sprites = {}  # z -> [sprite, ...] 与keys一一对应
+		self._dynamic = {}  # z -> [sprite, ...]
+		self._entries = {}  # sprite -> (z, key, 序号)，动态精灵的key为None，烘焙精灵的key为BAKED
+		self._pending = {}  # sprite -> 序号，等待归桶的新精灵
+		self._layers = []  # 已出现的层，按z升序
+		self._grids = {}  # z -> SpatialGrid，按精灵中心点索引
+		self._max_half_extent = 0  # 精灵最大半宽/半高，决定裁剪时的外扩边距
+
+	def __len__(self):
+		return len(self._entries) + len(self._pending)
+
+	def __contains__(self, sprite):
+		return sprite in self._entries or sprite in self._pending
+
+	@staticmethod
+	def is_dynamic(sprite):
+		"""
+		精灵是否会移动 - 通过类属性dynamic声明
+		"""
+		return getattr(sprite, 'dynamic', False)
+
+	def add(self, sprite):
+		"""
+		加入精灵
+		精灵通常在设置z和rect之前就加入了组，所以先挂起，到flush时再归桶
+		"""
+		if sprite not in self:
+			self._pending[sprite] = next(self._order)
+
+	def remove(self, sprite):
+		"""
+		移除精灵
+		"""
+		if self._pending.pop(sprite, None) is None and sprite in self._entries:
+			self._detach(sprite)
+
+	def flush(self):
+		"""
+		把挂起的新精灵归入对应的桶
+		"""
+		if self._pending:
+			pending, self._pending = self._pending, {}
+			for sprite, sequence in pending.items():
+				self._insert(sprite, sequence)
+
+	def refresh(self, sprite):
+		"""
+		精灵的z层或静态位置发生变化后调用，重新归桶
+		"""
+		entry = self._entries.get(sprite)
+		if entry is None:
+			return
+		z, key, sequence = entry
+		if key is BAKED:
+			if z == sprite.z and self.baker.accepts(sprite):
+				self.baker.invalidate(sprite)  # 图像或位置变化，重新烘焙所在区块
+				return
+		else:
+			grid = self._grids[z]
+			if (z == sprite.z
+					and (key is None or key[0] == sprite.rect.centery)
+					and grid.item_cells[sprite] == grid.cell_of(sprite.rect.center)):
+				return
+		self._detach(sprite)
+		self._insert(sprite, sequence)
+
+	def layers(self):
+		"""
+		返回已出现的层的z值（升序）
+		"""
+		return self._layers
+
+	def static_sprites(self, z):
+		"""
+		返回某层的静态精灵（已按centery排序）
+		"""
+		return self._static_sprites.get(z, [])
+
+	def dynamic_sprites(self, z):
+		"""
+		返回某层的动态精灵
+		"""
+		return self._dynamic.get(z, [])
+
+	def sort_key(self, sprite):
+		"""
+		绘制顺序：先按centery，再按加入顺序
+		"""
+		return (sprite.rect.centery, self._entries[sprite][2])
+
+	def iter_layer(self, z):
+		"""
+		按centery顺序遍历某层的全部精灵（不含已烘焙的精灵）
+		动态桶上一帧已有序，timsort在近乎有序的输入上接近线性
+		"""
+		static = self._static_sprites.get(z, [])
+		dynamic = self._dynamic.get(z)
+		if not dynamic:
+			return iter(static)
+		dynamic.sort(key=self.sort_key)
+		if not static:
+			return iter(dynamic)
+		return merge(static, dynamic, key=self.sort_key)
+
+	def __iter__(self):
+		self.flush()
+		for z in self._layers:
+			yield from self.iter_layer(z)
+
+	def update_dynamic(self):
+		"""
+		把动态精灵在空间网格中的位置同步到当前rect
+		"""
+		for z, sprites in self._dynamic.items():
+			grid = self._grids[z]
+			for sprite in sprites:
+				grid.move(sprite, sprite.rect.center)
+
+	def iter_visible(self, view_rect):
+		"""
+		按绘制顺序遍历与view_rect（世界坐标）重叠的精灵
+		网格按精灵中心索引，查询范围向外扩最大半尺寸，保证高大的精灵不会被误裁
+		候选集按行从上到下取出，已基本有序，排序开销与可见精灵数成正比
+		"""
+		for _, sprites in self.visible_layers(view_rect):
+			yield from sprites
+
+	def visible_layers(self, view_rect):
+		"""
+		按z层升序返回 (z, 该层可见精灵列表)，供需要在层之间插入绘制的调用方使用
+		"""
+		self.flush()
+		self.update_dynamic()
+		margin = self._max_half_extent
+		area = view_rect.inflate(margin * 2, margin * 2)
+		for z in self._layers:
+			sprites = self._grids[z].query_rect(area)
+			if len(sprites) > 1:
+				sprites.sort(key=self.sort_key)
+			yield z, sprites
+
+	def _insert(self, sprite, sequence):
+		z = sprite.z
+		if z not in self._static_keys:
+			self._static_keys[z] = []
+			self._static_sprites[z] = []
+			self._dynamic[z] = []
+			self._grids[z] = SpatialGrid(TILE_SIZE)
+			insort(self._layers, z)
+
+		if self.baker and not self.is_dynamic(sprite) and self.baker.accepts(sprite):
+			self.baker.add(sprite, sequence)
+			self._entries[sprite] = (z, BAKED, sequence)
+			return
+
+		rect = sprite.rect
+		self._grids[z].insert(sprite, rect.center)
+		half_extent = (max(rect.width, rect.height) + 1) // 2
+		if half_extent > self._max_half_extent:
+			self._max_half_extent = half_extent
+
+		if self.is_dynamic(sprite):
+			self._dynamic[z].append(sprite)
+			self._entries[sprite] = (z, None, sequence)
+		else:
+			key = (sprite.rect.centery, sequence)
+			index = bisect_left(self._static_keys[z], key)
+			self._static_keys[z].insert(index, key)
+			self._static_sprites[z].insert(index, sprite)
+			self._entries[sprite] = (z, key, sequence)
+
+	def _detach(self, sprite):
+		z, key, _ = self._entries.pop(sprite)
+		if key is BAKED:
+			self.baker.remove(sprite)
+			return
+		self._grids[z].remove(sprite)
+		if key is None:
+			self._dynamic[z].remove(sprite)
+		else:
+			index = bisect_left(self._static_keys[z], key)
+			del self._static_keys[z][index]
+			del self._static_sprites[z][index]
+
+BAKED = object()  # 绘制列表中表示"已交给烘焙器"的标记
+
+def notify_sprite_changed(sprite):
+	"""
+	通知精灵所在的相机组：精灵的z层、静态位置或（烘焙精灵的）图像已变化
+	"""
+	for group in sprite.groups():
+		refresh = getattr(group, 'refresh_sprite', None)
+		if refresh:
+			refresh(sprite)
@@ -0,0 +1,153 @@
+from collections import OrderedDict
+import pygame
+from src.settings import GLYPH_CACHE_SIZE, GLYPH_ATLAS_SIZE
+from src.utils.font_manager import get_font_manager
+
+class GlyphAtlas:
+	"""
+	字形图集 - 把小字形按行（shelf）打包进一张大表面
+	缓存中保存的是图集的子表面，相同字形的绘制都来自同一块像素
+	图集装满后由GlyphCache把仍在缓存中的字形重新打包到一张新表面上，回收被淘汰字形占用的空间
+	"""
+	def __init__(self, size, padding=1):
+		self.size = size
+		self.surface = pygame.Surface(size, pygame.SRCALPHA)
+		self.padding = padding
+		self._shelf_x = 0
+		self._shelf_y = 0
+		self._shelf_height = 0
+
+	def pack(self, glyph):
+		"""
+		把字形复制进图集，返回对应的子表面；放不下时返回None
+		"""
+		width, height = glyph.get_size()
+		atlas_width, atlas_height = self.surface.get_size()
+		if width == 0 or height == 0 or width > atlas_width:
+			return None
+
+		if self._shelf_x + width > atlas_width:
+			# 换到下一行
+			self._shelf_y += self._shelf_height + self.padding
+			self._shelf_x = 0
+			self._shelf_height = 0
+		if self._shelf_y + height > atlas_height:
+			return None
+
+		area = pygame.Rect(self._shelf_x, self._shelf_y, width, height)
+		# BLEND_RGBA_MAX写入全透明区域等价于逐像素复制，保留原始alpha
+		self.surface.blit(glyph, area, special_flags=pygame.BLEND_RGBA_MAX)
+		self._shelf_x += width + self.padding
+		self._shelf_height = max(self._shelf_height, height)
+		return self.surface.subsurface(area)
+
+	def reset(self):
+		"""
+		换一张空白表面重新打包
+		旧表面不清空：之前返回的子表面仍引用它，像素保持不变，没有引用后自动释放
+		"""
+		self.surface = pygame.Surface(self.size, pygame.SRCALPHA)
+		self._shelf_x = self._shelf_y = self._shelf_height = 0
+
+	def owns(self, glyph):
+		"""
+		字形是否为当前图集表面的子表面
+		"""
+		return glyph.get_parent() is self.surface
+
+class GlyphCache:
+	"""
+	全局字形缓存
+	以 (字体标识, 字符, 颜色) 为键缓存font.render的结果，LRU淘汰，
+	已经渲染过的字形再次绘制只需要一次字典查找
+	返回的表面是共享的，调用方只能blit，不能修改
+	"""
+	def __init__(self, max_entries=GLYPH_CACHE_SIZE, atlas_size=GLYPH_ATLAS_SIZE):
+		self.max_entries = max_entries
+		self.atlas = GlyphAtlas(atlas_size) if atlas_size else None
+		self._glyphs = OrderedDict()
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+		self.atlas_waste = 0  # 已被淘汰、但仍占着图集空间的字形数
+		self.repacks = 0
+
+	def __len__(self):
+		return len(self._glyphs)
+
+	def render(self, font, char, color):
+		"""
+		获取字形表面，未命中时调用font.render并缓存
+		"""
+		key = (get_font_manager().font_identity(font), char, tuple(color))
+		glyph = self._glyphs.get(key)
+		if glyph is not None:
+			self._glyphs.move_to_end(key)
+			self.hits += 1
+			return glyph
+
+		self.misses += 1
+		glyph = font.render(char, True, color)
+		if self.atlas:
+			packed = self.atlas.pack(glyph)
+			if packed is None and self._repack():
+				packed = self.atlas.pack(glyph)
+			glyph = packed or glyph
+		self._glyphs[key] = glyph
+		if len(self._glyphs) > self.max_entries:
+			_, evicted = self._glyphs.popitem(last=False)
+			self.evictions += 1
+			if self.atlas and self.atlas.owns(evicted):
+				self.atlas_waste += 1
+		return glyph
+
+	def _repack(self):
+		"""
+		图集装满时，把仍在缓存中的字形按LRU顺序复制到新的图集表面，回收被淘汰字形的空间
+		没有可回收的空间时返回False，新字形直接使用独立表面
+		"""
+		if not self.atlas_waste:
+			return False
+		old_surface = self.atlas.surface
+		self.atlas.reset()
+		for key, glyph in list(self._glyphs.items()):
+			if glyph.get_parent() is old_surface:
+				self._glyphs[key] = self.atlas.pack(glyph) or glyph.copy()
+		self.atlas_waste = 0
+		self.repacks += 1
+		return True
+
+	def clear(self):
+		"""
+		清空缓存（字体重新加载后使用）
+		"""
+		self._glyphs.clear()
+		self.atlas_waste = 0
+		if self.atlas:
+			self.atlas.reset()
+
+	def get_stats(self):
+		"""
+		获取缓存统计信息（调试用）
+		"""
+		total = self.hits + self.misses
+		return {
+			'entries': len(self._glyphs),
+			'hits': self.hits,
+			'misses': self.misses,
+			'evictions': self.evictions,
+			'repacks': self.repacks,
+			'hit_rate': self.hits / total if total else 0.0,
+		}
+
+# 全局字形缓存实例
+_glyph_cache = None
+
+def get_glyph_cache():
+	"""
+	获取字形缓存单例
+	"""
+	global _glyph_cache
+	if _glyph_cache is None:
+		_glyph_cache = GlyphCache()
+	return _glyph_cache
@@ -0,0 +1,79 @@
+from collections import OrderedDict
+import pygame
+from src.utils.font_manager import get_font_manager
+
+class HUDCache:
+	"""
+	HUD绘制缓存
+	半透明背景框按 (尺寸, rgba) 缓存，提示文本按 (字体标识, 文本, 颜色) 缓存，
+	稳定状态下提示框、状态栏、全屏遮罩每帧只做blit，不再创建表面
+	返回的表面是共享的，调用方只能blit，不能修改
+	"""
+	def __init__(self, max_boxes=64, max_texts=256):
+		self.max_boxes = max_boxes
+		self.max_texts = max_texts
+		self._boxes = OrderedDict()
+		self._texts = OrderedDict()
+
+	def box(self, size, rgba):
+		"""
+		获取指定尺寸和颜色的半透明背景，rgba缺省alpha时为不透明
+		"""
+		size = (int(size[0]), int(size[1]))
+		rgba = tuple(rgba)
+		key = (size, rgba)
+		surface = self._boxes.get(key)
+		if surface is not None:
+			self._boxes.move_to_end(key)
+			return surface
+
+		surface = pygame.Surface(size)
+		surface.set_alpha(rgba[3] if len(rgba) == 4 else 255)
+		surface.fill(rgba[:3])
+		self._boxes[key] = surface
+		if len(self._boxes) > self.max_boxes:
+			self._boxes.popitem(last=False)
+		return surface
+
+	def text(self, font, text, color):
+		"""
+		获取渲染好的文本表面
+		"""
+		key = (get_font_manager().font_identity(font), text, tuple(color))
+		surface = self._texts.get(key)
+		if surface is not None:
+			self._texts.move_to_end(key)
+			return surface
+
+		surface = font.render(text, True, color)
+		self._texts[key] = surface
+		if len(self._texts) > self.max_texts:
+			self._texts.popitem(last=False)
+		return surface
+
+	def draw_box(self, surface, rect, rgba):
+		"""
+		在rect处绘制半透明背景
+		"""
+		rect = pygame.Rect(rect)
+		surface.blit(self.box(rect.size, rgba), rect)
+		return rect
+
+	def clear(self):
+		"""
+		清空缓存（字体重新加载后使用）
+		"""
+		self._boxes.clear()
+		self._texts.clear()
+
+# 全局HUD缓存实例
+_hud_cache = None
+
+def get_hud_cache():
+	"""
+	获取HUD缓存单例
+	"""
+	global _hud_cache
+	if _hud_cache is None:
+		_hud_cache = HUDCache()
+	return _hud_cache
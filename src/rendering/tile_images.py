@@ -0,0 +1,74 @@
+import pygame
+from src.settings import TILE_SIZE
+from .ascii_renderer import get_ascii_renderer
+
+class TileImageRegistry:
+	"""
+	瓦片图像享元注册表
+	按 (tile_type, variant, style) 缓存渲染好的TILE_SIZE图像，所有外观相同的精灵共享同一张表面，
+	内存占用与不同外观的数量成正比，而不是与瓦片数量成正比。
+	返回的表面是只读的：需要修改自己图像的精灵必须先复制（见ASCIIGeneric.own_image）
+	style区分不同的渲染方式：
+		'tile'   - render_tile，variant为变体编号
+		'house'  - render_house，tile_type为房屋部件
+		'tree'   - 树干，variant为是否带果实
+		'water'  - 水动画，variant为动画帧
+		'flower' - 花朵动画，variant为 (花朵变体, 动画帧)
+	"""
+	def __init__(self):
+		self._images = {}
+
+	def __len__(self):
+		return len(self._images)
+
+	def get(self, tile_type, variant=0, style='tile'):
+		"""
+		获取共享的瓦片图像，首次请求时渲染
+		"""
+		key = (tile_type, variant, style)
+		image = self._images.get(key)
+		if image is None:
+			image = self._render(tile_type, variant, style)
+			self._images[key] = image
+		return image
+
+	def clear(self):
+		"""
+		清空缓存（字体或配色变化后使用）
+		"""
+		self._images.clear()
+
+	def _render(self, tile_type, variant, style):
+		renderer = get_ascii_renderer()
+		surface = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
+
+		if style == 'tile':
+			renderer.render_tile(surface, tile_type, (0, 0), variant)
+		elif style == 'house':
+			renderer.render_house(surface, (0, 0), tile_type)
+		elif style == 'tree':
+			renderer.render_ascii(surface, 'T', renderer.color_map['tree'], (0, 0))
+			if variant:
+				# 在树干上方渲染果实
+				renderer.render_ascii(surface, 'o', renderer.color_map['apple'], (0, -8))
+		elif style == 'water':
+			renderer.render_water_animation(surface, (0, 0), variant)
+		elif style == 'flower':
+			flower_variant, frame = variant
+			renderer.render_flower_animation(surface, (0, 0), frame, flower_variant)
+		else:
+			raise ValueError(f"未知的瓦片图像样式: {style}")
+
+		return surface
+
+# 全局注册表实例
+_tile_images = None
+
+def get_tile_images():
+	"""
+	获取瓦片图像注册表单例
+	"""
+	global _tile_images
+	if _tile_images is None:
+		_tile_images = TileImageRegistry()
+	return _tile_images
@@ -78,4 +78,14 @@ CAT_BED_TYPES = {
 		'ascii_char': '🏰',
 		'description': '豪华的猫窝，提供最佳的睡眠体验'
 	}
-}
\ No newline at end of file
+}
+# 字形缓存
+GLYPH_CACHE_SIZE = 2048  # 最多缓存的字形数量（LRU淘汰）
+GLYPH_ATLAS_SIZE = (1024, 1024)  # 字形图集尺寸，None表示不使用图集
+
+# 雨粒子池容量
+RAIN_DROP_COUNT = 300  # 同时存在的雨滴数
+RAIN_FLOOR_COUNT = 150  # 同时存在的地面水花数
+
+# 脏矩形呈现模式：只把变化的区域提交到屏幕（相机移动时自动退回整屏flip）
+DIRTY_RECTS = False
@@ -1,6 +1,7 @@
 import pygame
 from ..settings import *
-from ..rendering.ascii_renderer import ASCIIRenderer
+from ..rendering.ascii_renderer import get_ascii_renderer
+from ..rendering.draw_list import notify_sprite_changed
 from random import choice
 from ..core.map_loader import load_pygame
 from ..core.support import get_resource_path
@@ -12,7 +13,7 @@ class ASCIISoilTile(pygame.sprite.Sprite):
 	def __init__(self, pos, groups, tile_type='o'):
 		super().__init__(groups)
 		self.tile_type = tile_type
-		self.ascii_renderer = ASCIIRenderer()
+		self.ascii_renderer = get_ascii_renderer()
 		
 		# 创建ASCII表面
 		self.image = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
@@ -60,7 +61,7 @@ class ASCIIWaterTile(pygame.sprite.Sprite):
 	"""
 	def __init__(self, pos, groups):
 		super().__init__(groups)
-		self.ascii_renderer = ASCIIRenderer()
+		self.ascii_renderer = get_ascii_renderer()
 		
 		# 创建ASCII表面
 		self.image = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
@@ -110,7 +111,7 @@ class ASCIIPlant(pygame.sprite.Sprite):
 		self.plant_type = plant_type
 		self.soil = soil
 		self.check_watered = check_watered
-		self.ascii_renderer = ASCIIRenderer()
+		self.ascii_renderer = get_ascii_renderer()
 
 		# 植物生长
 		self.age = 0
@@ -167,6 +168,7 @@ class ASCIIPlant(pygame.sprite.Sprite):
 
 			self.render_plant()
 			self.rect = self.image.get_rect(midbottom=self.soil.rect.midbottom + pygame.math.Vector2(0, self.y_offset))
+			notify_sprite_changed(self)  # z层可能已从ground plant变为main
 
 class ASCIISoilLayer:
 	"""
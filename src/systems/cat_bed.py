@@ -8,6 +8,7 @@ import pygame
 from src.settings import *
 from src.rendering.ascii_sprites import ASCIIInteraction
 from src.utils.font_manager import FontManager
+from src.utils.spatial_grid import ProximityIndex
 
 class CatBed(ASCIIInteraction):
     """猫窝类 - 继承自ASCIIInteraction"""
@@ -169,17 +170,20 @@ class CatBedManager:
     def __init__(self):
         self.cat_beds = []  # 所有猫窝列表
         self.cat_bed_by_owner = {}  # 按主人ID索引的猫窝
+        self.bed_index = ProximityIndex(position=lambda cat_bed: cat_bed.bed_pos)  # 按位置索引的猫窝
         
     def add_cat_bed(self, cat_bed):
         """添加猫窝"""
         self.cat_beds.append(cat_bed)
         self.cat_bed_by_owner[cat_bed.owner_cat_id] = cat_bed
+        self.bed_index.update(cat_bed)
         print(f"[CatBedManager] 添加猫窝: {cat_bed.bed_name} 给 {cat_bed.owner_cat_name}")
     
     def remove_cat_bed(self, cat_bed):
         """移除猫窝"""
         if cat_bed in self.cat_beds:
             self.cat_beds.remove(cat_bed)
+            self.bed_index.remove(cat_bed)
             if cat_bed.owner_cat_id in self.cat_bed_by_owner:
                 del self.cat_bed_by_owner[cat_bed.owner_cat_id]
             cat_bed.kill()  # 从精灵组中移除
@@ -191,16 +195,11 @@ class CatBedManager:
     
     def find_nearest_cat_bed(self, position, max_distance=200):
         """找到最近的猫窝"""
-        nearest_bed = None
-        min_distance = float('inf')
+        nearest_bed, distance = self.bed_index.nearest(position, max_distance)
         
-        for cat_bed in self.cat_beds:
-            distance = pygame.math.Vector2(position).distance_to(cat_bed.bed_pos)
-            if distance < max_distance and distance < min_distance:
-                min_distance = distance
-                nearest_bed = cat_bed
-        
-        return nearest_bed, min_distance if nearest_bed else None
+        if nearest_bed is None or distance >= max_distance:
+            return None, None
+        return nearest_bed, distance
     
     def get_all_cat_beds(self):
         """获取所有猫窝"""
@@ -8,6 +8,7 @@ import pygame
 from src.settings import *
 from src.systems.bait_system import get_bait_system
 from src.utils.font_manager import get_font_manager
+from src.rendering.hud import get_hud_cache
 
 class BaitBoxUI:
     """鱼饵箱用户界面"""
@@ -148,10 +149,7 @@ class BaitBoxUI:
             return
         
         # 创建半透明背景
-        overlay = pygame.Surface((self.screen_width, self.screen_height))
-        overlay.set_alpha(128)
-        overlay.fill((0, 0, 0))
-        screen.blit(overlay, (0, 0))
+        screen.blit(get_hud_cache().box((self.screen_width, self.screen_height), (0, 0, 0, 128)), (0, 0))
         
         # 绘制主面板
         pygame.draw.rect(screen, self.panel_color, 
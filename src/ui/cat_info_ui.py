@@ -1,81 +1,39 @@
 import pygame
 import math
-import unicodedata
 from typing import Optional, Dict, List
 from datetime import datetime
 from src.utils.font_manager import FontManager
+from src.utils.text_layout import get_text_layout
 
 class TextRenderer:
     """统一的文本渲染引擎，处理文本换行、容器大小和渲染"""
     
     def __init__(self):
         self.debug_mode = False
+        self.layout = get_text_layout()  # 按字体缓存字符宽度的排版器
     
     def calculate_char_width(self, char: str, font: pygame.font.Font) -> int:
-        """计算单个字符的宽度，针对中文字符和emoji优化"""
-        try:
-            # 检查是否是emoji字符
-            if ord(char[0]) >= 0x1F000:  # 基本emoji范围
-                return font.size(char)[0] if font.size(char)[0] > 0 else 20  # emoji默认宽度
-            elif unicodedata.east_asian_width(char) in ('F', 'W'):
-                # 全角字符（中文、日文等）
-                return font.size(char)[0]
-            else:
-                # 半角字符
-                return font.size(char)[0]
-        except:
-            # 回退：使用字体计算
-            return font.size(char)[0] if font.size(char)[0] > 0 else 10
+        """计算单个字符的宽度，针对中文字符和emoji优化（结果按字体缓存）"""
+        return self.layout.advance(font, char)
+    
+    def wrap_lines(self, text: str, max_width: int, font: pygame.font.Font) -> List[tuple]:
+        """单遍逐字符换行，返回 [(行文本, 行宽), ...]"""
+        return self.layout.wrap_chars(text, max_width, font)
     
     def wrap_text_advanced(self, text: str, max_width: int, font: pygame.font.Font) -> List[str]:
         """高级文本换行算法，支持中文和emoji"""
-        if not text:
-            return [""]
-        
-        lines = []
-        current_line = ""
-        current_width = 0
-        
-        i = 0
-        while i < len(text):
-            char = text[i]
-            char_width = self.calculate_char_width(char, font)
-            
-            # 检查是否需要换行
-            if current_width + char_width > max_width and current_line:
-                # 当前行已满，开始新行
-                lines.append(current_line.strip())
-                current_line = char
-                current_width = char_width
-            else:
-                # 添加字符到当前行
-                current_line += char
-                current_width += char_width
-            
-            i += 1
-        
-        # 添加最后一行
-        if current_line:
-            lines.append(current_line.strip())
-        
-        return lines if lines else [""]
+        return [line for line, _ in self.wrap_lines(text, max_width, font)]
     
     def calculate_text_size(self, text: str, font: pygame.font.Font, max_width: int) -> tuple:
         """计算文本在给定宽度限制下的实际尺寸 (width, height)"""
-        lines = self.wrap_text_advanced(text, max_width, font)
+        return self._measure_lines(self.wrap_lines(text, max_width, font), font, max_width)
+    
+    def _measure_lines(self, lines: List[tuple], font: pygame.font.Font, max_width: int) -> tuple:
+        """根据换行结果计算尺寸，直接使用换行时累加出的行宽，不再逐行测量"""
         if not lines:
             return (0, 0)
-        
-        # 计算最大行宽
-        max_line_width = 0
-        for line in lines:
-            line_width = font.size(line)[0]
-            max_line_width = max(max_line_width, line_width)
-        
-        # 计算总高度
-        line_height = font.get_height()
-        total_height = len(lines) * line_height
-        
+        max_line_width = max(width for _, width in lines)
+        total_height = len(lines) * font.get_height()
         return (min(max_line_width, max_width), total_height)
     
     def render_text_with_background(self, surface: pygame.Surface, text: str, 
@@ -83,12 +41,12 @@ class TextRenderer:
                                   bg_color: tuple, pos: tuple, max_width: int,
                                   padding: int = 5, line_spacing: int = 2) -> tuple:
         """渲染带背景的文本，返回实际占用的矩形区域 (x, y, width, height)"""
-        lines = self.wrap_text_advanced(text, max_width - 2 * padding, font)
-        if not lines:
+        wrapped = self.wrap_lines(text, max_width - 2 * padding, font)
+        if not wrapped:
             return (*pos, 0, 0)
         
-        # 计算背景尺寸
-        text_width, text_height = self.calculate_text_size(text, font, max_width - 2 * padding)
+        # 计算背景尺寸（复用同一次换行的结果）
+        text_width, text_height = self._measure_lines(wrapped, font, max_width - 2 * padding)
         bg_width = text_width + 2 * padding
         bg_height = text_height + 2 * padding
         
@@ -102,8 +60,8 @@ class TextRenderer:
         text_x = pos[0] + padding
         text_y = pos[1] + padding
         
-        for i, line in enumerate(lines):
-            if line.strip():  # 只渲染非空行
+        for i, (line, _) in enumerate(wrapped):
+            if line:  # 只渲染非空行
                 line_surface = font.render(line, True, text_color)
                 surface.blit(line_surface, (text_x, text_y + i * (line_height + line_spacing)))
         
@@ -194,6 +152,17 @@ class CatInfoUI:
         self.scroll_offset = 0
         self.scroll_speed = 3
         
+        # 保留模式渲染缓存
+        self.overlay_surface = None  # 全屏半透明遮罩（不变）
+        self.hint_surface = None  # 关闭提示（不变）
+        self.base_surface = None  # 面板底图：背景、左侧面板、标签页和对话区背景
+        self.dialogue_surface = None  # 右侧对话内容，完整高度渲染一次，滚动时只移动取景位置
+        self.dialogue_height = 0  # 对话内容总高度
+        self.content_rect = None  # 对话区在面板中的位置
+        self.base_key = None  # 底图和对话内容对应的状态
+        self.panel_surface = None  # 合成好的面板
+        self.panel_key = None  # 合成面板对应的 (状态, 滚动位置)
+        
     def show_cat_info(self, cat_sprite, chat_ai):
         """显示猫咪详细信息"""
         self.is_active = True
@@ -272,10 +241,66 @@ class CatInfoUI:
             return
         
         # 绘制半透明背景
-        overlay = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 120))
-        surface.blit(overlay, (0, 0))
+        if self.overlay_surface is None:
+            self.overlay_surface = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
+            self.overlay_surface.fill((0, 0, 0, 120))
+        surface.blit(self.overlay_surface, (0, 0))
+        
+        # 只有猫咪、标签页、照护状态、对话历史或滚动位置变化时才重新合成面板
+        state_key = self._get_state_key()
+        if self.panel_key != (state_key, self.scroll_offset):
+            self._compose_panel(state_key)
+        
+        # 将面板绘制到主屏幕
+        surface.blit(self.panel_surface, (self.panel_x, self.panel_y))
         
+        # 绘制关闭提示
+        if self.hint_surface is None:
+            hint_text = "按 ESC 或 T 键关闭"
+            self.hint_surface = self.small_font.render(hint_text, True, self.colors['subtitle'])
+        hint_x = self.panel_x + self.panel_width - self.hint_surface.get_width() - 10
+        hint_y = self.panel_y - 25
+        surface.blit(self.hint_surface, (hint_x, hint_y))
+    
+    def _get_state_key(self):
+        """面板内容依赖的状态：猫咪、标签页、猫咪照护状态和对话历史的版本"""
+        cat = self.current_cat
+        history_version = None
+        chat_ai = getattr(self, 'chat_ai', None)
+        if chat_ai and hasattr(chat_ai, 'get_history_version'):
+            history_version = chat_ai.get_history_version(cat.npc_id)
+        return (id(cat), id(chat_ai), self.current_tab, getattr(cat, 'info_version', 0), history_version)
+    
+    def _compose_panel(self, state_key):
+        """合成面板：底图 + 按滚动位置截取的对话内容 + 滚动条"""
+        if self.base_key != state_key:
+            self._render_base()
+            self.base_key = state_key
+        
+        panel_surface = self.base_surface.copy()
+        content_rect = self.content_rect
+        
+        # 计算和设置最大滚动偏移
+        if self.dialogue_height > content_rect.height:
+            self.max_scroll_offset = self.dialogue_height - content_rect.height
+            self.scroll_offset = min(self.scroll_offset, self.max_scroll_offset)
+        else:
+            self.max_scroll_offset = 0
+            self.scroll_offset = 0
+        
+        # 对话内容只移动取景位置
+        visible_area = pygame.Rect(0, self.scroll_offset, content_rect.width, content_rect.height)
+        panel_surface.blit(self.dialogue_surface, content_rect.topleft, visible_area)
+        
+        # 渲染滚动条
+        if self.dialogue_height > content_rect.height:
+            self._render_right_scrollbar(panel_surface, content_rect, self.dialogue_height)
+        
+        self.panel_surface = panel_surface
+        self.panel_key = (state_key, self.scroll_offset)
+    
+    def _render_base(self):
+        """渲染面板底图和完整的对话内容"""
         # 绘制主面板
         panel_surface = pygame.Surface((self.panel_width, self.panel_height), pygame.SRCALPHA)
         panel_surface.fill(self.colors['panel_bg'])
@@ -288,15 +313,7 @@ class CatInfoUI:
         # 渲染右侧面板
         self._render_right_panel(panel_surface)
         
-        # 将面板绘制到主屏幕
-        surface.blit(panel_surface, (self.panel_x, self.panel_y))
-        
-        # 绘制关闭提示
-        hint_text = "按 ESC 或 T 键关闭"
-        hint_surface = self.small_font.render(hint_text, True, self.colors['subtitle'])
-        hint_x = self.panel_x + self.panel_width - hint_surface.get_width() - 10
-        hint_y = self.panel_y - 25
-        surface.blit(hint_surface, (hint_x, hint_y))
+        self.base_surface = panel_surface
     
     def _render_left_panel(self, surface):
         """渲染左侧面板"""
@@ -414,23 +431,24 @@ class CatInfoUI:
                                   self.right_panel_width - 30, self.panel_height - content_y - 20)  # 为滚动条留出空间
         pygame.draw.rect(surface, self.colors['dialogue_bg'], content_rect)
         pygame.draw.rect(surface, self.colors['dialogue_border'], content_rect, 1)
+        self.content_rect = content_rect
         
-        # 渲染对话内容
-        total_content_height = 0
-        if self.current_tab == "recent":
-            total_content_height = self._render_dialogue_content(surface, content_rect, "recent")
-        else:
-            total_content_height = self._render_dialogue_content(surface, content_rect, "history")
-        
-        # 计算和设置最大滚动偏移
-        if total_content_height > content_rect.height:
-            self.max_scroll_offset = total_content_height - content_rect.height
-            self.scroll_offset = min(self.scroll_offset, self.max_scroll_offset)
-            # 渲染滚动条
-            self._render_right_scrollbar(surface, content_rect, total_content_height)
-        else:
-            self.max_scroll_offset = 0
-            self.scroll_offset = 0
+        # 渲染完整的对话内容（滚动时不再重新渲染）
+        self._render_dialogue_surface(content_rect, self.current_tab)
+    
+    def _render_dialogue_surface(self, content_rect, tab_type):
+        """把对话内容按完整高度渲染到独立的表面上"""
+        height = max(content_rect.height, 2048)
+        while True:
+            dialogue_surface = pygame.Surface((content_rect.width, height), pygame.SRCALPHA)
+            local_rect = dialogue_surface.get_rect()
+            total_content_height = self._render_dialogue_content(dialogue_surface, local_rect, tab_type, 0)
+            if total_content_height <= height:
+                break
+            height = total_content_height  # 内容比预估的高，按实际高度重新渲染
+        
+        self.dialogue_surface = dialogue_surface
+        self.dialogue_height = total_content_height
     
     def _render_recent_dialogues(self, surface, start_y):
         """渲染最近对话记录（左侧面板）"""
@@ -487,7 +505,7 @@ class CatInfoUI:
             # 更新Y位置
             current_y += bg_rect[3] + 30  # 背景高度 + 间距
     
-    def _render_dialogue_content(self, surface, content_rect, tab_type):
+    def _render_dialogue_content(self, surface, content_rect, tab_type, scroll_offset=0):
         """渲染对话内容区域，返回内容总高度"""
         # 获取对话历史 - 包括与玩家的对话和猫猫之间的对话
         all_dialogues = []
@@ -544,7 +562,7 @@ class CatInfoUI:
         surface.set_clip(content_rect)
         
         # 渲染对话记录
-        current_y = content_rect.y + 10 - self.scroll_offset
+        current_y = content_rect.y + 10 - scroll_offset
         margin_x = content_rect.x + 10
         total_height = 10  # 起始边距
         
@@ -3,6 +3,7 @@ import math
 from ..settings import *
 from ..utils.font_manager import FontManager
 from ..utils.emoji_colorizer import EmojiColorizer
+from ..rendering.hud import get_hud_cache
 
 class CatchResultPanel:
     """
@@ -118,10 +119,7 @@ class CatchResultPanel:
             return
         
         # 创建半透明背景遮罩
-        overlay = pygame.Surface((self.screen_width, self.screen_height))
-        overlay.set_alpha(150)
-        overlay.fill((0, 0, 0))
-        surface.blit(overlay, (0, 0))
+        surface.blit(get_hud_cache().box((self.screen_width, self.screen_height), (0, 0, 0, 150)), (0, 0))
         
         # 创建面板表面
         panel_surface = pygame.Surface((self.panel_width, self.panel_height), pygame.SRCALPHA)
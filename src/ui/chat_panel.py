@@ -1,9 +1,24 @@
 import pygame
 import asyncio
+from bisect import bisect_right
+from collections import OrderedDict
 from typing import List, Optional, Callable
 from src.utils.font_manager import FontManager
+from src.utils.text_layout import get_text_layout
 from datetime import datetime
 
+class MessageLayout:
+    """单条消息的布局：换行后的文本行，以及按需渲染的行表面"""
+    
+    def __init__(self, lines: List[str], color: tuple, timestamp: str):
+        self.lines = lines  # 消息文本行
+        self.color = color
+        self.timestamp = timestamp  # 时间戳行文本
+        self.surfaces = None  # 渲染好的行表面（含时间戳行），可能被回收
+    
+    def __len__(self):
+        return len(self.lines) + 1  # 文本行 + 时间戳行
+
 class ChatPanel:
     """聊天面板UI - 显示在屏幕左下角"""
     
@@ -69,10 +84,20 @@ class ChatPanel:
         
         # 消息历史
         self.messages = []
-        self.max_messages = 50
+        self.max_messages = 5000
+        self.trim_batch = 500  # 超出上限时一次多丢弃这么多条，均摊列表头部删除的开销
         self.scroll_offset = 0
         self.line_height = 20
         
+        # 布局缓存：每条消息只在加入或替换时换行一次
+        self.text_layout = get_text_layout()
+        self.message_layouts: List[MessageLayout] = []  # 与messages一一对应
+        self.line_starts = []  # 每条消息首行的绝对行号（升序）
+        self.line_base = 0  # 已从头部丢弃的行数，绝对行号减去它得到显示行号
+        self.total_lines = 0  # 总显示行数（累加维护）
+        self.rendered_layouts = OrderedDict()  # 持有行表面的消息布局，按最近使用排序
+        self.max_rendered_layouts = 64  # 最多保留多少条消息的行表面
+        
         # 输入状态
         self.input_text = ""
         self.cursor_position = 0
@@ -108,17 +133,13 @@ class ChatPanel:
     def add_message(self, message: str, sender: str = "玩家"):
         """添加聊天消息"""
         timestamp = datetime.now().strftime("%H:%M:%S")
-        self.messages.append({
+        self._append_message({
             'text': message,
             'sender': sender,
             'timestamp': timestamp,
             'type': 'message'
         })
         
-        # 限制消息数量
-        if len(self.messages) > self.max_messages:
-            self.messages.pop(0)
-        
         # 自动滚动到最新消息
         self.scroll_to_bottom()
         
@@ -145,17 +166,13 @@ class ChatPanel:
     def add_system_message(self, message: str):
         """添加系统消息"""
         timestamp = datetime.now().strftime("%H:%M:%S")
-        self.messages.append({
+        self._append_message({
             'text': message,
             'sender': "系统",
             'timestamp': timestamp,
             'type': 'system'
         })
         
-        # 限制消息数量
-        if len(self.messages) > self.max_messages:
-            self.messages.pop(0)
-        
         # 自动滚动到最新消息
         self.scroll_to_bottom()
         
@@ -169,22 +186,80 @@ class ChatPanel:
             self.scroll_offset = max(0, total_lines - visible_lines)
     
     def _calculate_total_display_lines(self) -> int:
-        """计算所有消息需要的总显示行数"""
-        total_lines = 0
-        max_width = self.panel_width - 2 * self.input_margin
+        """计算所有消息需要的总显示行数（布局时已累加好）"""
+        return self.total_lines
+    
+    def _layout_message(self, message) -> MessageLayout:
+        """对单条消息换行，生成布局"""
+        if message['type'] == 'system':
+            text_color = self.colors['system_message']
+        elif message['type'] == 'thinking':
+            text_color = (180, 180, 180)  # 灰色表示思考中
+        else:
+            text_color = self.colors['message_text']
         
-        for message in self.messages:
-            # 构建显示文本
-            display_text = f"[{message['sender']}] {message['text']}"
-            
-            # 计算文本换行后的行数
-            wrapped_lines = self._wrap_text(display_text, max_width)
-            total_lines += len(wrapped_lines)
-            
-            # 时间戳行
-            total_lines += 1
-            
-        return total_lines
+        display_text = f"[{message['sender']}] {message['text']}"
+        max_width = self.panel_width - 2 * self.input_margin
+        return MessageLayout(self._wrap_text(display_text, max_width), text_color, f"  {message['timestamp']}")
+    
+    def _append_message(self, message):
+        """加入消息并布局，超出上限时丢弃最早的消息"""
+        layout = self._layout_message(message)
+        self.messages.append(message)
+        self.message_layouts.append(layout)
+        self.line_starts.append(self.line_base + self.total_lines)
+        self.total_lines += len(layout)
+        
+        # 限制消息数量：超出时一次丢弃一批，而不是每条新消息都从列表头部删除
+        if len(self.messages) > self.max_messages:
+            count = min(len(self.messages), len(self.messages) - self.max_messages + self.trim_batch)
+            dropped_lines = 0
+            for dropped in self.message_layouts[:count]:
+                dropped_lines += len(dropped)
+                self.rendered_layouts.pop(id(dropped), None)
+            del self.messages[:count]
+            del self.message_layouts[:count]
+            del self.line_starts[:count]
+            self.line_base += dropped_lines
+            self.total_lines -= dropped_lines
+    
+    def _replace_message(self, index, message):
+        """替换消息并重新布局，后续消息的行号整体平移（被替换的通常是最近的思考消息，后面只有几条）"""
+        old_layout = self.message_layouts[index]
+        layout = self._layout_message(message)
+        self.messages[index] = message
+        self.message_layouts[index] = layout
+        self.rendered_layouts.pop(id(old_layout), None)
+        
+        delta = len(layout) - len(old_layout)
+        if delta:
+            for i in range(index + 1, len(self.line_starts)):
+                self.line_starts[i] += delta
+            self.total_lines += delta
+    
+    def _clear_messages(self):
+        """清空消息和布局缓存"""
+        self.messages.clear()
+        self.message_layouts.clear()
+        self.line_starts.clear()
+        self.rendered_layouts.clear()
+        self.line_base = 0
+        self.total_lines = 0
+        self.scroll_offset = 0
+    
+    def _get_line_surfaces(self, layout: MessageLayout):
+        """获取消息的行表面，首次可见时渲染，长期不可见的会被回收"""
+        key = id(layout)
+        if layout.surfaces is None:
+            layout.surfaces = [self.message_font.render(line, True, layout.color) for line in layout.lines]
+            layout.surfaces.append(self.timestamp_font.render(layout.timestamp, True, self.colors['timestamp']))
+            self.rendered_layouts[key] = layout
+            while len(self.rendered_layouts) > self.max_rendered_layouts:
+                _, evicted = self.rendered_layouts.popitem(last=False)
+                evicted.surfaces = None
+        else:
+            self.rendered_layouts.move_to_end(key)
+        return layout.surfaces
     
     def scroll_up(self):
         """向上滚动"""
@@ -360,72 +435,35 @@ class ChatPanel:
         surface.blit(panel_surface, (self.panel_x, self.panel_y))
     
     def _render_messages(self, surface):
-        """渲染消息列表"""
+        """渲染消息列表（只blit可见窗口内的行）"""
         if not self.messages:
             return
         
-        # 创建虚拟的行列表，包含所有展开的消息行
-        display_lines = []
-        max_width = self.panel_width - 2 * self.input_margin
-        
-        for message in self.messages:
-            # 渲染消息文本颜色
-            if message['type'] == 'system':
-                text_color = self.colors['system_message']
-            elif message['type'] == 'thinking':
-                text_color = (180, 180, 180)  # 灰色表示思考中
-            else:
-                text_color = self.colors['message_text']
-            
-            # 构建显示文本
-            display_text = f"[{message['sender']}] {message['text']}"
-            
-            # 处理长消息换行
-            wrapped_lines = self._wrap_text(display_text, max_width)
-            
-            # 添加消息行
-            for line in wrapped_lines:
-                display_lines.append({
-                    'type': 'message',
-                    'text': line,
-                    'color': text_color
-                })
-            
-            # 添加时间戳行
-            display_lines.append({
-                'type': 'timestamp',
-                'text': f"  {message['timestamp']}",
-                'color': self.colors['timestamp']
-            })
-        
         # 计算可见区域
         visible_lines = self.message_area_height // self.line_height
-        total_lines = len(display_lines)
+        total_lines = self.total_lines
         
         # 确保滚动偏移不超出范围
         max_scroll_offset = max(0, total_lines - visible_lines)
         self.scroll_offset = min(self.scroll_offset, max_scroll_offset)
         
-        # 计算显示的行范围
-        start_line = self.scroll_offset
-        end_line = min(start_line + visible_lines, total_lines)
+        # 找到窗口首行所在的消息
+        start_line = self.line_base + self.scroll_offset
+        index = bisect_right(self.line_starts, start_line) - 1
+        line_index = start_line - self.line_starts[index]
         
         # 渲染可见的行
         current_y = self.input_margin
-        
-        for line_index in range(start_line, end_line):
-            if line_index >= len(display_lines):
-                break
-                
-            line_data = display_lines[line_index]
-            
-            if line_data['type'] == 'message':
-                text_surface = self.message_font.render(line_data['text'], True, line_data['color'])
-            else:  # timestamp
-                text_surface = self.timestamp_font.render(line_data['text'], True, line_data['color'])
-            
-            surface.blit(text_surface, (self.input_margin, current_y))
-            current_y += self.line_height
+        rendered = 0
+        while rendered < visible_lines and index < len(self.message_layouts):
+            surfaces = self._get_line_surfaces(self.message_layouts[index])
+            while line_index < len(surfaces) and rendered < visible_lines:
+                surface.blit(surfaces[line_index], (self.input_margin, current_y))
+                current_y += self.line_height
+                line_index += 1
+                rendered += 1
+            index += 1
+            line_index = 0
         
         # 渲染滚动条
         if total_lines > visible_lines:
@@ -536,25 +574,7 @@ class ChatPanel:
     
     def _wrap_text(self, text, max_width):
         """文本换行处理"""
-        words = text.split(' ')
-        lines = []
-        current_line = ""
-        
-        for word in words:
-            test_line = current_line + (" " if current_line else "") + word
-            text_width = self.message_font.size(test_line)[0]
-            
-            if text_width <= max_width:
-                current_line = test_line
-            else:
-                if current_line:
-                    lines.append(current_line)
-                current_line = word
-        
-        if current_line:
-            lines.append(current_line)
-        
-        return lines if lines else [text]
+        return [line for line, _ in self.text_layout.wrap(text, max_width, self.message_font)]
     
     def is_input_focused(self):
         """检查输入框是否获得焦点"""
@@ -571,17 +591,13 @@ class ChatPanel:
     def add_ai_response(self, message: str, sender: str):
         """添加AI回复消息"""
         timestamp = datetime.now().strftime("%H:%M:%S")
-        self.messages.append({
+        self._append_message({
             'text': message,
             'sender': sender,
             'timestamp': timestamp,
             'type': 'message'
         })
         
-        # 限制消息数量
-        if len(self.messages) > self.max_messages:
-            self.messages.pop(0)
-        
         # 自动滚动到最新消息
         self.scroll_to_bottom()
         
@@ -607,11 +623,7 @@ class ChatPanel:
             'timestamp': timestamp,
             'type': 'thinking'  # 特殊类型，用于识别临时消息
         }
-        self.messages.append(thinking_message)
-        
-        # 限制消息数量
-        if len(self.messages) > self.max_messages:
-            self.messages.pop(0)
+        self._append_message(thinking_message)
         
         # 自动滚动到最新消息
         self.scroll_to_bottom()
@@ -628,12 +640,12 @@ class ChatPanel:
                 msg['text'] == "正在思考..."):
                 
                 # 替换为实际回复
-                self.messages[i] = {
+                self._replace_message(i, {
                     'text': response,
                     'sender': npc_name,
                     'timestamp': msg['timestamp'],
                     'type': 'message'
-                }
+                })
                 # 重置等待状态
                 self.pending_ai_response = False
                 self.ai_response_timeout = 0  # 重置超时计时器
@@ -660,7 +672,7 @@ class ChatPanel:
             self.add_system_message("- Home键滚动到顶部，End键滚动到底部")
             
         elif command == "/clear":
-            self.messages.clear()
+            self._clear_messages()
             self.add_system_message("聊天记录已清除")
             # 同时清除AI的对话历史
             if hasattr(self, 'chat_ai_instance'):
@@ -6,19 +6,21 @@
 """
 
 import pygame
-import time
 from typing import List, Optional
 from src.utils.font_manager import FontManager
+from src.utils.text_layout import get_text_layout
+from src.rendering.dirty_rects import get_dirty_rects
 from src.settings import SCREEN_WIDTH, SCREEN_HEIGHT
 
 class EventNotification:
-    """单个事件通知"""
+    """单个事件通知 - 卡片在创建时烘焙一次，动画只改变位置和整体透明度"""
     
-    def __init__(self, message: str, duration: float = 5.0, notification_type: str = "event"):
+    def __init__(self, message: str, duration: float = 5.0, notification_type: str = "event",
+                 card: Optional[pygame.Surface] = None):
         self.message = message
         self.duration = duration
         self.notification_type = notification_type
-        self.start_time = time.time()
+        self.elapsed = 0.0  # 已显示时间（秒），由帧dt累加
         self.is_active = True
         
         # 动画属性
@@ -56,10 +58,46 @@ class EventNotification:
         self.font_manager = FontManager.get_instance()
         self.title_font = self.font_manager.load_chinese_font(18, "event_title_font")
         self.message_font = self.font_manager.load_chinese_font(14, "event_message_font")
+        
+        # 烘焙卡片（可以复用对象池中回收的表面）
+        self.card = self._bake_card(card)
+    
+    def _bake_card(self, card: Optional[pygame.Surface]) -> pygame.Surface:
+        """以完全不透明的状态绘制卡片：背景、边框、图标、标题和消息文本"""
+        if card is None or card.get_size() != (self.width, self.height):
+            card = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        else:
+            card.fill((0, 0, 0, 0))
+        
+        # 获取颜色
+        colors = self.colors.get(self.notification_type, self.colors["event"])
+        
+        # 绘制背景
+        background_rect = pygame.Rect(0, 0, self.width, self.height)
+        pygame.draw.rect(card, colors["background"], background_rect, border_radius=8)
+        
+        # 绘制边框
+        pygame.draw.rect(card, colors["border"], background_rect, width=2, border_radius=8)
+        
+        # 绘制图标
+        icon_text = "🎉" if self.notification_type == "event" else "💕" if self.notification_type == "relationship" else "⚠️"
+        icon_surface = self.title_font.render(icon_text, True, colors["text"])
+        card.blit(icon_surface, (10, 8))
+        
+        # 绘制标题
+        title = "猫猫事件" if self.notification_type == "event" else "关系变化" if self.notification_type == "relationship" else "提醒"
+        title_surface = self.title_font.render(title, True, colors["text"])
+        card.blit(title_surface, (45, 8))
+        
+        # 绘制消息文本（支持换行）
+        self._render_wrapped_text(card, self.message, (10, 35), self.width - 20, colors["text"])
+        
+        return card
     
     def update(self, dt: float, target_y: float) -> bool:
         """更新通知状态，返回是否应该继续显示"""
-        current_time = time.time()
+        self.elapsed += dt
+        elapsed = self.elapsed
         
         # 更新目标位置
         self.target_y = target_y
@@ -72,16 +110,16 @@ class EventNotification:
             self.y_offset = self.target_y
         
         # 淡入动画
-        if current_time - self.start_time < 0.5:  # 前0.5秒淡入
+        if elapsed < 0.5:  # 前0.5秒淡入
             self.alpha = min(255, self.alpha + self.fade_speed * dt)
         # 淡出动画
-        elif current_time - self.start_time > self.duration - 1.0:  # 最后1秒淡出
+        elif elapsed > self.duration - 1.0:  # 最后1秒淡出
             self.alpha = max(0, self.alpha - self.fade_speed * dt)
         else:
             self.alpha = 255
         
         # 检查是否应该移除
-        if current_time - self.start_time > self.duration:
+        if elapsed > self.duration:
             self.is_active = False
             return False
         
@@ -92,58 +130,17 @@ class EventNotification:
         if not self.is_active or self.alpha <= 0:
             return
         
-        # 创建通知表面
-        notification_surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        
-        # 获取颜色
-        colors = self.colors.get(self.notification_type, self.colors["event"])
-        
-        # 绘制背景
-        bg_color = (*colors["background"][:3], int(colors["background"][3] * self.alpha / 255))
-        background_rect = pygame.Rect(0, 0, self.width, self.height)
-        pygame.draw.rect(notification_surface, bg_color, background_rect, border_radius=8)
-        
-        # 绘制边框
-        border_color = (*colors["border"], int(self.alpha))
-        pygame.draw.rect(notification_surface, border_color, background_rect, width=2, border_radius=8)
-        
-        # 绘制图标
-        icon_text = "🎉" if self.notification_type == "event" else "💕" if self.notification_type == "relationship" else "⚠️"
-        icon_surface = self.title_font.render(icon_text, True, (*colors["text"], int(self.alpha)))
-        notification_surface.blit(icon_surface, (10, 8))
-        
-        # 绘制标题
-        title = "猫猫事件" if self.notification_type == "event" else "关系变化" if self.notification_type == "relationship" else "提醒"
-        title_surface = self.title_font.render(title, True, (*colors["text"], int(self.alpha)))
-        notification_surface.blit(title_surface, (45, 8))
-        
-        # 绘制消息文本（支持换行）
-        self._render_wrapped_text(notification_surface, self.message, 
-                                (10, 35), self.width - 20, colors["text"], int(self.alpha))
+        # 卡片已经烘焙好，只需要调整整体透明度
+        self.card.set_alpha(int(self.alpha))
         
         # 将通知表面绘制到主表面
-        surface.blit(notification_surface, (x, self.y_offset))
+        surface.blit(self.card, (x, self.y_offset))
+        get_dirty_rects().add_ui(pygame.Rect(x, self.y_offset, self.width, self.height))
     
     def _render_wrapped_text(self, surface: pygame.Surface, text: str, pos: tuple, 
-                           max_width: int, color: tuple, alpha: int):
+                           max_width: int, color: tuple):
         """渲染支持换行的文本"""
-        words = text.split(' ')
-        lines = []
-        current_line = ""
-        
-        for word in words:
-            test_line = current_line + word + " " if current_line else word + " "
-            test_surface = self.message_font.render(test_line, True, color)
-            
-            if test_surface.get_width() <= max_width:
-                current_line = test_line
-            else:
-                if current_line:
-                    lines.append(current_line.strip())
-                current_line = word + " "
-        
-        if current_line:
-            lines.append(current_line.strip())
+        lines = [line for line, _ in get_text_layout().wrap(text, max_width, self.message_font)]
         
         # 限制行数
         if len(lines) > 2:
@@ -155,7 +152,7 @@ class EventNotification:
         y_offset = 0
         for line in lines:
             if line.strip():
-                line_surface = self.message_font.render(line, True, (*color, alpha))
+                line_surface = self.message_font.render(line, True, color)
                 surface.blit(line_surface, (pos[0], pos[1] + y_offset))
                 y_offset += 18
 
@@ -165,6 +162,7 @@ class EventNotificationManager:
     def __init__(self):
         self.notifications: List[EventNotification] = []
         self.max_notifications = 5
+        self.card_pool: List[pygame.Surface] = []  # 回收的卡片表面，新通知直接复用
         self.notification_spacing = 90
         self.start_x = SCREEN_WIDTH - 420
         self.start_y = 50
@@ -173,12 +171,19 @@ class EventNotificationManager:
                         notification_type: str = "event"):
         """添加新通知"""
         # 移除过多的旧通知
-        if len(self.notifications) >= self.max_notifications:
-            self.notifications.pop(0)
+        while len(self.notifications) >= self.max_notifications:
+            self._recycle(self.notifications.pop(0))
         
-        notification = EventNotification(message, duration, notification_type)
+        card = self.card_pool.pop() if self.card_pool else None
+        notification = EventNotification(message, duration, notification_type, card)
         self.notifications.append(notification)
     
+    def _recycle(self, notification: EventNotification):
+        """回收通知的卡片表面"""
+        if notification.card is not None:
+            self.card_pool.append(notification.card)
+            notification.card = None
+    
     def add_event_notification(self, event_message: str):
         """添加事件通知"""
         self.add_notification(event_message, duration=6.0, notification_type="event")
@@ -218,6 +223,8 @@ class EventNotificationManager:
             target_y = self.start_y + i * self.notification_spacing
             if notification.update(dt, target_y):
                 active_notifications.append(notification)
+            else:
+                self._recycle(notification)
         
         self.notifications = active_notifications
     
@@ -228,6 +235,8 @@ class EventNotificationManager:
     
     def clear_all(self):
         """清除所有通知"""
+        for notification in self.notifications:
+            self._recycle(notification)
         self.notifications.clear()
     
     def has_notifications(self) -> bool:
@@ -4,6 +4,7 @@ import math
 from ..settings import *
 from ..utils.font_manager import FontManager
 from ..utils.emoji_colorizer import EmojiColorizer
+from ..rendering.hud import get_hud_cache
 
 class FishingMinigame:
     """
@@ -207,10 +208,7 @@ class FishingMinigame:
             return
             
         # 绘制半透明背景
-        overlay = pygame.Surface((self.screen_width, self.screen_height))
-        overlay.set_alpha(128)
-        overlay.fill((0, 0, 0))
-        surface.blit(overlay, (0, 0))
+        surface.blit(get_hud_cache().box((self.screen_width, self.screen_height), (0, 0, 0, 128)), (0, 0))
         
         # 绘制主UI背景
         ui_rect = pygame.Rect(self.ui_x, self.ui_y, self.ui_width, self.ui_height)
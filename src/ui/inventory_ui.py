@@ -7,6 +7,8 @@
 import pygame
 from ..settings import *
 from ..utils.font_manager import FontManager
+from ..rendering.hud import get_hud_cache
+from ..core.collision_grid import nearby_sprites
 from ..systems.timer import Timer
 
 class InventoryUI:
@@ -178,7 +180,7 @@ class InventoryUI:
                 return False
         
         # 检查是否与碰撞对象冲突
-        for sprite in self.player.collision_sprites:
+        for sprite in nearby_sprites(self.player.collision_sprites, placement_rect):
             if placement_rect.colliderect(sprite.rect):
                 return False
         
@@ -245,10 +247,7 @@ class InventoryUI:
             return
         
         # 渲染背景
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.set_alpha(128)
-        overlay.fill((0, 0, 0))
-        self.display_surface.blit(overlay, (0, 0))
+        self.display_surface.blit(get_hud_cache().box((SCREEN_WIDTH, SCREEN_HEIGHT), (0, 0, 0, 128)), (0, 0))
         
         # 渲染主面板
         pygame.draw.rect(self.display_surface, (240, 240, 240), self.ui_rect)
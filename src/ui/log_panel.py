@@ -1,8 +1,65 @@
 import pygame
+from bisect import bisect_left, bisect_right
 from typing import List
 from src.utils.font_manager import FontManager
 from datetime import datetime
 
+class LogStore:
+    """按时间戳有序保存日志，并为每种行为类型维护有序索引"""
+    
+    def __init__(self):
+        self.entries = []  # 日志（时间戳升序）
+        self.keys = []  # 与entries对应的时间戳
+        self.by_type = {}  # 类型 -> (时间戳列表, 日志列表)
+        self.version = 0  # 每次增删加一，供缓存判断是否失效
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    @staticmethod
+    def _insert(keys, entries, key, log):
+        # 绝大多数日志按时间顺序到达，直接追加
+        if not keys or key >= keys[-1]:
+            keys.append(key)
+            entries.append(log)
+        else:
+            index = bisect_right(keys, key)
+            keys.insert(index, key)
+            entries.insert(index, log)
+    
+    @staticmethod
+    def _remove(keys, entries, key, log):
+        index = bisect_left(keys, key)
+        while index < len(entries) and entries[index] is not log:
+            index += 1
+        if index < len(entries):
+            del keys[index]
+            del entries[index]
+            return True
+        return False
+    
+    def append(self, log):
+        """加入一条日志"""
+        key = log.get('timestamp', '00:00:00')
+        self._insert(self.keys, self.entries, key, log)
+        type_keys, type_entries = self.by_type.setdefault(log['type'], ([], []))
+        self._insert(type_keys, type_entries, key, log)
+        self.version += 1
+    
+    def remove(self, log):
+        """移除一条日志（例如玩家历史超出上限时丢弃的最早记录）"""
+        key = log.get('timestamp', '00:00:00')
+        if self._remove(self.keys, self.entries, key, log):
+            type_keys, type_entries = self.by_type[log['type']]
+            self._remove(type_keys, type_entries, key, log)
+            self.version += 1
+    
+    def view(self, log_type=None):
+        """返回全部或某一类型的日志（时间戳升序，不要修改）"""
+        if log_type is None:
+            return self.entries
+        return self.by_type.get(log_type, ([], []))[1]
+
 class LogPanel:
     """日志面板UI - 显示玩家历史行为记录"""
     
@@ -13,6 +70,10 @@ class LogPanel:
         # 内部日志列表
         self.logs = []
         
+        # 日志存储：玩家行为和内部日志都按时间戳有序存放
+        self.store = LogStore()
+        self.player_log_count = 0  # 来自玩家行为记录的日志数量
+        
         # 字体设置
         self.title_font = self.font_manager.load_chinese_font(32, "log_title_font")
         self.header_font = self.font_manager.load_chinese_font(20, "log_header_font")
@@ -57,9 +118,33 @@ class LogPanel:
             'farming', 'tool_use', 'tool_switch', 'seed_switch'
         ]
         self.current_filter_index = 0
+        
+        # 渲染缓存
+        self.panel_surface = None  # 复用的面板表面
+        self.panel_key = None  # 面板表面对应的 (日志版本, 筛选, 滚动位置)
+        self.row_surfaces = {}  # 显示序号 -> 该行日志渲染好的表面
+        self.row_key = None  # 行表面对应的 (日志版本, 筛选)
+        self.hint_surfaces = {}  # 操作提示文本 -> 渲染好的表面（不变）
+    
+    def add_log(self, log):
+        """添加内部日志"""
+        self.logs.append(log)
+        self.store.append(log)
+    
+    def on_player_log_added(self, log):
+        """玩家记录了新行为"""
+        self.store.append(log)
+        self.player_log_count += 1
+    
+    def on_player_log_removed(self, log):
+        """玩家行为历史超出上限，丢弃了最早的记录"""
+        self.store.remove(log)
+        self.player_log_count -= 1
     
     def clear_logs(self):
         """清空所有日志"""
+        for log in self.logs:
+            self.store.remove(log)
         self.logs.clear()
         print("[日志面板] 清空所有日志")
     
@@ -111,10 +196,20 @@ class LogPanel:
         panel_x = (screen_width - self.panel_width) // 2
         panel_y = (screen_height - self.panel_height) // 2
         
-        # 创建面板背景
-        panel_surface = pygame.Surface((self.panel_width, self.panel_height))
+        # 日志、筛选和滚动位置都没变时直接复用上次的面板
+        if self.panel_key != (self.store.version, self.filter_type, self.scroll_offset):
+            self._compose_panel(player)
+        
+        # 将面板绘制到主屏幕
+        surface.blit(self.panel_surface, (panel_x, panel_y))
+    
+    def _compose_panel(self, player):
+        """重新绘制面板表面"""
+        if self.panel_surface is None:
+            self.panel_surface = pygame.Surface((self.panel_width, self.panel_height))
+            self.panel_surface.set_alpha(200)
+        panel_surface = self.panel_surface
         panel_surface.fill((0, 0, 0))
-        panel_surface.set_alpha(200)
         
         # 绘制边框
         pygame.draw.rect(panel_surface, self.colors['border'], 
@@ -123,14 +218,13 @@ class LogPanel:
         # 绘制标题和筛选信息
         current_y = self._render_header(panel_surface, player)
         
-        # 绘制日志内容
+        # 绘制日志内容（会把滚动位置限制在有效范围内）
         current_y = self._render_log_content(panel_surface, player, current_y)
         
         # 绘制操作提示
         self._render_controls_hint(panel_surface)
         
-        # 将面板绘制到主屏幕
-        surface.blit(panel_surface, (panel_x, panel_y))
+        self.panel_key = (self.store.version, self.filter_type, self.scroll_offset)
     
     def _render_header(self, surface, player):
         """渲染标题和统计信息"""
@@ -143,8 +237,7 @@ class LogPanel:
         current_y = title_rect.bottom + 10
         
         # 统计信息
-        stats = player.get_behavior_statistics() if hasattr(player, 'get_behavior_statistics') else {}
-        player_log_count = len(player.behavior_history) if hasattr(player, 'behavior_history') else 0
+        player_log_count = self.player_log_count
         internal_log_count = len(self.logs)
         total_logs = player_log_count + internal_log_count
         
@@ -175,7 +268,7 @@ class LogPanel:
         current_y = start_y
         content_height = self.panel_height - start_y - 80  # 留出底部提示空间
         
-        # 获取筛选后的日志
+        # 获取筛选后的日志（时间戳升序，显示时最新的在前）
         filtered_logs = self._get_filtered_logs(player)
         
         if not filtered_logs:
@@ -193,14 +286,21 @@ class LogPanel:
         start_index = max(0, self.scroll_offset // self.line_spacing)
         visible_count = min(self.max_visible_lines, len(filtered_logs) - start_index)
         
+        # 日志增删或切换筛选后，已渲染的行作废（序号会变化）
+        row_key = (self.store.version, self.filter_type)
+        if self.row_key != row_key:
+            self.row_surfaces.clear()
+            self.row_key = row_key
+        
         # 渲染可见的日志
+        last = len(filtered_logs) - 1
         for i in range(visible_count):
             log_index = start_index + i
-            if log_index >= len(filtered_logs):
-                break
-                
-            log = filtered_logs[log_index]
-            current_y = self._render_log_item(surface, log, current_y, log_index + 1)
+            row = self.row_surfaces.get(log_index)
+            if row is None:
+                row = self._render_log_row(filtered_logs[last - log_index], log_index + 1)
+                self.row_surfaces[log_index] = row
+            current_y = self._blit_log_row(surface, row, current_y)
             
             # 检查是否超出可见区域
             if current_y > start_y + content_height:
@@ -212,11 +312,8 @@ class LogPanel:
         
         return current_y
     
-    def _render_log_item(self, surface, log, start_y, index):
-        """渲染单个日志项"""
-        current_y = start_y
-        indent = self.margin + 10
-        
+    def _render_log_row(self, log, index):
+        """渲染单个日志项的各行表面 (时间戳, 行为描述, 详情或None)"""
         # 获取行为类型对应的颜色
         behavior_color = self.colors.get(log['type'], self.colors['default'])
         
@@ -225,17 +322,15 @@ class LogPanel:
             f"{index:3d}. [{log['timestamp']}]", 
             True, self.colors['timestamp']
         )
-        surface.blit(time_text, (indent, current_y))
         
         # 渲染行为类型和描述
         action_text = self.text_font.render(
             f"{log['type']}: {log['action']}", 
             True, behavior_color
         )
-        surface.blit(action_text, (indent + 200, current_y))
-        current_y += self.line_spacing
         
         # 渲染详细信息（如果有）
+        detail_text = None
         if log['details']:
             details = self._format_log_details(log['details'])
             if details:
@@ -243,8 +338,22 @@ class LogPanel:
                     f"    {details}", 
                     True, self.colors['details']
                 )
-                surface.blit(detail_text, (indent + 20, current_y))
-                current_y += self.line_spacing - 3
+        
+        return (time_text, action_text, detail_text)
+    
+    def _blit_log_row(self, surface, row, start_y):
+        """绘制单个日志项，返回下一项的y坐标"""
+        current_y = start_y
+        indent = self.margin + 10
+        time_text, action_text, detail_text = row
+        
+        surface.blit(time_text, (indent, current_y))
+        surface.blit(action_text, (indent + 200, current_y))
+        current_y += self.line_spacing
+        
+        if detail_text:
+            surface.blit(detail_text, (indent + 20, current_y))
+            current_y += self.line_spacing - 3
         
         return current_y
     
@@ -291,25 +400,8 @@ class LogPanel:
         return " | ".join(detail_parts)
     
     def _get_filtered_logs(self, player):
-        """获取筛选后的日志列表"""
-        # 合并内部日志和玩家行为日志
-        all_logs = []
-        
-        # 添加玩家行为日志
-        if hasattr(player, 'behavior_history') and player.behavior_history:
-            all_logs.extend(player.behavior_history)
-        
-        # 添加内部日志
-        all_logs.extend(self.logs)
-        
-        # 按时间戳排序（最新的在前）
-        all_logs.sort(key=lambda x: x.get('timestamp', '00:00:00'), reverse=True)
-        
-        # 应用筛选
-        if self.filter_type is None:
-            return all_logs
-        else:
-            return [log for log in all_logs if log['type'] == self.filter_type]
+        """获取筛选后的日志列表（时间戳升序，直接来自按类型维护的索引）"""
+        return self.store.view(self.filter_type)
     
     def _render_scrollbar(self, surface, content_start_y, content_height, total_height):
         """渲染滚动条"""
@@ -337,7 +429,10 @@ class LogPanel:
         
         y_offset = self.panel_height - self.margin - 20
         for hint in hints:
-            hint_text = self.small_font.render(hint, True, self.colors['default'])
+            hint_text = self.hint_surfaces.get(hint)
+            if hint_text is None:
+                hint_text = self.small_font.render(hint, True, self.colors['default'])
+                self.hint_surfaces[hint] = hint_text
             hint_rect = hint_text.get_rect(centerx=self.panel_width//2, y=y_offset)
             surface.blit(hint_text, hint_rect)
             y_offset += hint_text.get_height() + 5 
\ No newline at end of file
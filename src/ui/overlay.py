@@ -1,6 +1,8 @@
 import pygame
 from src.settings import *
 from src.utils.font_manager import FontManager
+from src.rendering.dirty_rects import get_dirty_rects
+from src.rendering.hud import get_hud_cache
 
 class Overlay:
 	def __init__(self, player):
@@ -40,7 +42,8 @@ class Overlay:
 		绘制带背景的文本框
 		"""
 		# 渲染文本
-		text_surface = font.render(text, True, text_color)
+		hud = get_hud_cache()
+		text_surface = hud.text(font, text, text_color)
 		text_rect = text_surface.get_rect()
 		
 		# 设置位置
@@ -51,12 +54,8 @@ class Overlay:
 			padding = 8
 			bg_rect = text_rect.inflate(padding * 2, padding * 2)
 			
-			# 创建半透明背景
-			bg_surface = pygame.Surface((bg_rect.width, bg_rect.height))
-			bg_surface.set_alpha(bg_color[3] if len(bg_color) == 4 else 255)
-			bg_surface.fill(bg_color[:3])
-			
-			self.display_surface.blit(bg_surface, bg_rect)
+			# 绘制半透明背景
+			hud.draw_box(self.display_surface, bg_rect, bg_color)
 			
 					# 绘制边框
 		if border_color:
@@ -64,6 +63,7 @@ class Overlay:
 	
 		# 绘制文本
 		self.display_surface.blit(text_surface, text_rect)
+		get_dirty_rects().add_ui(bg_rect if bg_color else text_rect)
 		
 		return text_rect
 	
@@ -277,7 +277,7 @@ class Overlay:
 			# 渲染文本
 			color = (255, 255, 255) if i == 0 else (180, 180, 180)
 			font = self.font if i == 0 else self.small_font
-			text_surface = font.render(tip, True, color)
+			text_surface = get_hud_cache().text(font, tip, color)
 			text_rect = text_surface.get_rect()
 			text_rect.topright = (SCREEN_WIDTH - 20, 40 + i * 26)
 			
@@ -285,14 +285,12 @@ class Overlay:
 			if i == 0:
 				padding = 6
 				bg_rect = text_rect.inflate(padding * 2, padding * 2)
-				bg_surface = pygame.Surface((bg_rect.width, bg_rect.height))
-				bg_surface.set_alpha(80)
-				bg_surface.fill((0, 0, 0))
-				self.display_surface.blit(bg_surface, bg_rect)
+				get_hud_cache().draw_box(self.display_surface, bg_rect, (0, 0, 0, 80))
 				pygame.draw.rect(self.display_surface, self.border_color, bg_rect, 1)
 			
 			# 绘制文本
 			self.display_surface.blit(text_surface, text_rect)
+			get_dirty_rects().add_ui(bg_rect if i == 0 else text_rect)
 		
 		# 显示时间信息
 		if self.show_time and self.sky_system:
@@ -0,0 +1,62 @@
+import unicodedata
+from bisect import bisect_right
+
+# 字符类别
+EMOJI = 'emoji'    # 使用emoji字体渲染
+WIDE = 'wide'      # 全角字符（中文、日文等）
+NARROW = 'narrow'  # 半角字符
+
+# emoji区间表（按起点升序，闭区间），覆盖BMP中的符号区和SMP中的表情区
+EMOJI_RANGES = (
+	(0x2600, 0x26FF),    # Misc symbols
+	(0x2700, 0x27BF),    # Dingbats
+	(0xFE00, 0xFE0F),    # Variation selectors
+	(0x1F1E0, 0x1F1FF),  # Regional indicator symbols
+	(0x1F300, 0x1F5FF),  # Misc Symbols and Pictographs
+	(0x1F600, 0x1F64F),  # Emoticons
+	(0x1F680, 0x1F6FF),  # Transport and Map
+	(0x1F900, 0x1F9FF),  # Supplemental Symbols and Pictographs
+)
+_EMOJI_STARTS = [start for start, _ in EMOJI_RANGES]
+
+# 码点 -> 类别，每个码点只查一次表
+_classes = {}
+
+def _lookup(code_point):
+	"""
+	区间二分查找 + unicodedata，结果写入缓存
+	"""
+	index = bisect_right(_EMOJI_STARTS, code_point) - 1
+	if index >= 0 and code_point <= EMOJI_RANGES[index][1]:
+		result = EMOJI
+	elif unicodedata.east_asian_width(chr(code_point)) in ('F', 'W'):
+		result = WIDE
+	else:
+		result = NARROW
+	_classes[code_point] = result
+	return result
+
+def classify(char):
+	"""
+	按首个码点对字符分类，返回 EMOJI / WIDE / NARROW
+	ASCII渲染器选择字体和各UI的文本测量、换行共用这一张表
+	"""
+	if not char:
+		return NARROW
+	code_point = ord(char[0])
+	result = _classes.get(code_point)
+	if result is None:
+		result = _lookup(code_point)
+	return result
+
+def is_emoji(char):
+	"""
+	字符是否需要用emoji字体渲染
+	"""
+	return classify(char) is EMOJI
+
+def is_wide(char):
+	"""
+	字符是否为全角字符（不含emoji）
+	"""
+	return classify(char) is WIDE
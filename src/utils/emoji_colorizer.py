@@ -104,6 +104,65 @@ class EmojiColorizer:
             'ice': (173, 216, 230),        # 冰蓝色
         }
 
+class ColoredEmojiAtlas:
+    """
+    着色emoji图集
+    按 (emoji, rgb, 字号) 共享着色后的表面，同色的猫咪共用同一张表面；
+    使用引用计数，最后一个使用者释放后淘汰
+    返回的表面是共享的，调用方只能blit，不能修改
+    """
+    
+    def __init__(self):
+        self._surfaces = {}  # (emoji, rgb, size) -> Surface
+        self._refs = {}  # (emoji, rgb, size) -> 引用计数
+    
+    def __len__(self):
+        return len(self._surfaces)
+    
+    @staticmethod
+    def make_key(emoji_text, color, size):
+        return (emoji_text, tuple(color[:3]), size)
+    
+    def acquire(self, emoji_text, color, size):
+        """
+        获取着色后的emoji表面并增加引用计数，首次请求时着色
+        """
+        key = self.make_key(emoji_text, color, size)
+        surface = self._surfaces.get(key)
+        if surface is None:
+            from .font_manager import FontManager
+            font = FontManager.get_instance().load_emoji_font(size)
+            surface = EmojiColorizer.colorize_emoji(font, emoji_text, key[1])
+            self._surfaces[key] = surface
+            self._refs[key] = 0
+        self._refs[key] += 1
+        return surface
+    
+    def release(self, emoji_text, color, size):
+        """
+        释放一次引用，引用计数归零时淘汰表面
+        """
+        key = self.make_key(emoji_text, color, size)
+        if key not in self._refs:
+            return
+        self._refs[key] -= 1
+        if self._refs[key] <= 0:
+            del self._refs[key]
+            del self._surfaces[key]
+
+
+# 全局着色emoji图集实例
+_colored_emoji_atlas = None
+
+def get_colored_emoji_atlas():
+    """
+    获取着色emoji图集单例
+    """
+    global _colored_emoji_atlas
+    if _colored_emoji_atlas is None:
+        _colored_emoji_atlas = ColoredEmojiAtlas()
+    return _colored_emoji_atlas
+
 # 使用示例：
 def example_usage():
     """
@@ -1,12 +1,19 @@
 import os
 import sys
+import time
+from collections import deque
 import pygame
 from ..core.support import get_resource_path
 
+# 菜单和关卡界面用到的字号，在主菜单期间逐帧预加载
+PRELOAD_CHINESE_SIZES = (12, 14, 16, 18, 20, 24, 30, 32, 36)
+PRELOAD_EMOJI_SIZES = (12, 16, 24, 32, 64)
+
 class FontManager:
 	"""
 	字体管理器 - 统一管理所有字体的加载
-	确保每个字体只加载一次，避免重复加载
+	按(字体文件, 字号)去重，同一个文件同一个字号只打开一次；
+	调用方传入的font_key只是指向同一个字体对象的别名
 	"""
 	_instance = None
 	_fonts = {}
@@ -19,9 +26,36 @@ class FontManager:
 	def __init__(self):
 		if not hasattr(self, 'initialized'):
 			self.initialized = True
-			self._fonts = {}
+			self._fonts = {}  # font_key别名 -> 字体
+			self._font_files = {}  # (字体来源, 字号) -> 字体
+			self._font_ids = {}  # 字体 -> (字体来源, 字号)
+			self.load_times = {}  # (字体来源, 字号) -> 加载耗时（秒）
+			self._warm_up_queue = deque()  # 等待预加载的 (字体类别, 字号)
+			self._warm_up_started = False
 			print("字体管理器初始化")
 	
+	def _load_cached(self, font_key, file_key, loader):
+		"""
+		按别名和(字体来源, 字号)查找缓存，都未命中时调用loader加载并记录耗时
+		"""
+		font = self._fonts.get(font_key)
+		if font is not None:
+			return font
+		
+		font = self._font_files.get(file_key)
+		if font is None:
+			start_time = time.perf_counter()
+			font = loader()
+			if font is None:
+				return None
+			elapsed = time.perf_counter() - start_time
+			self._font_files[file_key] = font
+			self._font_ids[font] = file_key
+			self.load_times[file_key] = elapsed
+			print(f"字体加载耗时: {file_key[0]} (大小: {file_key[1]}) {elapsed * 1000:.1f}ms")
+		self._fonts[font_key] = font
+		return font
+	
 	def load_chinese_font(self, size, font_key=None):
 		"""
 		加载支持中文的字体
@@ -30,10 +64,17 @@ class FontManager:
 			font_key = f"chinese_{size}"
 		
 		# 如果已经加载过，直接返回
-		if font_key in self._fonts:
-			return self._fonts[font_key]
+		font = self._fonts.get(font_key)
+		if font is not None:
+			return font
 		
 		font_path = get_resource_path('assets/fonts/AlimamaShuHeiTi-Bold.ttf')
+		return self._load_cached(font_key, (font_path, size), lambda: self._open_chinese_font(font_path, size))
+	
+	def _open_chinese_font(self, font_path, size):
+		"""
+		打开中文字体文件，失败时依次回退到系统字体和默认字体
+		"""
 		font_loaded = False
 		font = None
 		
@@ -62,15 +103,13 @@ class FontManager:
 			except Exception as e:
 				print(f"默认字体加载失败: {e}")
 		
-		# 测试中文渲染
+		# 测试中文渲染（每个文件和字号只做一次）
 		try:
 			test_surface = font.render("测试中文", True, (255,255,255))
 			print(f"中文渲染测试成功 (大小: {size})")
 		except Exception as e:
 			print(f"中文渲染测试失败: {e}")
 		
-		# 缓存字体
-		self._fonts[font_key] = font
 		return font
 	
 	def load_emoji_font(self, size, font_key=None):
@@ -82,9 +121,20 @@ class FontManager:
 			font_key = f"emoji_{size}"
 		
 		# 如果已经加载过，直接返回
-		if font_key in self._fonts:
-			return self._fonts[font_key]
+		font = self._fonts.get(font_key)
+		if font is not None:
+			return font
 		
+		font = self._load_cached(font_key, ('emoji', size), lambda: self._open_emoji_font(size))
+		if font is None:
+			# 回退到中文字体
+			return self.load_chinese_font(size)
+		return font
+	
+	def _open_emoji_font(self, size):
+		"""
+		依次尝试系统emoji字体，都失败时使用默认字体
+		"""
 		font = None
 		font_loaded = False
 		
@@ -114,13 +164,44 @@ class FontManager:
 				print(f"使用默认字体作为emoji字体 (大小: {size})")
 			except Exception as e:
 				print(f"Emoji字体加载完全失败: {e}")
-				# 回退到中文字体
-				return self.load_chinese_font(size)
+				return None
 		
-		# 缓存字体
-		self._fonts[font_key] = font
 		return font
 	
+	def start_warm_up(self, chinese_sizes=PRELOAD_CHINESE_SIZES, emoji_sizes=PRELOAD_EMOJI_SIZES):
+		"""
+		安排预加载关卡界面会用到的字号（在主菜单期间调用），实际加载由warm_up_step逐帧完成
+		SDL_ttf不是线程安全的，字体只能在主线程上打开
+		之后各界面按自己的font_key加载时只是登记别名
+		"""
+		if self._warm_up_started:
+			return
+		self._warm_up_started = True
+		self._warm_up_queue.extend(('chinese', size) for size in chinese_sizes)
+		self._warm_up_queue.extend(('emoji', size) for size in emoji_sizes)
+	
+	def warm_up_step(self, max_fonts=2):
+		"""
+		加载预加载队列中的下几个字体（主菜单每帧调用一次），队列还没清空时返回True
+		"""
+		for _ in range(max_fonts):
+			if not self._warm_up_queue:
+				break
+			kind, size = self._warm_up_queue.popleft()
+			if kind == 'chinese':
+				self.load_chinese_font(size)
+			else:
+				self.load_emoji_font(size)
+		return bool(self._warm_up_queue)
+	
+	def font_identity(self, font):
+		"""
+		获取字体的稳定标识，用作渲染缓存的键
+		管理器加载的字体返回(字体来源, 字号)；其他字体返回字体对象本身，
+		缓存持有它就不会被回收，不会像id(font)那样被新字体复用
+		"""
+		return self._font_ids.get(font, font)
+	
 	def get_font(self, size_or_key):
 		"""
 		获取字体 - 支持按大小或键名获取
@@ -134,7 +215,6 @@ class FontManager:
 			# 按键名从缓存获取字体
 			return self._fonts.get(size_or_key)
 	
-	@classmethod
 	@classmethod
 	def get_instance(cls):
 		"""
@@ -1,6 +1,14 @@
 import pygame 
 from ..settings import *
-from random import randint, choice
+from ..rendering.dirty_rects import get_dirty_rects
+from ..rendering.tile_images import get_tile_images
+
+try:
+	import numpy as np
+	NUMPY_AVAILABLE = True
+except ImportError:
+	np = None
+	NUMPY_AVAILABLE = False
 
 class Sky:
 	def __init__(self):
@@ -22,6 +30,11 @@ class Sky:
 		self.sunrise_hour = 6   # 日出时间：6点
 		self.sunset_hour = 18   # 日落时间：18点
 		
+		# 一天1440分钟的天空颜色查找表
+		self.color_lut = self.build_color_lut()
+		self.lut_minute = None  # 当前颜色对应的分钟
+		self.tint_color = None  # full_surf当前填充的颜色
+		
 		# 初始化颜色
 		self.update_color_based_on_time()
 
@@ -32,9 +45,16 @@ class Sky:
 		# 根据当前时间更新颜色
 		self.update_color_based_on_time()
 		
-		# 渲染天空
-		self.full_surf.fill(self.current_color)
-		self.display_surface.blit(self.full_surf, (0,0), special_flags = pygame.BLEND_RGBA_MULT)
+		# 颜色变化时才重新填充色调表面
+		color = tuple(self.current_color)
+		if color != self.tint_color:
+			self.tint_color = color
+			self.full_surf.fill(color)
+			get_dirty_rects().invalidate()  # 整屏色调变化
+		
+		# 渲染天空 - 白色相乘不改变画面，白天直接跳过
+		if color != (255, 255, 255):
+			self.display_surface.blit(self.full_surf, (0,0), special_flags = pygame.BLEND_RGBA_MULT)
 	
 	def update_time(self, dt):
 		"""
@@ -71,11 +91,23 @@ class Sky:
 	
 	def update_color_based_on_time(self):
 		"""
-		根据当前时间计算天空颜色
+		根据当前时间从查找表取天空颜色，分钟不变时不做任何事
 		"""
-		# 计算当前时间在一天中的位置（0-1）
 		current_time_minutes = self.game_hour * 60 + self.game_minute
-		
+		if current_time_minutes != self.lut_minute:
+			self.lut_minute = current_time_minutes
+			self.current_color = list(self.color_lut[current_time_minutes])
+	
+	def build_color_lut(self):
+		"""
+		预先计算一天中每一分钟的天空颜色
+		"""
+		return [tuple(self.color_at_minute(minute)) for minute in range(24 * 60)]
+	
+	def color_at_minute(self, current_time_minutes):
+		"""
+		计算某一分钟的天空颜色
+		"""
 		# 定义关键时间点（分钟）
 		dawn_start = 5 * 60      # 5:00 黎明开始
 		sunrise = 6 * 60         # 6:00 日出
@@ -87,20 +119,20 @@ class Sky:
 		if dawn_start <= current_time_minutes < sunrise:
 			# 黎明时段（5:00-6:00）：从夜晚颜色渐变到白天颜色
 			progress = (current_time_minutes - dawn_start) / (sunrise - dawn_start)
-			self.current_color = self.interpolate_color(self.night_color, self.day_color, progress)
+			return self.interpolate_color(self.night_color, self.day_color, progress)
 			
 		elif sunrise <= current_time_minutes < sunset:
 			# 白天时段（6:00-18:00）：保持白天颜色
-			self.current_color = self.day_color.copy()
+			return self.day_color.copy()
 			
 		elif sunset <= current_time_minutes < dusk_end:
 			# 黄昏时段（18:00-19:00）：从白天颜色渐变到夜晚颜色
 			progress = (current_time_minutes - sunset) / (dusk_end - sunset)
-			self.current_color = self.interpolate_color(self.day_color, self.night_color, progress)
+			return self.interpolate_color(self.day_color, self.night_color, progress)
 			
 		else:
 			# 夜晚时段（19:00-5:00）：保持夜晚颜色
-			self.current_color = self.night_color.copy()
+			return self.night_color.copy()
 	
 	def interpolate_color(self, color1, color2, progress):
 		"""
@@ -219,32 +251,94 @@ class Sky:
 		else:
 			return (24 * 60 - current_minutes) + sunset_minutes
 
-# Drop类已移除 - ASCII模式下直接使用ASCIIGeneric
-
 class Rain:
+	"""
+	雨效果 - 定长粒子池
+	雨滴和地面水花的位置、速度、剩余寿命保存在固定容量的NumPy数组里，
+	每帧一次向量化推进，死掉的粒子在相机附近原地重生；
+	绘制时只取视口内的粒子，全部使用同一张共享的水滴图像。
+	开销由RAIN_DROP_COUNT / RAIN_FLOOR_COUNT决定，不会随时间增长
+	"""
 	def __init__(self, all_sprites):
 		self.all_sprites = all_sprites
-		# ASCII模式下不需要加载图片，使用预设尺寸
-		self.floor_w, self.floor_h = 1280, 768  # 使用固定地图尺寸
-
-	def create_floor(self):
-		# ASCII模式下创建ASCII雨滴精灵
-		from ascii_sprites import ASCIIGeneric
-		ASCIIGeneric(
-			pos = (randint(0,self.floor_w),randint(0,self.floor_h)), 
-			tile_type = 'water',
-			groups = [self.all_sprites], 
-			z = LAYERS['rain floor'])
-
-	def create_drops(self):
-		# ASCII模式下创建ASCII雨滴精灵
-		from ascii_sprites import ASCIIGeneric
-		ASCIIGeneric(
-			pos = (randint(0,self.floor_w),randint(0,self.floor_h)), 
-			tile_type = 'water',
-			groups = [self.all_sprites], 
-			z = LAYERS['rain drops'])
-
-	def update(self):
-		self.create_floor()
-		self.create_drops()
\ No newline at end of file
+		self.raining = False  # 停雨后不再重生，现有粒子自然消失
+		self.enabled = NUMPY_AVAILABLE
+		if not self.enabled:
+			print("[Rain] 未安装numpy，雨效果已禁用")
+			return
+
+		self.rng = np.random.default_rng()
+		self.drop_image = get_tile_images().get('water')
+
+		# 下落的雨滴：位置、速度、剩余寿命
+		self.drop_pos = np.zeros((RAIN_DROP_COUNT, 2), dtype=np.float32)
+		self.drop_vel = np.zeros((RAIN_DROP_COUNT, 2), dtype=np.float32)
+		self.drop_life = np.zeros(RAIN_DROP_COUNT, dtype=np.float32)
+		# 地面水花：位置、剩余寿命（不移动）
+		self.floor_pos = np.zeros((RAIN_FLOOR_COUNT, 2), dtype=np.float32)
+		self.floor_life = np.zeros(RAIN_FLOOR_COUNT, dtype=np.float32)
+
+		# 分别画在雨滴层和地面积水层
+		all_sprites.add_layer_painter(LAYERS['rain floor'], self.draw_floor)
+		all_sprites.add_layer_painter(LAYERS['rain drops'], self.draw_drops)
+
+	def spawn(self, positions, dead):
+		"""
+		在当前视口（向外扩一格）内随机重生死掉的粒子
+		"""
+		area = self.all_sprites.view_rect.inflate(TILE_SIZE * 2, TILE_SIZE * 2)
+		count = int(dead.sum())
+		positions[dead, 0] = self.rng.uniform(area.left, area.right, count)
+		positions[dead, 1] = self.rng.uniform(area.top, area.bottom, count)
+		return count
+
+	def update(self, dt):
+		"""
+		推进所有粒子
+		"""
+		if not self.enabled:
+			return
+		if not self.raining and self.drop_life.max() <= 0 and self.floor_life.max() <= 0:
+			return
+		get_dirty_rects().invalidate()  # 雨覆盖整个视口
+
+		self.drop_life -= dt
+		self.floor_life -= dt
+		self.drop_pos += self.drop_vel * dt
+
+		if self.raining:
+			dead = self.drop_life <= 0
+			count = self.spawn(self.drop_pos, dead)
+			if count:
+				self.drop_vel[dead, 0] = -2 * 60  # 略微向左飘
+				self.drop_vel[dead, 1] = 4 * 60
+				self.drop_life[dead] = self.rng.uniform(0.4, 0.5, count)
+
+			dead = self.floor_life <= 0
+			count = self.spawn(self.floor_pos, dead)
+			if count:
+				self.floor_life[dead] = self.rng.uniform(0.4, 0.5, count)
+
+	def visible(self, positions, life, view_rect):
+		"""
+		返回视口内存活粒子的屏幕坐标
+		"""
+		x = positions[:, 0]
+		y = positions[:, 1]
+		mask = ((life > 0)
+				& (x > view_rect.left - TILE_SIZE) & (x < view_rect.right)
+				& (y > view_rect.top - TILE_SIZE) & (y < view_rect.bottom))
+		screen = positions[mask] - (view_rect.left, view_rect.top)
+		return screen.astype(np.int32).tolist()
+
+	def draw(self, surface, positions, life, view_rect):
+		image = self.drop_image
+		surface.blits([(image, pos) for pos in self.visible(positions, life, view_rect)], doreturn=False)
+
+	def draw_floor(self, surface, view_rect):
+		if self.enabled:
+			self.draw(surface, self.floor_pos, self.floor_life, view_rect)
+
+	def draw_drops(self, surface, view_rect):
+		if self.enabled:
+			self.draw(surface, self.drop_pos, self.drop_life, view_rect)
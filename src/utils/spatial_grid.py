@@ -0,0 +1,264 @@
+import math
+import pygame
+
+class SpatialGrid:
+	"""
+	均匀网格空间索引 - 以cell_size为边长把世界划分成格子
+	每个对象按一个点（通常是rect.center）归入唯一的格子，
+	查询时只访问与查询矩形重叠的格子，开销与查询范围成正比，与地图大小无关
+	"""
+	def __init__(self, cell_size):
+		self.cell_size = cell_size
+		self.cells = {}  # (col, row) -> {item: None}，保持插入顺序
+		self.item_cells = {}  # item -> (col, row)
+
+	def __len__(self):
+		return len(self.item_cells)
+
+	def __contains__(self, item):
+		return item in self.item_cells
+
+	def cell_of(self, pos):
+		"""
+		获取坐标所在的格子
+		"""
+		return (int(pos[0] // self.cell_size), int(pos[1] // self.cell_size))
+
+	def insert(self, item, pos):
+		"""
+		插入对象，已存在时等同于move
+		"""
+		if item in self.item_cells:
+			self.move(item, pos)
+			return
+		cell = self.cell_of(pos)
+		self.item_cells[item] = cell
+		self.cells.setdefault(cell, {})[item] = None
+
+	def remove(self, item):
+		"""
+		移除对象
+		"""
+		cell = self.item_cells.pop(item, None)
+		if cell is None:
+			return
+		bucket = self.cells[cell]
+		del bucket[item]
+		if not bucket:
+			del self.cells[cell]
+
+	def move(self, item, pos):
+		"""
+		更新对象位置，只有跨格子时才需要改动索引
+		返回True表示对象换了格子
+		"""
+		cell = self.cell_of(pos)
+		old_cell = self.item_cells.get(item)
+		if old_cell == cell:
+			return False
+		if old_cell is not None:
+			self.remove(item)
+		self.item_cells[item] = cell
+		self.cells.setdefault(cell, {})[item] = None
+		return True
+
+	def cell_range(self, rect):
+		"""
+		返回与矩形重叠的格子范围 (col0, row0, col1, row1)，包含两端
+		"""
+		size = self.cell_size
+		return (
+			math.floor(rect.left / size),
+			math.floor(rect.top / size),
+			math.floor((rect.right - 1) / size),
+			math.floor((rect.bottom - 1) / size))
+
+	def query_rect(self, rect):
+		"""
+		返回落在与矩形重叠的格子里的对象，按行（从上到下）、列（从左到右）的顺序
+		结果是候选集，需要精确判断时由调用方自行检测
+		"""
+		col0, row0, col1, row1 = self.cell_range(rect)
+		cells = self.cells
+		result = []
+		if (col1 - col0 + 1) * (row1 - row0 + 1) > len(cells):
+			# 查询范围比已占用的格子还多时，直接遍历已占用格子
+			for (col, row), bucket in sorted(cells.items(), key=lambda item: (item[0][1], item[0][0])):
+				if col0 <= col <= col1 and row0 <= row <= row1:
+					result.extend(bucket)
+			return result
+		for row in range(row0, row1 + 1):
+			for col in range(col0, col1 + 1):
+				bucket = cells.get((col, row))
+				if bucket:
+					result.extend(bucket)
+		return result
+
+class ProximityIndex:
+	"""
+	动态实体邻近索引 - 在SpatialGrid上按实体当前位置做半径查询和最近邻查询
+	实体移动后调用update，只有跨格子时才改动网格；距离比较全部使用平方距离
+	position决定实体的位置，默认取rect.center
+	"""
+	def __init__(self, cell_size=128, position=None):
+		self.grid = SpatialGrid(cell_size)
+		self.position = position or (lambda entity: entity.rect.center)
+		self._pending = {}  # 等待登记的新实体（加入精灵组时还没有rect）
+
+	def __len__(self):
+		return len(self.grid) + len(self._pending)
+
+	def __contains__(self, entity):
+		return entity in self.grid or entity in self._pending
+
+	def add(self, entity):
+		"""
+		加入实体，到第一次查询时再按位置登记
+		"""
+		if entity not in self.grid:
+			self._pending[entity] = None
+
+	def update(self, entity):
+		"""
+		登记实体或更新它的位置
+		"""
+		self._pending.pop(entity, None)
+		self.grid.insert(entity, self.position(entity))
+
+	def remove(self, entity):
+		"""
+		移除实体
+		"""
+		self._pending.pop(entity, None)
+		self.grid.remove(entity)
+
+	def clear(self):
+		self._pending.clear()
+		self.grid.cells.clear()
+		self.grid.item_cells.clear()
+
+	def flush(self):
+		"""
+		登记挂起的新实体
+		"""
+		if self._pending:
+			pending, self._pending = self._pending, {}
+			for entity in pending:
+				self.grid.insert(entity, self.position(entity))
+
+	def within(self, pos, radius, exclude=None):
+		"""
+		返回距离pos不超过radius的实体
+		"""
+		self.flush()
+		x, y = pos
+		radius_sq = radius * radius
+		area = pygame.Rect(math.floor(x - radius), math.floor(y - radius), 0, 0)
+		area.width = math.ceil(x + radius) - area.x + 1
+		area.height = math.ceil(y + radius) - area.y + 1
+		position = self.position
+		result = []
+		for entity in self.grid.query_rect(area):
+			if entity is exclude:
+				continue
+			ex, ey = position(entity)
+			if (ex - x) ** 2 + (ey - y) ** 2 <= radius_sq:
+				result.append(entity)
+		return result
+
+	def nearest(self, pos, max_distance=None, exclude=None):
+		"""
+		返回 (最近的实体, 距离)，没有时返回 (None, None)
+		"""
+		found = self.k_nearest(pos, 1, max_distance, exclude)
+		if found:
+			return found[0]
+		return None, None
+
+	def k_nearest(self, pos, k, max_distance=None, exclude=None):
+		"""
+		返回最近的k个实体 [(实体, 距离), ...]，按距离升序
+		从pos所在的格子开始一圈一圈向外查找，已找到k个且更外圈不可能更近时停止
+		"""
+		self.flush()
+		cells = self.grid.cells
+		if k <= 0 or not cells:
+			return []
+
+		size = self.grid.cell_size
+		x, y = pos
+		col, row = self.grid.cell_of(pos)
+		if max_distance is None:
+			# 最远只需要查到离得最远的已占用格子
+			last_ring = max(max(abs(c - col), abs(r - row)) for c, r in cells)
+			limit_sq = None
+		else:
+			last_ring = math.ceil(max_distance / size) + 1
+			limit_sq = max_distance * max_distance
+
+		position = self.position
+		found = []  # [(距离平方, 序号, 实体)]
+		for ring in range(last_ring + 1):
+			for c, r in self._ring_cells(col, row, ring):
+				bucket = cells.get((c, r))
+				if not bucket:
+					continue
+				for entity in bucket:
+					if entity is exclude:
+						continue
+					ex, ey = position(entity)
+					dist_sq = (ex - x) ** 2 + (ey - y) ** 2
+					if limit_sq is None or dist_sq <= limit_sq:
+						found.append((dist_sq, len(found), entity))
+			# 第ring圈之外的实体距离至少为 ring * size
+			if len(found) >= k:
+				found.sort()
+				if found[k - 1][0] <= (ring * size) ** 2:
+					break
+		found.sort()
+		return [(entity, math.sqrt(dist_sq)) for dist_sq, _, entity in found[:k]]
+
+	@staticmethod
+	def _ring_cells(col, row, ring):
+		"""
+		与(col, row)的切比雪夫距离恰好为ring的格子
+		"""
+		if ring == 0:
+			yield (col, row)
+			return
+		for c in range(col - ring, col + ring + 1):
+			yield (c, row - ring)
+			yield (c, row + ring)
+		for r in range(row - ring + 1, row + ring):
+			yield (col - ring, r)
+			yield (col + ring, r)
+
+class ProximityGroup(pygame.sprite.Group):
+	"""
+	带邻近索引的精灵组 - 精灵加入、移除时自动维护索引
+	会移动的精灵在移动后需要调用refresh_sprite
+	"""
+	def __init__(self, *sprites, cell_size=128):
+		self.index = ProximityIndex(cell_size)
+		super().__init__(*sprites)
+
+	def add_internal(self, sprite, layer=None):
+		super().add_internal(sprite, layer)
+		self.index.add(sprite)
+
+	def remove_internal(self, sprite):
+		super().remove_internal(sprite)
+		self.index.remove(sprite)
+
+	def refresh_sprite(self, sprite):
+		"""
+		精灵移动后更新索引
+		"""
+		if sprite in self.index:
+			self.index.update(sprite)
+
+	def within(self, pos, radius, exclude=None):
+		return self.index.within(pos, radius, exclude)
+
+	def nearest(self, pos, max_distance=None, exclude=None):
+		return self.index.nearest(pos, max_distance, exclude)
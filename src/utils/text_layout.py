@@ -0,0 +1,143 @@
+import weakref
+from .codepoint import classify, NARROW
+
+class TextLayout:
+	"""
+	文本排版器 - 按字体缓存每个字符的前进宽度，并提供单遍换行
+	每个字符在同一字体下只调用一次font.size，之后换行只做字典查找和加法，
+	换行结果直接带上每行的宽度，调用方不必再测量一遍
+	wrap：空格之后、全角字符和emoji前后都可以断开；连续的半角字符（英文单词、数字）
+	尽量保持在同一行，单词比整行还宽时才在字符之间断开；换行符强制分行
+	wrap_chars：逐字符贪心换行，放不下下一个字符就换行（TextRenderer一直使用的规则）
+	"""
+	def __init__(self):
+		self._advances = weakref.WeakKeyDictionary()  # font -> {char: 宽度}
+
+	def advances(self, font):
+		"""
+		获取字体的字符宽度表
+		"""
+		table = self._advances.get(font)
+		if table is None:
+			table = {}
+			self._advances[font] = table
+		return table
+
+	def advance(self, font, char):
+		"""
+		获取单个字符的宽度
+		"""
+		table = self.advances(font)
+		width = table.get(char)
+		if width is None:
+			width = self._measure(font, char)
+			table[char] = width
+		return width
+
+	def _measure(self, font, char):
+		try:
+			width = font.size(char)[0]
+		except Exception:
+			return 10
+		if width == 0 and ord(char) >= 0x1F000:
+			return 20  # emoji字体缺字时的默认宽度（与原TextRenderer的判断一致）
+		return width
+
+	def text_width(self, text, font):
+		"""
+		按字符宽度累加计算文本宽度
+		"""
+		table = self.advances(font)
+		width = 0
+		for char in text:
+			advance = table.get(char)
+			if advance is None:
+				advance = self.advance(font, char)
+			width += advance
+		return width
+
+	def wrap(self, text, max_width, font):
+		"""
+		把文本按max_width换行，返回 [(行文本, 行宽), ...]
+		换行符强制分行；每行去掉首尾空白，行宽为去掉空白后的宽度
+		"""
+		if not text:
+			return [("", 0)]
+
+		table = self.advances(font)
+		lines = []
+		for paragraph in text.split('\n'):
+			start = 0  # 当前行起点
+			width = 0  # 当前行宽度
+			cut = -1  # 最近的可断开位置
+			cut_width = 0  # 可断开位置之前的宽度
+			for i, char in enumerate(paragraph):
+				advance = table.get(char)
+				if advance is None:
+					advance = self.advance(font, char)
+				wide = classify(char) is not NARROW
+				if wide and i > start:
+					cut, cut_width = i, width  # 全角字符之前可以断开
+
+				# 断开后留到下一行的半角字符加上当前字符仍可能放不下，这时在当前字符之前再断开一次
+				while width + advance > max_width and i > start:
+					if cut <= start:
+						cut, cut_width = i, width  # 没有可断开位置，在字符之间断开
+					lines.append(self._line(paragraph, start, cut, cut_width, table))
+					start, width = cut, width - cut_width
+					cut = -1
+
+				width += advance
+				if wide or char == ' ':
+					cut, cut_width = i + 1, width  # 空格和全角字符之后可以断开
+			lines.append(self._line(paragraph, start, len(paragraph), width, table))
+		return lines
+
+	def wrap_chars(self, text, max_width, font):
+		"""
+		逐字符贪心换行，返回 [(行文本, 行宽), ...]
+		当前行放不下下一个字符时就换行，不保留单词完整，也不特殊处理换行符；每行去掉首尾空白
+		"""
+		if not text:
+			return [("", 0)]
+
+		table = self.advances(font)
+		lines = []
+		start = 0
+		width = 0
+		for i, char in enumerate(text):
+			advance = table.get(char)
+			if advance is None:
+				advance = self.advance(font, char)
+			if width + advance > max_width and i > start:
+				lines.append(self._line(text, start, i, width, table))
+				start, width = i, 0
+			width += advance
+		lines.append(self._line(text, start, len(text), width, table))
+		return lines
+
+	def _line(self, paragraph, start, end, width, table):
+		"""
+		截取一行并去掉首尾空白，同时从行宽中扣掉被去掉的字符
+		"""
+		line = paragraph[start:end]
+		stripped = line.strip()
+		if len(stripped) != len(line):
+			head = len(line) - len(line.lstrip())
+			for char in line[:head]:
+				width -= table.get(char, 0)
+			for char in line[head + len(stripped):]:
+				width -= table.get(char, 0)
+		return (stripped, width)
+
+# 全局排版器实例
+_text_layout = None
+
+def get_text_layout():
+	"""
+	获取文本排版器单例
+	"""
+	global _text_layout
+	if _text_layout is None:
+		_text_layout = TextLayout()
+	return _text_layout
@@ -0,0 +1,131 @@
+import math
+from ..settings import TILE_SIZE
+
+try:
+	import numpy as np
+	NUMPY_AVAILABLE = True
+except ImportError:
+	np = None
+	NUMPY_AVAILABLE = False
+
+class WaterField:
+	"""
+	水域距离场 - 关卡加载时为每个瓦片预先计算到最近水瓦片中心的距离和最近水瓦片的编号
+	钓鱼相关的"是否在水边"和"最近的水"查询先查表得到玩家所在瓦片的结果，
+	只有玩家位置在判定边界附近时才检查周围几个瓦片，结果与逐个比较所有水瓦片一致
+	"""
+	def __init__(self, water_tiles, size, tile_size=TILE_SIZE):
+		self.tile_size = tile_size
+		self.cols, self.rows = size
+		self.tiles = {}  # (col, row) -> 序号，距离相同时取先加入的水瓦片
+		for tile in water_tiles:
+			self.tiles.setdefault(tuple(tile), len(self.tiles))
+		self.water = list(self.tiles)  # 序号 -> (col, row)
+		self.slack = tile_size * math.sqrt(2) / 2  # 瓦片内任意一点到瓦片中心的最大距离
+		self.distance, self.nearest_index = self._build()
+
+	def _build(self):
+		"""
+		计算每个瓦片中心到最近水瓦片中心的距离（像素）和该水瓦片的序号
+		"""
+		distance = np.full((self.rows, self.cols), np.inf, dtype=np.float64)
+		nearest_index = np.full((self.rows, self.cols), -1, dtype=np.int32)
+		if not self.water:
+			return distance, nearest_index
+
+		size = self.tile_size
+		water = (np.array(self.water, dtype=np.float64) + 0.5) * size
+		xs = (np.arange(self.cols, dtype=np.float64) + 0.5) * size
+		dx_sq = (xs[:, None] - water[None, :, 0]) ** 2  # (cols, 水瓦片数)
+		for row in range(self.rows):
+			dist_sq = dx_sq + ((row + 0.5) * size - water[:, 1]) ** 2
+			index = dist_sq.argmin(axis=1)
+			nearest_index[row] = index
+			distance[row] = np.sqrt(dist_sq[np.arange(self.cols), index])
+		return distance, nearest_index
+
+	def tile_of(self, pos):
+		return (int(pos[0] // self.tile_size), int(pos[1] // self.tile_size))
+
+	def center_of(self, tile):
+		half = self.tile_size // 2
+		return (tile[0] * self.tile_size + half, tile[1] * self.tile_size + half)
+
+	def is_water_at(self, pos):
+		"""
+		坐标所在的瓦片是否为水
+		"""
+		return self.tile_of(pos) in self.tiles
+
+	def distance_at(self, pos):
+		"""
+		坐标所在瓦片的中心到最近水瓦片中心的距离，地图外返回None
+		"""
+		col, row = self.tile_of(pos)
+		if 0 <= col < self.cols and 0 <= row < self.rows:
+			return float(self.distance[row, col])
+		return None
+
+	def nearest_tile_at(self, pos):
+		"""
+		坐标所在瓦片的最近水瓦片，地图外或没有水时返回None
+		"""
+		col, row = self.tile_of(pos)
+		if 0 <= col < self.cols and 0 <= row < self.rows:
+			index = int(self.nearest_index[row, col])
+			if index >= 0:
+				return self.water[index]
+		return None
+
+	def near(self, pos, radius):
+		"""
+		是否有水瓦片中心距离pos不超过radius
+		"""
+		distance = self.distance_at(pos)
+		if distance is not None:
+			if distance - self.slack > radius:
+				return False
+			if distance + self.slack <= radius:
+				return True
+		return self._closest(pos, radius) is not None
+
+	def nearest(self, pos):
+		"""
+		距离pos最近的水瓦片中心，没有水时返回None
+		"""
+		if not self.water:
+			return None
+		candidate = self.nearest_tile_at(pos)
+		if candidate is None:
+			# 地图外：在所有水瓦片中查找
+			tile = min(self.water, key=lambda tile: self._dist_sq(pos, tile))
+			return self.center_of(tile)
+		# 真正最近的水瓦片不会比所在瓦片的最近水瓦片更远
+		radius = math.sqrt(self._dist_sq(pos, candidate)) + 1  # 多留1像素，避免浮点误差漏掉边界上的瓦片
+		return self.center_of(self._closest(pos, radius))
+
+	def _dist_sq(self, pos, tile):
+		x, y = self.center_of(tile)
+		return (x - pos[0]) ** 2 + (y - pos[1]) ** 2
+
+	def _closest(self, pos, radius):
+		"""
+		在pos周围radius范围内的瓦片中找最近的水瓦片
+		"""
+		size = self.tile_size
+		half = size / 2
+		col0 = math.floor((pos[0] - radius - half) / size)
+		col1 = math.ceil((pos[0] + radius - half) / size)
+		row0 = math.floor((pos[1] - radius - half) / size)
+		row1 = math.ceil((pos[1] + radius - half) / size)
+		radius_sq = radius * radius
+		best = None
+		for row in range(row0, row1 + 1):
+			for col in range(col0, col1 + 1):
+				order = self.tiles.get((col, row))
+				if order is None:
+					continue
+				dist_sq = self._dist_sq(pos, (col, row))
+				if dist_sq <= radius_sq and (best is None or (dist_sq, order) < best[:2]):
+					best = (dist_sq, order, (col, row))
+		return best[2] if best else None
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试全局动画时钟
+验证动画瓦片共享预渲染帧，由时钟统一推进，花朵保留各自的相位
+"""
+
+import pygame
+
+from src.rendering.animation import get_animation_clock
+from src.rendering.ascii_sprites import ASCIIWater, ASCIIWildFlower
+
+
+def test_water_tiles_share_clock_frames():
+    """测试水瓦片共享动画帧"""
+    pygame.init()
+    clock = get_animation_clock()
+    group = pygame.sprite.Group()
+    a = ASCIIWater((0, 0), group)
+    b = ASCIIWater((64, 0), group)
+    assert a.image is b.image
+
+    before = a.image
+    frame_index = a.track.frame_index
+    clock.update(a.animation_speed)
+    assert a.track.frame_index == frame_index + 1
+    assert a.image is b.image
+    assert a.image is not before
+    print("✅ 水瓦片共享动画帧")
+
+
+def test_flower_phase_offset():
+    """测试花朵相位偏移"""
+    pygame.init()
+    group = pygame.sprite.Group()
+    flower = ASCIIWildFlower((0, 0), group)
+    track = flower.track
+    assert flower.image is track.frames[(track.frame_index + flower.phase) % len(track.frames)]
+    print("✅ 花朵相位偏移正常")
+
+
+if __name__ == "__main__":
+    test_water_tiles_share_clock_frames()
+    test_flower_phase_offset()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试相机绘制顺序
+main层的静态装饰不烘焙，仍与玩家、猫咪按centery交错绘制
+"""
+
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+
+from src.settings import LAYERS, SCREEN_WIDTH, SCREEN_HEIGHT
+
+
+class Block(pygame.sprite.Sprite):
+    """纯色方块精灵"""
+    def __init__(self, groups, center, color, z, dynamic=False):
+        super().__init__(groups)
+        self.image = pygame.Surface((64, 64))
+        self.image.fill(color)
+        self.rect = self.image.get_rect(center=center)
+        self.z = z
+        self.dynamic = dynamic
+        self.bakeable = True
+
+
+def test_decoration_south_of_player_is_drawn_on_top():
+    """测试玩家北边的装饰被玩家遮挡，南边的装饰遮挡玩家"""
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    from src.core.level import CameraGroup
+
+    camera = CameraGroup()
+    assert LAYERS['main'] not in camera.BAKED_LAYERS
+
+    player = Block([camera], (1000, 1000), (255, 0, 0), LAYERS['main'], dynamic=True)
+    Block([camera], (1000, 1032), (0, 255, 0), LAYERS['main'])  # 南边的灌木
+    Block([camera], (1064, 968), (0, 0, 255), LAYERS['main'])  # 东北边的石头
+    camera.bake_static()
+    camera.custom_draw(player)
+
+    center = pygame.math.Vector2(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+    # 玩家与南边灌木重叠的部分显示灌木
+    assert screen.get_at((int(center.x), int(center.y) + 16))[:3] == (0, 255, 0)
+    # 玩家与东北边石头重叠的部分显示玩家
+    assert screen.get_at((int(center.x) + 16, int(center.y) - 16))[:3] == (255, 0, 0)
+    assert camera.chunk_baker.bake_count == 0  # main层的精灵没有被烘焙
+    print("✅ main层装饰按centery与玩家交错绘制")
+
+
+if __name__ == "__main__":
+    test_decoration_south_of_player_is_drawn_on_top()
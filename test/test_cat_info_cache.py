@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试猫咪信息界面的保留模式渲染
+验证滚动只移动取景位置，状态版本变化时才重新渲染面板内容
+"""
+
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+
+from src.ui.cat_info_ui import CatInfoUI
+
+
+class DummyCat:
+    """只包含信息界面需要的属性"""
+    def __init__(self):
+        self.npc_id = 'cat_小白'
+        self.cat_name = '小白'
+        self.cat_personality = '好奇心旺盛，喜欢在河边看鱼。'
+        self.ascii_char = '🐱'
+        self.char_color = (255, 200, 100)
+        self.info_version = 0
+        self.conversations = []
+
+    def get_cat_conversation_history(self):
+        return self.conversations
+
+
+class DummyChatAI:
+    """按NPC保存对话历史，并提供版本号"""
+    def __init__(self):
+        self.history = []
+        self.version = 0
+
+    def add(self, speaker, message, index):
+        self.history.append({'speaker': speaker, 'message': message,
+                             'timestamp': f'2025-01-01T12:{index // 60:02d}:{index % 60:02d}'})
+        self.version += 1
+
+    def get_history_version(self, npc_id):
+        return self.version
+
+    def _get_recent_conversation_context(self, npc_id, num_turns=3):
+        return self.history[-num_turns * 2:]
+
+
+def make_ui():
+    pygame.init()
+    cat = DummyCat()
+    chat_ai = DummyChatAI()
+    for i in range(20):
+        chat_ai.add('玩家' if i % 2 == 0 else '小白', '今天天气真好，我们一起去钓鱼吧！' * 3, i)
+    ui = CatInfoUI(1280, 720)
+    ui.show_cat_info(cat, chat_ai)
+    ui.current_tab = 'history'
+    return ui, cat, chat_ai
+
+
+def test_scroll_reuses_dialogue_surface():
+    """测试滚动不会重新渲染对话内容"""
+    ui, cat, chat_ai = make_ui()
+    screen = pygame.Surface((1280, 720))
+    ui.render(screen)
+    dialogue_surface = ui.dialogue_surface
+    assert ui.max_scroll_offset > 0
+
+    panel = ui.panel_surface
+    ui.render(screen)
+    assert ui.panel_surface is panel  # 没有任何变化时直接复用合成好的面板
+
+    ui.scroll_offset = 30
+    ui.render(screen)
+    assert ui.dialogue_surface is dialogue_surface
+    assert ui.panel_surface is not panel
+    print("✅ 滚动只移动取景位置")
+
+
+def test_versions_invalidate_cache():
+    """测试对话历史、照护状态和标签页变化时重新渲染"""
+    ui, cat, chat_ai = make_ui()
+    screen = pygame.Surface((1280, 720))
+    ui.render(screen)
+    surface = ui.dialogue_surface
+
+    chat_ai.add('小白', '喵～', 99)
+    ui.render(screen)
+    assert ui.dialogue_surface is not surface
+    surface = ui.dialogue_surface
+
+    cat.info_version += 1
+    ui.render(screen)
+    assert ui.dialogue_surface is not surface
+    surface = ui.dialogue_surface
+
+    ui.current_tab = 'recent'
+    ui.render(screen)
+    assert ui.dialogue_surface is not surface
+    print("✅ 状态版本变化时重新渲染")
+
+
+def test_text_helpers_keep_original_wrapping():
+    """测试文本辅助方法的换行规则：TextRenderer逐字符换行，多行文本辅助方法按单词换行"""
+    ui, _, _ = make_ui()
+    font = ui.normal_font
+    surface = pygame.Surface((400, 200), pygame.SRCALPHA)
+    assert ui._render_multiline_text(surface, "", (0, 0), 300, font, (255, 255, 255)) == 0
+    assert ui._render_multiline_text_improved(surface, "", (0, 0), 300, font, (255, 255, 255)) == 0
+
+    lines = ui._wrap_text_to_lines("hello wonderful world", font.size("hello wonderful")[0], font)
+    assert lines == ["hello wonderful", "world"]
+
+    # TextRenderer在放不下下一个字符时就换行，不保留单词完整
+    text = "hello wonderful world"
+    max_width = sum(ui.text_renderer.calculate_char_width(char, font) for char in "hello wonderful w")
+    lines = ui.text_renderer.wrap_text_advanced(text, max_width, font)
+    assert lines[0].startswith("hello wonderful w")
+    assert "".join(lines).replace(" ", "") == text.replace(" ", "")
+    print("✅ 文本辅助方法保持原有换行规则")
+
+
+def test_background_uses_wrapped_widths():
+    """背景宽度直接取换行结果里的行宽
+    行宽是逐字符宽度之和，忽略了字距调整，所以可能比font.size略宽，但不会更窄，文字不会超出背景"""
+    ui, _, _ = make_ui()
+    font = ui.normal_font
+    renderer = ui.text_renderer
+    for text in ["AVAVA", "Hi there, 小白", "今天天气真好，我们一起去钓鱼吧！"]:
+        summed = sum(renderer.calculate_char_width(char, font) for char in text)
+        assert summed >= font.size(text)[0]
+    assert sum(renderer.calculate_char_width(char, font) for char in "AVAVA") > font.size("AVAVA")[0]
+
+    surface = pygame.Surface((400, 200), pygame.SRCALPHA)
+    text = "AVAVA 今天天气真好，我们一起去钓鱼吧！"
+    padding = 5
+    wrapped = renderer.wrap_lines(text, 200 - 2 * padding, font)
+    _, _, bg_width, _ = renderer.render_text_with_background(
+        surface, text, font, (255, 255, 255), (0, 0, 0), (0, 0), 200, padding)
+    assert bg_width == max(width for _, width in wrapped) + 2 * padding
+    assert all(font.size(line)[0] <= width for line, width in wrapped)
+    print("✅ 背景宽度复用换行时的行宽")
+
+
+if __name__ == "__main__":
+    test_scroll_reuses_dialogue_surface()
+    test_versions_invalidate_cache()
+    test_text_helpers_keep_original_wrapping()
+    test_background_uses_wrapped_widths()
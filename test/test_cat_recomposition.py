@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试猫咪图像的脏标记重新合成
+验证显示状态不变时不重绘图像，头顶emoji变化时重绘
+"""
+
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+
+from src.settings import SCREEN_WIDTH, SCREEN_HEIGHT
+from src.ai.cat_npc import CatNPC
+
+
+def test_recompose_only_on_change():
+    """测试只在显示状态变化时重新合成"""
+    pygame.init()
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    from src.core.level import Level
+    level = Level()
+    manager = level.cat_manager
+    cats = [manager._create_single_cat(level.player.rect.center, i) for i in range(5)]
+    cats = [cat for cat in cats if cat]
+    assert cats
+
+    for cat in cats:
+        cat.head_emoji_system['emoji_display_chance'] = 0  # 不随机弹出头顶emoji
+        cat._update_ascii_display()
+    before = CatNPC.recomposition_count
+    for _ in range(30):
+        for cat in cats:
+            cat._update_ascii_display()
+    assert CatNPC.recomposition_count == before
+
+    cats[0]._set_head_emoji('😸', 2.0)
+    cats[0]._update_ascii_display()
+    assert CatNPC.recomposition_count == before + 1
+
+    manager.update(1.0)
+    assert manager.get_cat_statistics()["recompositions_per_second"] >= 1
+    print("✅ 猫咪图像只在变化时重新合成")
+
+
+if __name__ == "__main__":
+    test_recompose_only_on_change()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试聊天面板的布局缓存
+验证行号累加、思考消息替换、超量丢弃以及只渲染可见窗口
+"""
+
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+
+from src.ui.chat_panel import ChatPanel
+
+
+def make_panel():
+    pygame.init()
+    panel = ChatPanel(1280, 720)
+    panel.is_active = True
+    return panel
+
+
+def expected_total_lines(panel):
+    """逐条重新换行得到的总行数"""
+    max_width = panel.panel_width - 2 * panel.input_margin
+    return sum(len(panel._wrap_text(f"[{m['sender']}] {m['text']}", max_width)) + 1 for m in panel.messages)
+
+
+def test_running_line_count():
+    """测试总行数和每条消息的起始行号"""
+    panel = make_panel()
+    for i in range(200):
+        panel.add_system_message(f"第{i}条消息" + "，很长的内容" * (i % 7))
+    assert panel.total_lines == expected_total_lines(panel)
+    starts = [panel.line_base + sum(len(layout) for layout in panel.message_layouts[:i])
+              for i in range(len(panel.message_layouts))]
+    assert panel.line_starts == starts
+
+    # 思考消息替换为多行回复后，后续消息的行号随之平移
+    panel.add_thinking_message("小白")
+    panel.add_system_message("之后的消息")
+    panel.replace_thinking_with_response("小白", "喵～" * 80)
+    assert panel.messages[-2]['type'] == 'message'
+    assert panel.total_lines == expected_total_lines(panel)
+    assert panel.line_starts[-1] == panel.line_base + panel.total_lines - len(panel.message_layouts[-1])
+    print("✅ 行数累加与消息替换正常")
+
+
+def test_drop_oldest_messages():
+    """测试超过上限时成批丢弃最早的消息，消息数不超过上限"""
+    panel = make_panel()
+    panel.max_messages = 100
+    panel.trim_batch = 10
+    for i in range(250):
+        panel.add_system_message(f"消息{i}")
+        assert len(panel.messages) <= 100
+    assert 90 <= len(panel.messages) <= 100
+    # 留下的是最新的一段连续消息
+    assert [m['text'] for m in panel.messages] == [f"消息{i}" for i in range(250 - len(panel.messages), 250)]
+    assert panel.total_lines == expected_total_lines(panel)
+    assert panel.line_starts[0] == panel.line_base
+    print("✅ 超量消息丢弃正常")
+
+
+def test_render_only_visible_window():
+    """测试渲染只处理可见窗口，且与滚动位置对应"""
+    panel = make_panel()
+    for i in range(3000):
+        panel.add_system_message(f"消息{i}")
+    surface = pygame.Surface((panel.panel_width, panel.panel_height), pygame.SRCALPHA)
+    panel._render_messages(surface)
+    visible_lines = panel.message_area_height // panel.line_height
+    assert panel.scroll_offset == panel.total_lines - visible_lines
+    assert len(panel.rendered_layouts) <= visible_lines
+
+    # 滚动到顶部后渲染的是最早的消息，行表面缓存有上限
+    for _ in range(100):
+        panel.scroll_to_top()
+        panel._render_messages(surface)
+        panel.force_scroll_to_bottom()
+        panel._render_messages(surface)
+    assert panel.message_layouts[0].surfaces is not None
+    assert len(panel.rendered_layouts) <= panel.max_rendered_layouts
+    print("✅ 只渲染可见窗口")
+
+
+if __name__ == "__main__":
+    test_running_line_count()
+    test_drop_oldest_messages()
+    test_render_only_visible_window()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试码点分类表
+验证分类结果与原ASCIIRenderer._is_emoji的区间判断、east_asian_width的全角判断一致
+"""
+
+import unicodedata
+
+from src.utils import codepoint
+from src.utils.codepoint import classify, is_emoji, is_wide, EMOJI, WIDE, NARROW
+
+
+def reference_is_emoji(char):
+    """原ASCIIRenderer._is_emoji的实现"""
+    if len(char) == 0:
+        return False
+    code_point = ord(char[0])
+    emoji_ranges = [
+        (0x1F600, 0x1F64F), (0x1F300, 0x1F5FF), (0x1F680, 0x1F6FF), (0x1F1E0, 0x1F1FF),
+        (0x2600, 0x26FF), (0x2700, 0x27BF), (0xFE00, 0xFE0F), (0x1F900, 0x1F9FF),
+    ]
+    return any(start <= code_point <= end for start, end in emoji_ranges)
+
+
+def test_matches_reference():
+    """测试BMP和SMP上的分类与原实现一致"""
+    for code_point in list(range(0, 0x30000, 7)) + [0x2600, 0x27BF, 0xFE0F, 0x1F1E0, 0x1F9FF, 0x1FA00]:
+        char = chr(code_point)
+        assert is_emoji(char) == reference_is_emoji(char), hex(code_point)
+        if not is_emoji(char):
+            assert is_wide(char) == (unicodedata.east_asian_width(char) in ('F', 'W')), hex(code_point)
+    print("✅ 分类结果与原实现一致")
+
+
+def test_common_characters():
+    """测试游戏中常见的字符"""
+    assert classify('🐱') is EMOJI
+    assert classify('🐱‍👤') is EMOJI  # 按首个码点分类
+    assert classify('☀') is EMOJI
+    assert classify('猫') is WIDE
+    assert classify('，') is WIDE
+    assert classify('@') is NARROW
+    assert classify('') is NARROW
+    print("✅ 常见字符分类正确")
+
+
+def test_results_are_memoized():
+    """测试每个码点只查一次表"""
+    classify('鱼')
+    assert codepoint._classes[ord('鱼')] is WIDE
+    print("✅ 分类结果已缓存")
+
+
+if __name__ == "__main__":
+    test_matches_reference()
+    test_common_characters()
+    test_results_are_memoized()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试碰撞占用网格：候选集与遍历整个组的结果一致，并随精灵加入/移除更新
+"""
+
+import os
+import sys
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import pygame
+
+from src.settings import TILE_SIZE
+from src.core.collision_grid import CollisionGroup, nearby_sprites
+
+
+class Obstacle(pygame.sprite.Sprite):
+    """测试用碰撞体"""
+
+    def __init__(self, rect, groups, hitbox=True):
+        super().__init__(groups)
+        self.rect = pygame.Rect(rect)
+        if hitbox:
+            self.hitbox = self.rect.inflate(-self.rect.width * 0.2, -self.rect.height * 0.75)
+
+
+def brute_force(group, rect):
+    """遍历整个组的碰撞结果"""
+    hits = []
+    for sprite in group.sprites():
+        box = sprite.hitbox if hasattr(sprite, 'hitbox') else sprite.rect
+        if box.colliderect(rect):
+            hits.append(sprite)
+    return hits
+
+
+def grid_hits(group, rect):
+    """通过网格候选集得到的碰撞结果"""
+    hits = []
+    for sprite in group.query(rect):
+        box = sprite.hitbox if hasattr(sprite, 'hitbox') else sprite.rect
+        if box.colliderect(rect):
+            hits.append(sprite)
+    return hits
+
+
+def test_query_matches_brute_force():
+    """随机障碍物和查询矩形下，结果和顺序都与遍历一致"""
+    rng = random.Random(7)
+    group = CollisionGroup()
+    for _ in range(300):
+        x = rng.randrange(0, 40) * TILE_SIZE
+        y = rng.randrange(0, 40) * TILE_SIZE
+        Obstacle((x, y, TILE_SIZE, TILE_SIZE), [group], hitbox=rng.random() < 0.8)
+
+    for _ in range(500):
+        rect = pygame.Rect(rng.randrange(-64, 2600), rng.randrange(-64, 2600),
+                           rng.randrange(1, 150), rng.randrange(1, 150))
+        assert grid_hits(group, rect) == brute_force(group, rect)
+        # 放置检查使用rect
+        expected = [s for s in group.sprites() if s.rect.colliderect(rect)]
+        assert [s for s in group.query(rect) if s.rect.colliderect(rect)] == expected
+    print("✅ 网格查询与遍历结果一致")
+
+
+def test_grid_tracks_membership():
+    """砍树、收获后碰撞体从网格中移除，新种植的作物加入网格"""
+    group = CollisionGroup()
+    tree = Obstacle((128, 128, 64, 64), [group])
+    probe = pygame.Rect(130, 150, 20, 20)
+    assert tree in group.query(probe)
+
+    tree.kill()
+    assert group.query(probe) == []
+    assert not group.grid.cells
+
+    plant = Obstacle((128, 128, 64, 64), [group])
+    assert group.query(probe) == [plant]
+    group.empty()
+    assert group.query(probe) == []
+    print("✅ 网格随精灵加入和移除更新")
+
+
+def test_plain_group_fallback():
+    """普通精灵组没有网格时退回遍历"""
+    group = pygame.sprite.Group()
+    obstacle = Obstacle((0, 0, 64, 64), [group])
+    assert nearby_sprites(group, pygame.Rect(500, 500, 10, 10)) == [obstacle]
+    print("✅ 普通精灵组退回遍历")
+
+
+if __name__ == "__main__":
+    test_query_matches_brute_force()
+    test_grid_tracks_membership()
+    test_plain_group_fallback()
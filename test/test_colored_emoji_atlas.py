@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试着色emoji图集
+验证同色同字号的emoji共享表面，引用计数归零后淘汰
+"""
+
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+
+from src.utils.emoji_colorizer import ColoredEmojiAtlas
+
+
+def test_shared_and_evicted():
+    """测试共享与淘汰"""
+    pygame.init()
+    atlas = ColoredEmojiAtlas()
+    orange_a = atlas.acquire('🐱', (255, 165, 0), 16)
+    orange_b = atlas.acquire('🐱', (255, 165, 0), 16)
+    grey = atlas.acquire('🐱', (128, 128, 128), 16)
+    assert orange_a is orange_b
+    assert grey is not orange_a
+    assert len(atlas) == 2
+
+    # 一只橙猫离开后表面仍被另一只使用
+    atlas.release('🐱', (255, 165, 0), 16)
+    assert len(atlas) == 2
+    atlas.release('🐱', (255, 165, 0), 16)
+    assert len(atlas) == 1
+    # 重复释放不会出错
+    atlas.release('🐱', (255, 165, 0), 16)
+    print("✅ 着色emoji共享与淘汰正常")
+
+
+if __name__ == "__main__":
+    test_shared_and_evicted()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试脏矩形呈现模式
+验证整屏回退、界面区域在下一帧被擦除、面板关闭后整屏提交
+"""
+
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+
+from src.settings import SCREEN_WIDTH, SCREEN_HEIGHT
+from src.rendering.dirty_rects import DirtyRectTracker, get_dirty_rects
+
+
+def record_presents(monkeypatch):
+    calls = []
+    monkeypatch.setattr(pygame.display, 'flip', lambda: calls.append('flip'))
+    monkeypatch.setattr(pygame.display, 'update', lambda rects: calls.append([tuple(rect) for rect in rects]))
+    return calls
+
+
+def test_disabled_always_flips(monkeypatch):
+    """测试未开启时等同于flip"""
+    calls = record_presents(monkeypatch)
+    tracker = DirtyRectTracker(enabled=False)
+    tracker.add((0, 0, 10, 10))
+    tracker.present()
+    tracker.present()
+    assert calls == ['flip', 'flip']
+    print("✅ 未开启时整屏提交")
+
+
+def test_dirty_rects_and_invalidate(monkeypatch):
+    """测试只提交变化区域，invalidate时退回整屏"""
+    calls = record_presents(monkeypatch)
+    tracker = DirtyRectTracker(enabled=True)
+    tracker.present()  # 第一帧整屏
+
+    tracker.add((10, 10, 20, 20))
+    tracker.add_ui((100, 100, 50, 20))
+    tracker.present()
+    # 界面收起后，上一帧的界面区域仍要提交一次
+    tracker.present()
+
+    tracker.add((10, 10, 20, 20))
+    tracker.invalidate()
+    tracker.present()
+
+    assert calls == [
+        'flip',
+        [(10, 10, 20, 20), (100, 100, 50, 20)],
+        [(100, 100, 50, 20)],
+        'flip',
+    ]
+    print("✅ 脏矩形提交正常")
+
+
+def test_full_present_after_panel_closes(monkeypatch):
+    """测试面板打开期间和关闭后的第一帧整屏提交"""
+    calls = record_presents(monkeypatch)
+    tracker = DirtyRectTracker(enabled=True)
+    tracker.present()
+
+    tracker.set_panel_open(True)
+    tracker.present()
+    tracker.set_panel_open(False)  # 面板刚关闭，面板的像素还在屏幕上
+    tracker.present()
+    tracker.add((10, 10, 20, 20))
+    tracker.set_panel_open(False)
+    tracker.present()
+
+    assert calls == ['flip', 'flip', 'flip', [(10, 10, 20, 20)]]
+    print("✅ 面板关闭后整屏提交")
+
+
+def test_level_presents_whole_screen_when_shop_closes(monkeypatch):
+    """测试关卡中打开、关闭商店后整屏提交"""
+    pygame.init()
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    from src.core.level import Level
+
+    level = Level()
+    tracker = get_dirty_rects()
+    monkeypatch.setattr(tracker, 'enabled', True)
+    calls = record_presents(monkeypatch)
+
+    def frame():
+        level.run(1 / 60)
+        tracker.present()
+        return calls[-1] if calls else None
+
+    frame()
+    assert frame() != 'flip'  # 相机静止、没有面板时只提交变化区域
+
+    level.toggle_shop()
+    assert frame() == 'flip'
+    level.toggle_shop()
+    assert frame() == 'flip'  # 商店刚关闭，整屏提交擦掉商店界面
+    assert frame() != 'flip'
+    print("✅ 关卡关闭面板后整屏提交")
+
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-q"])
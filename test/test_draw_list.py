@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试分层绘制列表
+验证绘制顺序与原先"按层 + 按centery排序"的结果一致
+"""
+
+import random
+import pygame
+
+from src.settings import LAYERS
+from src.rendering.draw_list import LayeredDrawList
+from src.rendering.chunk_baker import ChunkBaker
+
+
+class DummySprite(pygame.sprite.Sprite):
+    def __init__(self, z, y, dynamic=False):
+        super().__init__()
+        self.z = z
+        self.rect = pygame.Rect(0, y, 64, 64)
+        self.dynamic = dynamic
+
+
+def reference_order(sprites):
+    """原CameraGroup.custom_draw的绘制顺序"""
+    ordered = []
+    for layer in LAYERS.values():
+        for sprite in sorted(sprites, key=lambda sprite: sprite.rect.centery):
+            if sprite.z == layer:
+                ordered.append(sprite)
+    return ordered
+
+
+def test_draw_order_matches_reference():
+    """测试绘制顺序"""
+    random.seed(1)
+    draw_list = LayeredDrawList()
+    sprites = []
+    for i in range(300):
+        sprite = DummySprite(random.choice(list(LAYERS.values())), random.randint(0, 2000), dynamic=(i % 10 == 0))
+        sprites.append(sprite)
+        draw_list.add(sprite)
+
+    assert list(draw_list) == reference_order(sprites)
+
+    # 移动动态精灵后顺序仍然正确
+    for sprite in sprites:
+        if sprite.dynamic:
+            sprite.rect.y = random.randint(0, 2000)
+    assert list(draw_list) == reference_order(sprites)
+    print("✅ 绘制顺序与原实现一致")
+
+
+def test_remove_and_change_layer():
+    """测试移除精灵和切换层级"""
+    draw_list = LayeredDrawList()
+    plant = DummySprite(LAYERS['ground plant'], 100)
+    tree = DummySprite(LAYERS['main'], 200)
+    draw_list.add(plant)
+    draw_list.add(tree)
+    draw_list.flush()
+
+    # 植物长大后进入main层
+    plant.z = LAYERS['main']
+    plant.rect.y = 300
+    draw_list.refresh(plant)
+    assert draw_list.static_sprites(LAYERS['main']) == [tree, plant]
+    assert draw_list.static_sprites(LAYERS['ground plant']) == []
+
+    draw_list.remove(tree)
+    assert list(draw_list) == [plant]
+    assert len(draw_list) == 1
+
+    # 尚未归桶就被移除的精灵不会出现
+    particle = DummySprite(LAYERS['main'], 50)
+    draw_list.add(particle)
+    draw_list.remove(particle)
+    assert list(draw_list) == [plant]
+    print("✅ 移除与层级切换正常")
+
+
+def test_visible_sprites_culled_by_view():
+    """测试视口裁剪：只返回与相机范围重叠的精灵，且顺序不变"""
+    random.seed(2)
+    draw_list = LayeredDrawList()
+    sprites = []
+    for i in range(500):
+        sprite = DummySprite(random.choice(list(LAYERS.values())), random.randint(0, 3000), dynamic=(i % 7 == 0))
+        sprite.rect.x = random.randint(0, 3000)
+        sprites.append(sprite)
+        draw_list.add(sprite)
+
+    view = pygame.Rect(900, 1100, 1280, 720)
+    expected = [sprite for sprite in reference_order(sprites) if sprite.rect.colliderect(view)]
+    visible = list(draw_list.iter_visible(view))
+    assert [sprite for sprite in visible if sprite.rect.colliderect(view)] == expected
+    # 候选集只多出边距范围内的少量精灵
+    assert len(visible) < len(sprites) // 2
+
+    # 动态精灵移动到视口内后能被找到
+    mover = next(sprite for sprite in sprites if sprite.dynamic)
+    mover.rect.center = view.center
+    assert mover in list(draw_list.iter_visible(view))
+    print("✅ 视口裁剪正常")
+
+
+def test_static_sprites_baked_into_chunks():
+    """测试静态瓦片烘焙进区块，且只在变化时重新烘焙"""
+    pygame.init()
+    baker = ChunkBaker([LAYERS['ground']], chunk_tiles=4)
+    draw_list = LayeredDrawList(baker)
+    tiles = []
+    for x in range(8):
+        tile = DummySprite(LAYERS['ground'], 0)
+        tile.rect.x = x * 64
+        tile.image = pygame.Surface((64, 64), pygame.SRCALPHA)
+        tile.bakeable = True
+        tiles.append(tile)
+        draw_list.add(tile)
+    player = DummySprite(LAYERS['main'], 0, dynamic=True)
+    draw_list.add(player)
+
+    draw_list.flush()
+    baker.bake_dirty()
+    assert baker.bake_count == 2  # 8个瓦片分属两个区块
+    assert list(draw_list) == [player]  # 烘焙的瓦片不再逐个绘制
+    view = pygame.Rect(0, 0, 200, 200)
+    assert len(baker.visible_chunks(LAYERS['ground'], view)) == 1
+
+    # 移除一个瓦片只重新烘焙它所在的区块
+    draw_list.remove(tiles[0])
+    baker.bake_dirty()
+    assert baker.bake_count == 3
+    print("✅ 区块烘焙正常")
+
+
+if __name__ == "__main__":
+    test_draw_order_matches_reference()
+    test_remove_and_change_layer()
+    test_visible_sprites_culled_by_view()
+    test_static_sprites_baked_into_chunks()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试事件通知卡片的预渲染、dt计时和表面复用
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import pygame
+
+pygame.init()
+pygame.display.set_mode((1, 1))
+
+from src.ui.event_notification import EventNotification, EventNotificationManager
+
+
+def test_card_baked_once():
+    """卡片在创建时烘焙，渲染时只改变整体透明度"""
+    notification = EventNotification("小橘在树下睡着了", 5.0, "event")
+    card = notification.card
+    assert card.get_size() == (notification.width, notification.height)
+
+    screen = pygame.Surface((800, 600), pygame.SRCALPHA)
+    for _ in range(10):
+        notification.update(0.1, 50)
+        notification.render(screen, 10)
+    assert notification.card is card
+    assert card.get_alpha() == int(notification.alpha)
+    print("✅ 卡片只烘焙一次")
+
+
+def test_timing_uses_dt():
+    """计时由帧dt驱动，不读取系统时间"""
+    notification = EventNotification("测试", 2.0, "warning")
+    assert notification.update(1.5, 50)
+    assert notification.elapsed == 1.5
+    assert not notification.update(1.0, 50)
+    assert not notification.is_active
+    print("✅ 通知计时由dt驱动")
+
+
+def test_manager_pools_cards():
+    """过期和被挤掉的通知会把卡片表面还给对象池"""
+    manager = EventNotificationManager()
+    for i in range(manager.max_notifications + 3):
+        manager.add_notification(f"事件{i}", 1.0)
+    assert len(manager.notifications) == manager.max_notifications
+    assert len(manager.card_pool) == 0  # 被挤掉的卡片已被新通知复用
+
+    cards = {id(n.card) for n in manager.notifications}
+    manager.update(2.0)
+    assert not manager.has_notifications()
+    assert {id(card) for card in manager.card_pool} == cards
+
+    manager.add_notification("新事件", 1.0)
+    assert id(manager.notifications[0].card) in cards
+    print("✅ 卡片表面被复用")
+
+
+def test_duplicate_messages_each_get_a_card():
+    """相同的通知照常各占一张卡片，各自计时"""
+    manager = EventNotificationManager()
+    manager.add_notification("小橘心情变好了", 3.0)
+    manager.update(2.0)
+    manager.add_notification("小橘心情变好了", 3.0)
+    assert len(manager.notifications) == 2
+    assert manager.notifications[0].card is not manager.notifications[1].card
+    manager.update(1.5)
+    assert len(manager.notifications) == 1
+    print("✅ 重复通知各自显示")
+
+
+if __name__ == "__main__":
+    test_card_baked_once()
+    test_timing_uses_dt()
+    test_manager_pools_cards()
+    test_duplicate_messages_each_get_a_card()
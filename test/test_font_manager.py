@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试字体管理器
+验证同一字体文件同一字号只加载一次，font_key只是别名；主菜单逐帧预加载可用
+"""
+
+import os
+import threading
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+
+from src.utils.font_manager import FontManager
+
+
+def test_font_key_is_alias():
+    """测试不同font_key共享同一个字体对象"""
+    pygame.init()
+    font_manager = FontManager.get_instance()
+    chat_font = font_manager.load_chinese_font(17, "test_chat_message_font")
+    log_font = font_manager.load_chinese_font(17, "test_log_text_font")
+    assert chat_font is log_font
+    assert font_manager.get_font("test_log_text_font") is chat_font
+    # 不同字号是不同的字体
+    assert font_manager.load_chinese_font(19, "test_chat_message_font_big") is not chat_font
+    print("✅ font_key别名共享字体")
+
+
+def test_warm_up_loads_on_main_thread_step_by_step():
+    """测试逐帧预加载：每步只加载几个字体，不使用后台线程"""
+    pygame.init()
+    font_manager = FontManager.get_instance()
+    font_manager._warm_up_started = False
+    font_manager.start_warm_up(chinese_sizes=(21, 22, 23), emoji_sizes=(21,))
+    threads = threading.active_count()
+    assert font_manager.warm_up_step(max_fonts=2) is True
+    assert font_manager.warm_up_step(max_fonts=2) is False
+    assert threading.active_count() == threads
+    sizes = [size for _, size in font_manager.load_times]
+    assert {21, 22, 23} <= set(sizes)
+    # 预加载后按任意键名获取都直接命中
+    loaded = len(font_manager.load_times)
+    font_manager.load_chinese_font(21, "test_warm_font")
+    assert len(font_manager.load_times) == loaded
+    print("✅ 后台预加载正常")
+
+
+if __name__ == "__main__":
+    test_font_key_is_alias()
+    test_warm_up_loads_on_main_thread_step_by_step()
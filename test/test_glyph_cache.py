@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试全局字形缓存
+验证命中/未命中计数、LRU淘汰、图集子表面与直接渲染的像素一致，
+以及字体标识和图集空间回收
+"""
+
+import pygame
+
+from src.rendering.glyph_cache import GlyphCache
+from src.utils.font_manager import get_font_manager
+
+
+def test_hits_and_lru_eviction():
+    """测试命中计数与LRU淘汰"""
+    pygame.init()
+    font = pygame.font.Font(None, 24)
+    cache = GlyphCache(max_entries=2, atlas_size=None)
+
+    a = cache.render(font, 'a', (255, 0, 0))
+    assert cache.render(font, 'a', (255, 0, 0)) is a
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # 颜色不同是不同的字形
+    cache.render(font, 'a', (0, 255, 0))
+    # 访问a后再加入新字形，淘汰的是最久未用的绿色a
+    cache.render(font, 'a', (255, 0, 0))
+    cache.render(font, 'b', (255, 0, 0))
+    assert len(cache) == 2
+    assert cache.evictions == 1
+    assert cache.render(font, 'a', (255, 0, 0)) is a
+    print("✅ 命中计数与LRU淘汰正常")
+
+
+def test_atlas_glyph_matches_direct_render():
+    """测试图集中的字形与直接渲染一致"""
+    pygame.init()
+    font = pygame.font.Font(None, 32)
+    cache = GlyphCache(atlas_size=(128, 128))
+
+    for char in 'T~#@':
+        direct = font.render(char, True, (30, 200, 90))
+        glyph = cache.render(font, char, (30, 200, 90))
+        assert glyph.get_parent() is cache.atlas.surface
+        assert glyph.get_size() == direct.get_size()
+        for x in range(direct.get_width()):
+            for y in range(direct.get_height()):
+                assert glyph.get_at((x, y)) == direct.get_at((x, y))
+    print("✅ 图集字形与直接渲染一致")
+
+
+def test_cache_key_uses_stable_font_identity():
+    """测试缓存键：管理器的同一字体别名共享字形，其他字体各自缓存且不会被回收"""
+    pygame.init()
+    font_manager = get_font_manager()
+    cache = GlyphCache(atlas_size=None)
+
+    glyph = cache.render(font_manager.load_chinese_font(20, "glyph_test_a"), 'a', (255, 255, 255))
+    assert cache.render(font_manager.load_chinese_font(20, "glyph_test_b"), 'a', (255, 255, 255)) is glyph
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # 不经过管理器的字体以对象本身为键：缓存持有字体，id不会被新字体复用
+    cache.render(pygame.font.Font(None, 24), 'a', (255, 255, 255))
+    cache.render(pygame.font.Font(None, 24), 'a', (255, 255, 255))
+    assert cache.misses == 3
+    assert all(isinstance(key[0], (tuple, pygame.font.Font)) for key in cache._glyphs)
+    print("✅ 字体标识稳定")
+
+
+def test_atlas_space_reclaimed_after_eviction():
+    """测试图集装满后重新打包，已返回的字形像素不受影响"""
+    pygame.init()
+    font = pygame.font.Font(None, 32)
+    cache = GlyphCache(max_entries=8, atlas_size=(96, 64))
+    color = (255, 255, 0)
+
+    first = cache.render(font, 'A', color)
+    expected = pygame.image.tostring(first, "RGBA")
+    for char in 'BCDEFGHIJKLMNOPQRSTUVWXYZ':
+        glyph = cache.render(font, char, color)
+        # 淘汰旧字形后总能腾出图集空间，新字形仍来自图集
+        assert cache.atlas.owns(glyph)
+    assert cache.repacks > 0
+    assert pygame.image.tostring(first, "RGBA") == expected
+
+    # 清空后旧字形仍可使用
+    last = cache.render(font, 'Z', color)
+    expected = pygame.image.tostring(last, "RGBA")
+    cache.clear()
+    cache.render(font, '#', (0, 0, 255))
+    assert pygame.image.tostring(last, "RGBA") == expected
+    print("✅ 图集空间回收正常")
+
+
+if __name__ == "__main__":
+    test_hits_and_lru_eviction()
+    test_atlas_glyph_matches_direct_render()
+    test_cache_key_uses_stable_font_identity()
+    test_atlas_space_reclaimed_after_eviction()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试HUD半透明背景和提示文本缓存
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import pygame
+
+pygame.init()
+pygame.display.set_mode((1, 1))
+
+from src.rendering.hud import HUDCache, get_hud_cache
+from src.utils.font_manager import get_font_manager
+
+
+def test_box_cached_by_size_and_color():
+    """相同尺寸和颜色的背景只创建一次"""
+    hud = HUDCache()
+    box = hud.box((120, 40), (0, 0, 0, 128))
+    assert hud.box((120, 40), (0, 0, 0, 128)) is box
+    assert box.get_alpha() == 128
+    assert box.get_at((0, 0))[:3] == (0, 0, 0)
+    assert hud.box((120, 40), (0, 0, 0, 80)) is not box
+    assert hud.box((120, 40), (10, 20, 30)).get_alpha() == 255
+    print("✅ 背景按尺寸和颜色缓存")
+
+
+def test_box_matches_manual_overlay():
+    """缓存的背景和逐帧创建的半透明表面绘制结果一致"""
+    hud = HUDCache()
+    expected = pygame.Surface((50, 30))
+    expected.fill((200, 100, 50))
+    overlay = pygame.Surface((20, 10))
+    overlay.set_alpha(128)
+    overlay.fill((0, 0, 0))
+    expected.blit(overlay, (5, 5))
+
+    actual = pygame.Surface((50, 30))
+    actual.fill((200, 100, 50))
+    rect = hud.draw_box(actual, pygame.Rect(5, 5, 20, 10), (0, 0, 0, 128))
+    assert rect == pygame.Rect(5, 5, 20, 10)
+    assert pygame.image.tostring(actual, "RGB") == pygame.image.tostring(expected, "RGB")
+    print("✅ 缓存背景的绘制结果不变")
+
+
+def test_text_cache_and_eviction():
+    """提示文本按字符串缓存，超过上限时淘汰最久未用的"""
+    hud = HUDCache(max_texts=2)
+    font = pygame.font.Font(None, 24)
+    surface = hud.text(font, "按 T 键与 小橘 对话", (255, 255, 100))
+    assert hud.text(font, "按 T 键与 小橘 对话", (255, 255, 100)) is surface
+    hud.text(font, "b", (255, 255, 255))
+    hud.text(font, "c", (255, 255, 255))
+    assert hud.text(font, "按 T 键与 小橘 对话", (255, 255, 100)) is not surface
+    assert get_hud_cache() is get_hud_cache()
+    print("✅ 文本缓存和LRU淘汰")
+
+
+def test_text_cache_keyed_by_font_identity():
+    """同一字体文件和字号的不同别名共享文本，临时字体不会因id复用而串用缓存"""
+    hud = HUDCache()
+    font_manager = get_font_manager()
+    surface = hud.text(font_manager.load_chinese_font(18, "hud_test_a"), "钓鱼", (255, 255, 255))
+    assert hud.text(font_manager.load_chinese_font(18, "hud_test_b"), "钓鱼", (255, 255, 255)) is surface
+
+    small = hud.text(pygame.font.Font(None, 12), "tip", (255, 255, 255))
+    large = hud.text(pygame.font.Font(None, 40), "tip", (255, 255, 255))
+    assert large.get_height() > small.get_height()
+    print("✅ 文本缓存按字体标识区分")
+
+
+if __name__ == "__main__":
+    test_box_cached_by_size_and_color()
+    test_box_matches_manual_overlay()
+    test_text_cache_and_eviction()
+    test_text_cache_keyed_by_font_identity()
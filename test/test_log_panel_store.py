@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试日志面板的有序日志存储与渲染缓存
+"""
+
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import random
+import pygame
+
+from src.ui.log_panel import LogStore, LogPanel
+
+
+def make_log(timestamp, log_type, action="行为"):
+    return {'timestamp': timestamp, 'type': log_type, 'action': action, 'details': {}}
+
+
+def test_store_keeps_order_and_indexes():
+    """测试日志按时间戳有序，按类型的索引与筛选结果一致"""
+    random.seed(5)
+    store = LogStore()
+    logs = []
+    for i in range(300):
+        # 偶尔有乱序到达的日志
+        second = i if i % 17 else max(0, i - 5)
+        log = make_log(f"2025-01-01 10:{second // 60:02d}:{second % 60:02d}",
+                       random.choice(['fishing', 'shop', 'farming']))
+        logs.append(log)
+        store.append(log)
+    assert store.keys == sorted(store.keys)
+    for log_type in ('fishing', 'shop', 'farming'):
+        assert store.view(log_type) == [log for log in store.entries if log['type'] == log_type]
+    assert store.view('quest') == []
+
+    version = store.version
+    store.remove(logs[0])
+    assert logs[0] not in store.entries and logs[0] not in store.view(logs[0]['type'])
+    assert store.version == version + 1
+    print("✅ 日志有序存储与类型索引正常")
+
+
+def test_panel_tracks_player_history():
+    """测试面板随玩家行为记录增删，并只在变化时重新绘制"""
+    pygame.init()
+    surface = pygame.Surface((1280, 720))
+    panel = LogPanel()
+    panel.is_active = True
+    history = []
+    for i in range(600):
+        log = make_log(f"2025-01-01 11:{i // 60:02d}:{i % 60:02d}", 'fishing' if i % 2 else 'dialogue')
+        history.append(log)
+        panel.on_player_log_added(log)
+        if len(history) > 500:
+            panel.on_player_log_removed(history.pop(0))
+    assert panel.player_log_count == 500
+    assert len(panel.store) == 500
+
+    panel.render(surface, None)
+    rows = len(panel.row_surfaces)
+    assert 0 < rows <= panel.max_visible_lines
+    # 最新的日志显示在最前面
+    assert panel._get_filtered_logs(None)[-1] is history[-1]
+
+    # 没有变化时复用面板
+    key = panel.panel_key
+    panel.render(surface, None)
+    assert panel.panel_key == key
+
+    # 切换筛选后行缓存失效
+    panel.filter_type = 'fishing'
+    panel.render(surface, None)
+    assert panel.row_key == (panel.store.version, 'fishing')
+    assert len(panel._get_filtered_logs(None)) == 250
+    print("✅ 面板缓存随日志和筛选失效")
+
+
+if __name__ == "__main__":
+    test_store_keeps_order_and_indexes()
+    test_panel_tracks_player_history()
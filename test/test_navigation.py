@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试猫咪寻路服务：A*绕开障碍物、流场通往目的地、障碍物变化后缓存失效，
+以及低速猫咪不会被误判为卡住
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from types import SimpleNamespace
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+
+from src.settings import TILE_SIZE
+from src.core.collision_grid import CollisionGroup
+from src.ai.navigation import Navigator
+
+
+class Wall(pygame.sprite.Sprite):
+    """测试用墙（完整碰撞盒）"""
+
+    def __init__(self, tile, groups):
+        super().__init__(groups)
+        self.rect = pygame.Rect(tile[0] * TILE_SIZE, tile[1] * TILE_SIZE, TILE_SIZE, TILE_SIZE)
+        self.hitbox = self.rect.copy()
+
+
+def center(tile):
+    return ((tile[0] + 0.5) * TILE_SIZE, (tile[1] + 0.5) * TILE_SIZE)
+
+
+def make_world():
+    """10x10的区域，第5列是一堵墙，只在第8行留一个缺口"""
+    walls = CollisionGroup()
+    for row in range(10):
+        if row != 8:
+            Wall((5, row), [walls])
+    navigator = Navigator(walls, pygame.Rect(0, 0, 10 * TILE_SIZE, 10 * TILE_SIZE))
+    return walls, navigator
+
+
+def test_astar_goes_through_gap():
+    """A*路线经过墙上的缺口，且不经过任何墙"""
+    walls, navigator = make_world()
+    path = navigator.find_path(center((2, 2)), center((8, 2)))
+    assert path is not None
+    tiles = [navigator.tile_of(point) for point in path]
+    assert (5, 8) in tiles
+    assert all(tile[0] != 5 or tile[1] == 8 for tile in tiles)
+    assert path[-1] == pygame.math.Vector2(center((8, 2)))
+
+    # 相同起点终点的路线来自缓存
+    searches = navigator.path_searches
+    navigator.find_path(center((2, 2)), center((8, 2)))
+    assert navigator.path_searches == searches
+    print("✅ A*绕开障碍物")
+
+
+def test_flow_field_reaches_goal():
+    """沿流场一步步走，最终到达目的地"""
+    walls, navigator = make_world()
+    goal = center((8, 1))
+    pos = center((1, 1))
+    for _ in range(40):
+        waypoint = navigator.next_waypoint(pos, goal)
+        assert waypoint is not None
+        if waypoint == pygame.math.Vector2(goal):
+            break
+        pos = waypoint
+    else:
+        raise AssertionError("流场没有通往目的地")
+    assert navigator.flow_field_builds == 1
+    print("✅ 流场通往目的地")
+
+
+def test_cache_invalidated_when_obstacles_change():
+    """堵上缺口后目的地不可达，拆掉一段墙后重新可达"""
+    walls, navigator = make_world()
+    assert navigator.find_path(center((2, 2)), center((8, 2))) is not None
+
+    Wall((5, 8), [walls])
+    assert navigator.find_path(center((2, 2)), center((8, 2))) is None
+    assert navigator.next_waypoint(center((2, 2)), center((8, 2))) is None
+
+    for wall in walls.sprites():
+        if wall.rect.topleft == (5 * TILE_SIZE, 3 * TILE_SIZE):
+            wall.kill()
+    path = navigator.find_path(center((2, 2)), center((8, 2)))
+    assert (5, 3) in [navigator.tile_of(point) for point in path]
+    print("✅ 障碍物变化后缓存失效")
+
+
+def test_refresh_without_shape_change_keeps_cache():
+    """只换图像（例如树被摘了果实）时寻路缓存保留，碰撞盒变化后才失效"""
+    walls, navigator = make_world()
+    assert navigator.find_path(center((2, 2)), center((8, 2))) is not None
+    searches = navigator.path_searches
+
+    wall = walls.sprites()[0]
+    wall.image = pygame.Surface((TILE_SIZE, TILE_SIZE))
+    walls.refresh_sprite(wall)
+    assert navigator.find_path(center((2, 2)), center((8, 2))) is not None
+    assert navigator.path_searches == searches  # 命中缓存
+
+    gap_wall = next(w for w in walls.sprites() if w.rect.topleft == (5 * TILE_SIZE, 7 * TILE_SIZE))
+    gap_wall.rect.height = 2 * TILE_SIZE  # 向下长出一格，堵上缺口
+    gap_wall.hitbox = gap_wall.rect.copy()
+    walls.refresh_sprite(gap_wall)
+    assert navigator.find_path(center((2, 2)), center((8, 2))) is None
+    print("✅ 碰撞盒不变时缓存不失效")
+
+
+def test_connected_components():
+    """墙把区域分成两半后，圆环里只返回与起点连通的瓦片"""
+    walls, navigator = make_world()
+    assert navigator.component_of((2, 2)) == navigator.component_of((8, 2))
+    assert navigator.component_of((5, 2)) is None
+
+    Wall((5, 8), [walls])
+    left = navigator.components_at(center((2, 2)))
+    assert navigator.component_of((8, 2)) not in left
+    tiles = navigator.tiles_in_ring(center((4, 4)), 0, 4 * TILE_SIZE, left)
+    assert tiles and all(tile[0] < 5 for tile in tiles)
+    assert len(navigator.tiles_in_ring(center((4, 4)), 0, 4 * TILE_SIZE)) > len(tiles)
+    print("✅ 连通区域划分正确")
+
+
+def walk_cat(walls, target, seconds=3.0, speed=20):
+    """让一只低速猫咪朝target直线走seconds秒，返回重新选择目标的次数"""
+    pygame.init()
+    pygame.display.set_mode((100, 100))
+    from src.ai.cat_npc import CatNPC
+
+    cat = CatNPC((400, 400), 'cat_测试', SimpleNamespace(get_npc=lambda npc_id: None),
+                 [pygame.sprite.Group()], '测试', '安静', walls)
+    cat.move_speed = speed
+    retargets = []
+    cat._set_random_target = lambda: retargets.append(cat.rect.center)
+    cat.path = None
+    cat.target_pos = pygame.math.Vector2(target)
+    cat.direction = cat.target_pos - cat.pos
+    for _ in range(int(seconds * 60)):
+        cat._update_movement(1 / 60)
+    return retargets
+
+
+def test_slow_cat_not_marked_stuck():
+    """每帧移动不到1像素的猫咪在空地上不会被判为卡住，被墙挡住时1秒后重新选择目标"""
+    assert walk_cat(CollisionGroup(), (432, 560)) == []
+
+    walls = CollisionGroup()
+    Wall((6, 7), [walls])  # 紧贴在猫咪正下方
+    assert len(walk_cat(walls, (432, 560))) >= 2
+    print("✅ 卡住检测按速度判断进展")
+
+
+if __name__ == "__main__":
+    test_astar_goes_through_gap()
+    test_flow_field_reaches_goal()
+    test_cache_invalidated_when_obstacles_change()
+    test_refresh_without_shape_change_keeps_cache()
+    test_slow_cat_not_marked_stuck()
+    test_connected_components()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试动态实体邻近索引：半径查询和k近邻与逐个计算距离的结果一致
+"""
+
+import os
+import sys
+import math
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import pygame
+
+from src.utils.spatial_grid import ProximityIndex, ProximityGroup
+
+
+class Entity(pygame.sprite.Sprite):
+    """测试用实体"""
+
+    def __init__(self, pos, groups=()):
+        super().__init__(*groups)
+        self.rect = pygame.Rect(0, 0, 32, 32)
+        self.rect.center = pos
+
+
+def distance(entity, pos):
+    return math.hypot(entity.rect.centerx - pos[0], entity.rect.centery - pos[1])
+
+
+def test_within_and_nearest_match_brute_force():
+    """随机移动实体后，查询结果与遍历一致"""
+    rng = random.Random(3)
+    index = ProximityIndex(cell_size=128)
+    entities = [Entity((rng.randrange(0, 1600), rng.randrange(0, 1600))) for _ in range(200)]
+    for entity in entities:
+        index.update(entity)
+
+    for step in range(50):
+        for entity in rng.sample(entities, 40):
+            entity.rect.move_ip(rng.randrange(-90, 91), rng.randrange(-90, 91))
+            index.update(entity)
+
+        pos = (rng.randrange(-100, 1700), rng.randrange(-100, 1700))
+        radius = rng.choice([50, 80, 128, 300])
+        expected = {e for e in entities if distance(e, pos) <= radius}
+        assert set(index.within(pos, radius)) == expected
+
+        ranked = sorted(entities, key=lambda e: distance(e, pos))
+        found = index.k_nearest(pos, 5)
+        assert [round(d, 6) for _, d in found] == [round(distance(e, pos), 6) for e in ranked[:5]]
+
+        entity, dist = index.nearest(pos, 100)
+        if distance(ranked[0], pos) <= 100:
+            assert math.isclose(dist, distance(ranked[0], pos))
+        else:
+            assert entity is None and dist is None
+    print("✅ 邻近查询与遍历结果一致")
+
+
+def test_exclude_and_remove():
+    """查询可以排除自己，移除后不再返回"""
+    index = ProximityIndex()
+    a = Entity((100, 100))
+    b = Entity((150, 100))
+    index.update(a)
+    index.update(b)
+    assert index.within(a.rect.center, 80, exclude=a) == [b]
+    index.remove(b)
+    assert index.within(a.rect.center, 80, exclude=a) == []
+    assert index.nearest((0, 0)) == (a, distance(a, (0, 0)))
+    print("✅ 排除和移除")
+
+
+def test_group_tracks_members():
+    """精灵组加入时挂起，查询时按当前位置登记，移动后refresh_sprite更新"""
+    group = ProximityGroup()
+    npc = Entity((500, 500), [group])
+    assert group.nearest((510, 500), 50)[0] is npc
+
+    npc.rect.center = (1500, 1500)
+    group.refresh_sprite(npc)
+    assert group.nearest((510, 500), 50) == (None, None)
+    assert group.within((1500, 1490), 20) == [npc]
+
+    npc.kill()
+    assert group.within((1500, 1490), 20) == []
+    print("✅ 精灵组维护索引")
+
+
+if __name__ == "__main__":
+    test_within_and_nearest_match_brute_force()
+    test_exclude_and_remove()
+    test_group_tracks_members()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试雨粒子池
+验证粒子数量固定、停雨后自然消失、只绘制视口内的粒子
+"""
+
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+
+from src.settings import LAYERS, RAIN_DROP_COUNT, RAIN_FLOOR_COUNT
+from src.utils.sky import Rain
+
+
+class DummyCamera:
+    """只提供Rain需要的视口和图层回调接口"""
+    def __init__(self):
+        self.view_rect = pygame.Rect(1000, 1000, 1280, 720)
+        self.layer_painters = {}
+
+    def add_layer_painter(self, z, painter):
+        self.layer_painters.setdefault(z, []).append(painter)
+
+
+def test_fixed_budget_and_fade_out():
+    """测试粒子池容量固定，停雨后粒子消失"""
+    pygame.init()
+    camera = DummyCamera()
+    rain = Rain(camera)
+    assert set(camera.layer_painters) == {LAYERS['rain floor'], LAYERS['rain drops']}
+
+    rain.raining = True
+    for _ in range(120):
+        rain.update(1 / 60)
+    assert rain.drop_pos.shape == (RAIN_DROP_COUNT, 2)
+    assert (rain.drop_life > 0).all()
+    assert (rain.floor_life > 0).all()
+
+    rain.raining = False
+    for _ in range(60):
+        rain.update(1 / 60)
+    assert (rain.drop_life <= 0).all()
+    assert rain.visible(rain.drop_pos, rain.drop_life, camera.view_rect) == []
+    print("✅ 粒子池容量固定")
+
+
+def test_only_visible_drops_drawn():
+    """测试视口裁剪"""
+    pygame.init()
+    camera = DummyCamera()
+    rain = Rain(camera)
+    rain.raining = True
+    rain.update(1 / 60)
+
+    visible = rain.visible(rain.floor_pos, rain.floor_life, camera.view_rect)
+    assert 0 < len(visible) <= RAIN_FLOOR_COUNT
+    # 相机移走后原来的粒子都不可见
+    far_view = camera.view_rect.move(10000, 10000)
+    assert rain.visible(rain.floor_pos, rain.floor_life, far_view) == []
+    print("✅ 只绘制视口内的雨滴")
+
+
+if __name__ == "__main__":
+    test_fixed_budget_and_fade_out()
+    test_only_visible_drops_drawn()
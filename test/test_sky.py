@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试天空颜色查找表
+验证白天跳过相乘混合，夜晚正常上色，颜色与原先逐帧计算的结果一致
+"""
+
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+
+from src.settings import SCREEN_WIDTH, SCREEN_HEIGHT
+from src.utils.sky import Sky
+
+
+def test_color_lut():
+    """测试查找表覆盖一天的每一分钟"""
+    pygame.init()
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    sky = Sky()
+    assert len(sky.color_lut) == 24 * 60
+    assert sky.color_lut[12 * 60] == (255, 255, 255)
+    assert sky.color_lut[0] == tuple(sky.night_color)
+    # 黎明时段逐渐变亮
+    assert sky.color_lut[5 * 60 + 30] > sky.color_lut[5 * 60 + 10]
+    print("✅ 颜色查找表正常")
+
+
+def reference_color(sky, minutes):
+    """原先每帧计算天空颜色的公式"""
+    night, day = sky.night_color, sky.day_color
+    if 5 * 60 <= minutes < 6 * 60:
+        progress = (minutes - 5 * 60) / 60
+        return tuple(int(night[i] + (day[i] - night[i]) * progress) for i in range(3))
+    if 6 * 60 <= minutes < 18 * 60:
+        return tuple(day)
+    if 18 * 60 <= minutes < 19 * 60:
+        progress = (minutes - 18 * 60) / 60
+        return tuple(int(day[i] + (night[i] - day[i]) * progress) for i in range(3))
+    return tuple(night)
+
+
+def test_lut_matches_per_frame_multiply():
+    """测试查找表颜色及混合结果与原先逐帧填充相乘完全一致"""
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    sky = Sky()
+    sky.time_speed = 0
+
+    for minute in range(24 * 60):
+        assert sky.color_lut[minute] == reference_color(sky, minute), minute
+
+    base = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    base.fill((200, 150, 90))
+    pygame.draw.rect(base, (17, 240, 66), (40, 40, 120, 80))
+    tint = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    for hour, minute in [(0, 0), (5, 0), (5, 17), (5, 45), (6, 0), (12, 0), (18, 1), (18, 30), (18, 59), (23, 0)]:
+        # 原先的做法：每帧按公式填充色调表面再相乘
+        expected = base.copy()
+        tint.fill(reference_color(sky, hour * 60 + minute))
+        expected.blit(tint, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+
+        screen.blit(base, (0, 0))
+        sky.game_hour, sky.game_minute = hour, minute
+        sky.display(0)
+        for pos in [(10, 10), (60, 60), (SCREEN_WIDTH - 1, SCREEN_HEIGHT - 1)]:
+            assert screen.get_at(pos) == expected.get_at(pos), (hour, minute, pos)
+    print("✅ 查找表与逐帧相乘结果一致")
+
+
+def test_daytime_skips_blend():
+    """测试白天不做相乘混合，夜晚上色"""
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    sky = Sky()
+    sky.time_speed = 0.1
+
+    screen.fill((200, 100, 50))
+    sky.force_time(12)
+    sky.display(0)
+    assert screen.get_at((10, 10))[:3] == (200, 100, 50)
+
+    sky.force_time(0)
+    sky.display(0)
+    assert screen.get_at((10, 10))[:3] != (200, 100, 50)
+    assert sky.tint_color == tuple(sky.night_color)
+    print("✅ 白天跳过混合")
+
+
+if __name__ == "__main__":
+    test_color_lut()
+    test_lut_matches_per_frame_multiply()
+    test_daytime_skips_blend()
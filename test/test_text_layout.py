@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试文本排版器
+验证字符宽度缓存和单遍换行的结果
+"""
+
+import random
+import time
+import pygame
+
+from src.utils.text_layout import TextLayout
+
+
+class CountingFont:
+    """包装真实字体，统计font.size的调用次数"""
+    def __init__(self, font):
+        self.font = font
+        self.size_calls = 0
+
+    def size(self, text):
+        self.size_calls += 1
+        return self.font.size(text)
+
+
+class FixedFont:
+    """每个字符宽度固定的假字体，便于构造边界情况"""
+    def __init__(self, widths):
+        self.widths = widths
+
+    def size(self, text):
+        return (sum(self.widths[char] for char in text), 20)
+
+
+def reference_wrap_chars(text, max_width, font):
+    """原TextRenderer.wrap_text_advanced的实现"""
+    if not text:
+        return [""]
+    lines = []
+    current_line = ""
+    current_width = 0
+    for char in text:
+        char_width = font.size(char)[0]
+        if current_width + char_width > max_width and current_line:
+            lines.append(current_line.strip())
+            current_line = char
+            current_width = char_width
+        else:
+            current_line += char
+            current_width += char_width
+    if current_line:
+        lines.append(current_line.strip())
+    return lines if lines else [""]
+
+
+def make_font():
+    pygame.init()
+    return CountingFont(pygame.font.Font(None, 20))
+
+
+def test_advances_cached_per_font():
+    """测试每个字符在同一字体下只测量一次"""
+    font = make_font()
+    layout = TextLayout()
+    layout.wrap("hello world " * 20, 120, font)
+    calls = font.size_calls
+    assert calls == len(set("hello world "))
+    layout.wrap("world hello " * 50, 80, font)
+    assert font.size_calls == calls
+    print("✅ 字符宽度已按字体缓存")
+
+
+def test_wrap_fits_and_keeps_words():
+    """测试每行不超过最大宽度，英文单词不被拆开，行宽与实际字符宽度一致"""
+    font = make_font()
+    layout = TextLayout()
+    text = "Test English text wrapping functionality with some longer sentences."
+    lines = layout.wrap(text, 120, font)
+    assert len(lines) > 1
+    assert " ".join(line for line, _ in lines) == text
+    for line, width in lines:
+        assert width <= 120
+        assert width == sum(layout.advance(font, char) for char in line)
+    print("✅ 英文按单词换行")
+
+
+def test_wide_characters_break_anywhere():
+    """测试全角字符之间可以断开，换行符强制分行"""
+    font = make_font()
+    layout = TextLayout()
+    text = "小黑对世界充满好奇，总是想要探索新的地方和事物。"
+    lines = layout.wrap(text, 60, font)
+    assert "".join(line for line, _ in lines) == text
+    assert all(width <= 60 for _, width in lines)
+
+    assert [line for line, _ in layout.wrap("第一行\n\nsecond", 500, font)] == ["第一行", "", "second"]
+    assert layout.wrap("", 100, font) == [("", 0)]
+
+    # 比整行还宽的单词在字符之间断开
+    lines = layout.wrap("a" * 40, 50, font)
+    assert "".join(line for line, _ in lines) == "a" * 40
+    assert all(width <= 50 for _, width in lines)
+    print("✅ 全角字符与超长单词换行正常")
+
+
+def test_wide_glyph_after_break_still_fits():
+    """测试断开后留到下一行的字符加上当前字符放不下时再断开一次，不会超出最大宽度"""
+    font = FixedFont({'x': 10, ' ': 5, 'a': 10, 'M': 25})
+    layout = TextLayout()
+    lines = layout.wrap("x aaM", 40, font)
+    assert [line for line, _ in lines] == ["x", "aa", "M"]
+    assert all(width <= 40 for _, width in lines)
+    print("✅ 宽字形跨越行尾时不会超宽")
+
+
+def test_wrap_chars_matches_text_renderer():
+    """测试逐字符换行与TextRenderer原先的结果一致（不保留单词，不处理换行符）"""
+    font = make_font()
+    layout = TextLayout()
+    random.seed(3)
+    alphabet = "ab cd 中文，emoji🐱\n"
+    for _ in range(200):
+        text = "".join(random.choice(alphabet) for _ in range(random.randint(0, 60)))
+        width = random.randint(10, 200)
+        lines = layout.wrap_chars(text, width, font)
+        assert [line for line, _ in lines] == reference_wrap_chars(text, width, font.font)
+    print("✅ 逐字符换行结果不变")
+
+
+def test_missing_glyph_widths():
+    """字体缺字宽度为0时，只有0x1F000及以上的字符按20像素计算"""
+    layout = TextLayout()
+    font = FixedFont({'\u2600': 0, '\u2764': 0, '\U0001F431': 0, '\U0001FA90': 0, '\U0001FB00': 0, 'a': 0})
+    assert layout.advance(font, '\u2600') == 0
+    assert layout.advance(font, '\u2764') == 0
+    assert layout.advance(font, 'a') == 0
+    assert layout.advance(font, '\U0001F431') == 20
+    assert layout.advance(font, '\U0001FA90') == 20
+    assert layout.advance(font, '\U0001FB00') == 20
+    print("✅ 缺字宽度与原规则一致")
+
+
+def test_wrap_history_is_fast():
+    """测试缓存预热后整段对话历史的换行开销"""
+    font = make_font()
+    layout = TextLayout()
+    history = ["小黑：今天的鱼真好吃，我还想再来一条！Meow meow~"] * 50
+    for message in history:
+        layout.wrap(message, 300, font)
+    start = time.perf_counter()
+    for message in history:
+        layout.wrap(message, 300, font)
+    elapsed = time.perf_counter() - start
+    assert elapsed < 0.05
+    print(f"✅ 50条对话换行耗时 {elapsed * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    test_advances_cached_per_font()
+    test_wrap_fits_and_keeps_words()
+    test_wide_characters_break_anywhere()
+    test_wide_glyph_after_break_still_fits()
+    test_wrap_chars_matches_text_renderer()
+    test_missing_glyph_widths()
+    test_wrap_history_is_fast()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试瓦片图像享元注册表
+验证相同外观的瓦片共享同一张表面，需要修改图像的精灵会先复制
+"""
+
+import pygame
+
+from src.rendering.tile_images import get_tile_images
+from src.rendering.ascii_sprites import ASCIIGeneric, ASCIIParticle
+from src.rendering.ascii_renderer import get_ascii_renderer
+
+
+def test_same_tiles_share_surface():
+    """测试相同外观共享表面"""
+    pygame.init()
+    group = pygame.sprite.Group()
+    a = ASCIIGeneric((0, 0), 'grass', group)
+    b = ASCIIGeneric((64, 0), 'grass', group)
+    c = ASCIIGeneric((128, 0), 'grass', group, variant=1)
+    assert a.image is b.image
+    assert a.image is get_tile_images().get('grass')
+    assert c.image is not a.image
+
+    # 外观切换后换成另一张共享表面
+    b.update_ascii('path')
+    assert b.image is get_tile_images().get('path')
+    print("✅ 相同瓦片共享表面")
+
+
+def test_own_image_copies_before_write():
+    """测试写时复制"""
+    pygame.init()
+    group = pygame.sprite.Group()
+    tile = ASCIIGeneric((0, 0), 'grass', group)
+    particle = ASCIIParticle((0, 0), 'grass', group)
+    shared = get_tile_images().get('grass')
+    assert particle.image is not shared
+
+    particle.update(0.5)
+    assert shared.get_alpha() in (None, 255)
+    assert tile.image is shared
+    print("✅ 写时复制正常")
+
+
+def test_shared_renderer_tables_are_read_only():
+    """测试共享渲染器的字符、颜色、变体表不能被修改"""
+    pygame.init()
+    renderer = get_ascii_renderer()
+    assert get_ascii_renderer() is renderer
+    for table in (renderer.ascii_map, renderer.color_map, renderer.variant_chars):
+        try:
+            table['grass'] = None
+        except TypeError:
+            pass
+        else:
+            raise AssertionError("共享表被修改")
+    assert isinstance(renderer.variant_chars['grass'], tuple)
+    assert renderer.get_ascii_char('grass', 1) == ','
+    print("✅ 共享表只读")
+
+
+if __name__ == "__main__":
+    test_same_tiles_share_surface()
+    test_own_image_copies_before_write()
+    test_shared_renderer_tables_are_read_only()
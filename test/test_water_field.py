@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试水域距离场：查表结果与逐个比较水瓦片一致
+"""
+
+import os
+import sys
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from types import SimpleNamespace
+
+import pygame
+
+from src.settings import TILE_SIZE
+from src.utils.water_field import WaterField
+from src.core.player import Player
+
+
+def brute_near(water, pos, radius):
+    """逐个比较水瓦片中心（Player.check_near_water的原始做法）"""
+    for x, y in water:
+        cx, cy = x * TILE_SIZE + TILE_SIZE // 2, y * TILE_SIZE + TILE_SIZE // 2
+        if ((pos[0] - cx) ** 2 + (pos[1] - cy) ** 2) ** 0.5 <= radius:
+            return True
+    return False
+
+
+def brute_nearest(water, pos):
+    """逐个比较水瓦片中心，距离相同时取先出现的"""
+    best = None
+    best_distance = float('inf')
+    for x, y in water:
+        cx, cy = x * TILE_SIZE + TILE_SIZE // 2, y * TILE_SIZE + TILE_SIZE // 2
+        distance = ((pos[0] - cx) ** 2 + (pos[1] - cy) ** 2) ** 0.5
+        if distance < best_distance:
+            best_distance = distance
+            best = (cx, cy)
+    return best
+
+
+def test_queries_match_brute_force():
+    """随机水域和随机位置下，近水判断和最近水位置与遍历一致"""
+    rng = random.Random(11)
+    water = []
+    for _ in range(6):
+        # 几片矩形池塘
+        x0, y0 = rng.randrange(0, 45), rng.randrange(0, 35)
+        for x in range(x0, x0 + rng.randrange(1, 6)):
+            for y in range(y0, y0 + rng.randrange(1, 5)):
+                water.append((x, y))
+    field = WaterField(water, (50, 40))
+
+    radius = TILE_SIZE + 10
+    for _ in range(3000):
+        pos = (rng.randrange(-100, 50 * TILE_SIZE + 100), rng.randrange(-100, 40 * TILE_SIZE + 100))
+        assert field.near(pos, radius) == brute_near(water, pos, radius), pos
+        assert field.nearest(pos) == brute_nearest(water, pos), pos
+    print("✅ 距离场查询与遍历结果一致")
+
+
+def test_tile_lookups():
+    """查表接口"""
+    field = WaterField([(3, 4)], (10, 10))
+    assert field.is_water_at((3 * TILE_SIZE + 5, 4 * TILE_SIZE + 60))
+    assert not field.is_water_at((0, 0))
+    assert field.distance_at((3 * TILE_SIZE, 5 * TILE_SIZE)) == TILE_SIZE
+    assert field.nearest_tile_at((0, 0)) == (3, 4)
+    assert field.distance_at((-1, 0)) is None
+
+    empty = WaterField([], (10, 10))
+    assert not empty.near((100, 100), 1000)
+    assert empty.nearest((100, 100)) is None
+    print("✅ 查表接口")
+
+
+def test_player_queries_use_field():
+    """玩家的近水判断和鱼饵位置走距离场，结果与遍历水精灵一致"""
+    water = [(5, 5), (6, 5), (12, 9)]
+    water_sprites = pygame.sprite.Group()
+    for x, y in water:
+        sprite = pygame.sprite.Sprite(water_sprites)
+        sprite.rect = pygame.Rect(x * TILE_SIZE, y * TILE_SIZE, TILE_SIZE, TILE_SIZE)
+    field = WaterField(water, (20, 15))
+
+    rng = random.Random(5)
+    for _ in range(300):
+        rect = pygame.Rect(0, 0, 64, 64)
+        rect.center = (rng.randrange(0, 20 * TILE_SIZE), rng.randrange(0, 15 * TILE_SIZE))
+        with_field = SimpleNamespace(rect=rect, water_sprites=water_sprites, water_field=field)
+        without_field = SimpleNamespace(rect=rect, water_sprites=water_sprites, water_field=None)
+        assert Player.check_near_water(with_field) == Player.check_near_water(without_field), rect.center
+        assert Player.find_nearest_water_position(with_field) == Player.find_nearest_water_position(without_field), rect.center
+    print("✅ 玩家水域查询走距离场")
+
+
+if __name__ == "__main__":
+    test_queries_match_brute_force()
+    test_tile_lookups()
+    test_player_queries_use_field()